@@ -13,7 +13,9 @@ import sys
 load_dotenv()
 
 # Initialize extensions
-db = SQLAlchemy()
+# Objects keep their loaded state after commit, so serializing a row that was
+# just written does not reload it; each request gets a fresh session anyway
+db = SQLAlchemy(session_options={'expire_on_commit': False})
 migrate = Migrate()
 jwt = JWTManager()
 
@@ -25,6 +27,10 @@ def create_app(config_name=None):
     config_name = config_name or os.getenv('FLASK_ENV', 'default')
     app.config.from_object(config[config_name])
     
+    # Serialize JSON with orjson when it is installed (see app/utils/json_provider.py)
+    from app.utils.json_provider import APIJSONProvider
+    app.json = APIJSONProvider(app)
+    
     # Configure logging - INFO level and exceptions only
     logging.basicConfig(
         level=logging.INFO,
@@ -46,8 +52,21 @@ def create_app(config_name=None):
     sqlalchemy_logger = logging.getLogger('sqlalchemy.engine')
     sqlalchemy_logger.setLevel(logging.INFO)
     
+    # Engine settings for the configured database (see app/utils/db_engine.py)
+    from app.utils.db_engine import engine_options, install_sqlite_pragmas, db_stats
+    from app.utils.metrics import request_metrics
+    app.config['SQLALCHEMY_ENGINE_OPTIONS'] = {
+        **engine_options(app.config),
+        **app.config.get('SQLALCHEMY_ENGINE_OPTIONS', {})
+    }
+    
     # Initialize extensions with app
     db.init_app(app)
+    with app.app_context():
+        if db.engine.dialect.name == 'sqlite':
+            install_sqlite_pragmas(db.engine, app.config)
+        db_stats.install(db.engine)
+        request_metrics.install(db.engine)
     migrate.init_app(app, db)
     jwt.init_app(app)
     
@@ -70,6 +89,7 @@ def create_app(config_name=None):
     from app.models.user import User
     from app.models.exam import Exam
     from app.models.exam_attempt import ExamAttempt
+    from app.models.exam_stats import ExamStats, ExamScoreBucket, ExamQuestionStat
     
     # Register blueprints
     from app.routes.auth import auth_bp
@@ -84,6 +104,32 @@ def create_app(config_name=None):
     app.register_blueprint(exams_bp, url_prefix='/api')
     app.register_blueprint(exam_attempt_bp, url_prefix='/api')
     
+    # Configure the in-process exam/answer-key cache
+    from app.services.exam_cache import exam_cache
+    exam_cache.init_app(app)
+    from app.services.score_index import score_index
+    score_index.init_app(app)
+    from app.services.password_hasher import password_hasher
+    password_hasher.init_app(app)
+    from app.services.user_state import user_state
+    user_state.init_app(app)
+    
+    # Reject tokens of deactivated users and tokens claiming admin rights that were removed
+    @jwt.token_in_blocklist_loader
+    def check_user_state(jwt_header, jwt_payload):
+        if not jwt_payload.get('is_active', True):
+            return True
+        return user_state.is_revoked(int(jwt_payload['sub']), bool(jwt_payload.get('is_admin')))
+    from app.services.submission_pipeline import submission_pipeline
+    submission_pipeline.init_app(app)
+    
+    # Prometheus request and SQL metrics, served at /api/metrics (see app/utils/metrics.py)
+    request_metrics.init_app(app)
+    
+    # Compress large JSON/CSV responses (see app/utils/compression.py)
+    from app.utils.compression import response_compressor
+    response_compressor.init_app(app)
+    
     # Register error handlers for exception logging
     @app.errorhandler(Exception)
     def handle_exception(e):
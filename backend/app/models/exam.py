@@ -1,19 +1,24 @@
-from datetime import datetime, timezone
 from app import db
+from app.utils.answer_codec import QUESTION_COUNT, encode_answer_key, decode_answer_key
+from app.utils.timestamps import utcnow
 
 class Exam(db.Model):
     __tablename__ = 'exam'
+    __table_args__ = (
+        # Active exam listings, newest first
+        db.Index('ix_exam_active_created', 'is_active', 'created_at'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     title = db.Column(db.String(200), nullable=False)
     description = db.Column(db.Text)
     created_by = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
-    created_at = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc), nullable=False)
-    updated_at = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc), onupdate=lambda: datetime.now(timezone.utc), nullable=False)
+    created_at = db.Column(db.DateTime, default=utcnow, nullable=False)
+    updated_at = db.Column(db.DateTime, default=utcnow, onupdate=utcnow, nullable=False)
     is_active = db.Column(db.Boolean, default=True)
     
-    # Store answers for 50 questions (A, B, C, D)
-    answers = db.Column(db.JSON, default=list)  # List of 50 answers ['A', 'B', 'C', ...]
+    # Store answers for 50 questions as a fixed-width string, e.g. 'ABCDA...'
+    answer_key = db.Column(db.String(QUESTION_COUNT), nullable=True)
     
     # Relationship
     creator = db.relationship('User', backref='created_exams')
@@ -21,14 +26,25 @@ class Exam(db.Model):
     def __repr__(self):
         return f'<Exam {self.title}>'
     
-    def to_dict(self):
-        return {
+    @property
+    def answers(self):
+        """List of 50 answers ['A', 'B', 'C', ...], decoded from answer_key"""
+        return decode_answer_key(self.answer_key)
+    
+    @answers.setter
+    def answers(self, value):
+        self.answer_key = encode_answer_key(value)
+    
+    def to_dict(self, include_answers=True):
+        data = {
             'id': self.id,
             'title': self.title,
             'description': self.description,
             'created_by': self.created_by,
-            'created_at': self.created_at.isoformat(),
-            'updated_at': self.updated_at.isoformat(),
-            'is_active': self.is_active,
-            'answers': self.answers or []
+            'created_at': self.created_at,
+            'updated_at': self.updated_at,
+            'is_active': self.is_active
         }
+        if include_answers:
+            data['answers'] = self.answers or []
+        return data
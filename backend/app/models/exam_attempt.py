@@ -1,15 +1,26 @@
-from datetime import datetime, timezone
 from app import db
+from app.utils.answer_codec import QUESTION_COUNT, encode_user_answers, decode_user_answers
+from app.utils.timestamps import utcnow
 
 class ExamAttempt(db.Model):
     __tablename__ = 'exam_attempt'
+    __table_args__ = (
+        # Attempt history, newest first, with (created_at, id) keyset pagination
+        db.Index('ix_exam_attempt_user_created', 'user_id', 'created_at', 'id'),
+        # Latest attempt per exam for a user
+        db.Index('ix_exam_attempt_user_exam_created', 'user_id', 'exam_id', 'created_at'),
+        # Per-exam scans and deletes
+        db.Index('ix_exam_attempt_exam_id', 'exam_id'),
+        # Idempotent replay of queued submissions
+        db.Index('ix_exam_attempt_submission_id', 'submission_id', unique=True),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
     exam_id = db.Column(db.Integer, db.ForeignKey('exam.id'), nullable=False)
     
     # Attempt details
-    started_at = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc), nullable=False)
+    started_at = db.Column(db.DateTime, default=utcnow, nullable=False)
     completed_at = db.Column(db.DateTime, nullable=True)
     
     # Scoring
@@ -20,12 +31,15 @@ class ExamAttempt(db.Model):
     # Status
     status = db.Column(db.String(20), default='in_progress')  # 'in_progress', 'completed', 'abandoned'
     
-    # User answers (stored as JSON)
-    user_answers = db.Column(db.JSON, default=dict)  # {question_id: user_answer}
+    # User answers stored as a fixed-width string, '-' marks a blank answer
+    answer_sheet = db.Column(db.String(QUESTION_COUNT), nullable=True)
+    
+    # Client-visible id for attempts written through the submission pipeline
+    submission_id = db.Column(db.String(36), nullable=True)
     
     # Audit fields
-    created_at = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc), nullable=False)
-    updated_at = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc), onupdate=lambda: datetime.now(timezone.utc), nullable=False)
+    created_at = db.Column(db.DateTime, default=utcnow, nullable=False)
+    updated_at = db.Column(db.DateTime, default=utcnow, onupdate=utcnow, nullable=False)
     
     # Relationships
     user = db.relationship('User', backref='exam_attempts')
@@ -34,6 +48,15 @@ class ExamAttempt(db.Model):
     def __repr__(self):
         return f'<ExamAttempt {self.id}: User {self.user_id} - Exam {self.exam_id}>'
     
+    @property
+    def user_answers(self):
+        """User answers as {question_id: user_answer}, decoded from answer_sheet"""
+        return decode_user_answers(self.answer_sheet)
+    
+    @user_answers.setter
+    def user_answers(self, value):
+        self.answer_sheet = encode_user_answers(value)
+    
     def get_score_percentage(self):
         """Calculate the score percentage for display purposes"""
         if self.total_marks > 0:
@@ -41,19 +64,26 @@ class ExamAttempt(db.Model):
         return 0.0
     
     
-    def to_dict(self):
-        return {
+    def to_dict(self, exam=None, include_percentile=False):
+        # Callers that already hold the exam (or a cached snapshot) pass it in to skip the lazy load
+        exam = exam or self.exam
+        data = {
             'id': self.id,
             'user_id': self.user_id,
             'exam_id': self.exam_id,
-            'exam_title': self.exam.title if self.exam else None,
-            'started_at': self.started_at.isoformat(),
-            'completed_at': self.completed_at.isoformat() if self.completed_at else None,
+            'exam_title': exam.title if exam else None,
+            'started_at': self.started_at,
+            'completed_at': self.completed_at,
             'total_questions': self.total_questions,
             'total_marks': self.total_marks,
             'score': self.score,
             'score_percentage': self.get_score_percentage(),
             'status': self.status,
-            'created_at': self.created_at.isoformat(),
-            'updated_at': self.updated_at.isoformat()
+            'created_at': self.created_at,
+            'updated_at': self.updated_at
         }
+        # The percentile may load the exam's score index, so lists leave it out
+        if include_percentile:
+            from app.services.score_index import score_index
+            data['score_percentile'] = score_index.percentile(self.exam_id, self.score)
+        return data
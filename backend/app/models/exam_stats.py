@@ -0,0 +1,31 @@
+from app import db
+from app.utils.timestamps import utcnow
+
+class ExamStats(db.Model):
+    """Running totals of every graded attempt on an exam"""
+    __tablename__ = 'exam_stats'
+    
+    exam_id = db.Column(db.Integer, db.ForeignKey('exam.id'), primary_key=True)
+    attempt_count = db.Column(db.Integer, default=0, nullable=False)
+    score_sum = db.Column(db.BigInteger, default=0, nullable=False)
+    score_sq_sum = db.Column(db.BigInteger, default=0, nullable=False)  # Sum of squared scores, for the variance
+    updated_at = db.Column(db.DateTime, default=utcnow, onupdate=utcnow, nullable=False)
+
+    def __repr__(self):
+        return f'<ExamStats {self.exam_id}: {self.attempt_count} attempts>'
+
+class ExamScoreBucket(db.Model):
+    """Number of attempts on an exam with a given score (0-50); missing rows mean zero"""
+    __tablename__ = 'exam_score_bucket'
+    
+    exam_id = db.Column(db.Integer, db.ForeignKey('exam.id'), primary_key=True)
+    score = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    count = db.Column(db.Integer, default=0, nullable=False)
+
+class ExamQuestionStat(db.Model):
+    """Number of attempts on an exam that answered a question correctly; missing rows mean zero"""
+    __tablename__ = 'exam_question_stat'
+    
+    exam_id = db.Column(db.Integer, db.ForeignKey('exam.id'), primary_key=True)
+    question_number = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    correct_count = db.Column(db.Integer, default=0, nullable=False)
@@ -1,12 +1,18 @@
-from datetime import datetime, timezone
 from app import db
+from app.utils.timestamps import utcnow
 
 class User(db.Model):
+    __table_args__ = (
+        # Case-insensitive uniqueness and login lookups
+        db.Index('ix_user_username_lower', db.func.lower(db.text('username')), unique=True),
+        db.Index('ix_user_email_lower', db.func.lower(db.text('email')), unique=True),
+    )
+    
     id = db.Column(db.Integer, primary_key=True)
     username = db.Column(db.String(80), unique=True, nullable=False)
     email = db.Column(db.String(120), unique=True, nullable=False)
     password_hash = db.Column(db.String(255), nullable=False)
-    created_at = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc), nullable=False)
+    created_at = db.Column(db.DateTime, default=utcnow, nullable=False)
     is_active = db.Column(db.Boolean, default=True)
     is_admin = db.Column(db.Boolean, default=False)
 
@@ -18,7 +24,7 @@ class User(db.Model):
             'id': self.id,
             'username': self.username,
             'email': self.email,
-            'created_at': self.created_at.isoformat(),
+            'created_at': self.created_at,
             'is_active': self.is_active,
             'is_admin': self.is_admin
         }
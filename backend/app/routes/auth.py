@@ -1,6 +1,7 @@
 from flask import Blueprint, request, jsonify
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from app.services.auth_service import AuthService
+from app.services.password_hasher import PasswordVerifyBusy
 
 auth_bp = Blueprint('auth', __name__)
 
@@ -67,5 +68,8 @@ def login():
             'user': result['user']
         }), 200
         
+    except PasswordVerifyBusy:
+        # Shed the login rather than queue it behind a full verification pool
+        return jsonify({'error': 'Too many logins in progress, please try again'}), 503, {'Retry-After': '1'}
     except Exception as e:
         return jsonify({'error': 'Login failed'}), 500
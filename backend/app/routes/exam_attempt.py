@@ -1,25 +1,119 @@
-from flask import Blueprint, jsonify, request
+from flask import Blueprint, jsonify, request, current_app
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from app.models.user import User
 from app.models.exam import Exam
 from app.models.exam_attempt import ExamAttempt
+from app.models.exam_stats import ExamStats
+from app.routes.exams import require_admin
+from app.services.grading_service import GradingService
+from app.services.exam_cache import exam_cache
+from app.services.exam_stats_service import ExamStatsService
+from app.services.score_index import score_index
+from app.services.submission_pipeline import submission_pipeline
+from app.utils.answer_codec import encode_user_answers
+from app.utils.http_cache import conditional
+from app.utils.pagination import encode_cursor, decode_cursor, parse_limit
+from app.utils.timestamps import utcnow
+from sqlalchemy import and_, func, or_
+from sqlalchemy.orm import joinedload
 from app import db
-from datetime import datetime, timezone
+import logging
+import time
+import traceback
+import uuid
+
+# Create module-level logger
+logger = logging.getLogger(__name__)
 
 exam_attempt_bp = Blueprint('exam_attempt', __name__)
 
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+
+def exam_attempts_version():
+    """Validator for GET /exam-attempts: the user's attempts and the exams their titles come from"""
+    user_attempts = ExamAttempt.user_id == int(get_jwt_identity())
+    row = tuple(db.session.query(
+        db.session.query(func.count(ExamAttempt.id)).filter(user_attempts).scalar_subquery(),
+        db.session.query(func.max(ExamAttempt.updated_at)).filter(user_attempts).scalar_subquery(),
+        db.session.query(func.count(Exam.id)).scalar_subquery(),
+        db.session.query(func.max(Exam.updated_at)).scalar_subquery()
+    ).one())
+    
+    last_modified = max((value for value in row[1::2] if value is not None), default=None)
+    return row, last_modified
+
+def exam_attempt_version(attempt_id):
+    """Validator for GET /exam-attempts/<id>: the attempt's updated_at, the cached exam version and the exam's attempt count"""
+    row = db.session.query(
+        ExamAttempt.updated_at, ExamAttempt.exam_id, ExamStats.attempt_count, ExamStats.updated_at.label('stats_updated_at')
+    ).outerjoin(
+        ExamStats, ExamStats.exam_id == ExamAttempt.exam_id
+    ).filter(
+        ExamAttempt.id == attempt_id,
+        ExamAttempt.user_id == int(get_jwt_identity())
+    ).first()
+    if not row:
+        return None
+    
+    exam = exam_cache.get(row.exam_id)
+    if not exam:
+        return None
+    last_modified = max(value for value in (row.updated_at, exam.updated_at, row.stats_updated_at) if value is not None)
+    return (row.updated_at, exam.version, row.attempt_count), last_modified
+
 @exam_attempt_bp.route('/exam-attempts', methods=['GET'])
 @jwt_required()
+@conditional(exam_attempts_version)
 def get_user_exam_attempts():
-    """Get all exam attempts for the current user"""
+    """
+    Get exam attempts for the current user, most recent first
+    Query params:
+    - limit: page size (default 20, max 100)
+    - after: cursor from a previous page's next_cursor
+    - all: 'true' to return the full history in one response
+    """
     try:
         user_id = get_jwt_identity()
         
-        # Get all exam attempts for this user, ordered by most recent first
-        attempts = ExamAttempt.query.filter_by(user_id=int(user_id)).order_by(ExamAttempt.created_at.desc()).all()
+        query = ExamAttempt.query.filter_by(user_id=int(user_id)).options(
+            joinedload(ExamAttempt.exam).load_only(Exam.title)
+        ).order_by(ExamAttempt.created_at.desc(), ExamAttempt.id.desc())
+        
+        if request.args.get('all', '').lower() == 'true':
+            attempts = query.all()
+            return jsonify({
+                'exam_attempts': [attempt.to_dict() for attempt in attempts],
+                'next_cursor': None,
+                'has_more': False
+            }), 200
+        
+        limit = parse_limit(request.args.get('limit'), DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE)
+        if limit is None:
+            return jsonify({'error': 'Invalid limit'}), 400
+        
+        after = request.args.get('after')
+        if after:
+            position = decode_cursor(after)
+            if not position:
+                return jsonify({'error': 'Invalid cursor'}), 400
+            created_at, attempt_id = position
+            # Keyset condition on (created_at, id) so each page is an index range scan
+            query = query.filter(or_(
+                ExamAttempt.created_at < created_at,
+                and_(ExamAttempt.created_at == created_at, ExamAttempt.id < attempt_id)
+            ))
+        
+        # Fetch one extra row to know whether another page exists
+        attempts = query.limit(limit + 1).all()
+        has_more = len(attempts) > limit
+        attempts = attempts[:limit]
+        next_cursor = encode_cursor(attempts[-1].created_at, attempts[-1].id) if has_more else None
         
         return jsonify({
-            'exam_attempts': [attempt.to_dict() for attempt in attempts]
+            'exam_attempts': [attempt.to_dict() for attempt in attempts],
+            'next_cursor': next_cursor,
+            'has_more': has_more
         }), 200
         
     except Exception as e:
@@ -27,6 +121,7 @@ def get_user_exam_attempts():
 
 @exam_attempt_bp.route('/exam-attempts/<int:attempt_id>', methods=['GET'])
 @jwt_required()
+@conditional(exam_attempt_version)
 def get_exam_attempt_details(attempt_id):
     """Get detailed exam attempt with questions and answers"""
     try:
@@ -38,7 +133,7 @@ def get_exam_attempt_details(attempt_id):
             return jsonify({'error': 'Exam attempt not found'}), 404
         
         # Get the exam and its questions
-        exam = Exam.query.get(attempt.exam_id)
+        exam = exam_cache.get(attempt.exam_id)
         if not exam:
             return jsonify({'error': 'Exam not found'}), 404
         
@@ -64,7 +159,7 @@ def get_exam_attempt_details(attempt_id):
             questions_data.append(question_dict)
         
         return jsonify({
-            'attempt': attempt.to_dict(),
+            'attempt': attempt.to_dict(exam=exam, include_percentile=True),
             'exam': exam.to_dict(),
             'questions': questions_data
         }), 200
@@ -81,7 +176,7 @@ def submit_graded_exam(exam_id):
         user_id = get_jwt_identity()
         
         # Check if exam exists and is active
-        exam = Exam.query.get(exam_id)
+        exam = exam_cache.get(exam_id)
         if not exam:
             return jsonify({'error': 'Exam not found'}), 404
         
@@ -95,38 +190,56 @@ def submit_graded_exam(exam_id):
         
         user_answers = data['answers']
         
-        # Get exam and calculate score
-        exam = Exam.query.get(exam_id)
-        if not exam or not exam.answers:
+        # Calculate score against the cached answer key
+        if not exam.answer_key:
             return jsonify({'error': 'Exam has no answers configured'}), 400
         
         total_questions = 50
         total_marks = 50
-        total_score = 0
+        answer_sheet = encode_user_answers(user_answers)
+        total_score, correct = GradingService.grade_sheet(exam.answer_key, answer_sheet)
         
-        # Calculate score by comparing user answers with exam answers
-        for i in range(50):
-            question_id = str(i + 1)
-            user_answer = user_answers.get(question_id)
-            correct_answer = exam.answers[i] if i < len(exam.answers) else None
+        completed_at = utcnow()
+        if submission_pipeline.enabled:
+            # Queue the attempt for the writer thread's next group commit
+            submission_id = str(uuid.uuid4())
+            pending = submission_pipeline.submit({
+                'submission_id': submission_id,
+                'user_id': int(user_id),
+                'exam_id': exam_id,
+                'total_questions': total_questions,
+                'total_marks': total_marks,
+                'score': total_score,
+                'status': 'completed',
+                'answer_sheet': answer_sheet,
+                'started_at': completed_at,
+                'completed_at': completed_at,
+                'created_at': completed_at,
+                'updated_at': completed_at
+            }, correct)
+            # Only known once the row is committed, i.e. with SUBMISSION_DURABILITY=commit
+            attempt_id = pending.attempt_id
+        else:
+            # Create exam attempt record
+            attempt = ExamAttempt(
+                user_id=int(user_id),
+                exam_id=exam_id,
+                total_questions=total_questions,
+                total_marks=total_marks,
+                score=total_score,
+                status='completed',
+                answer_sheet=answer_sheet,
+                completed_at=completed_at
+            )
             
-            if user_answer and correct_answer and user_answer == correct_answer:
-                total_score += 1
-        
-        # Create exam attempt record
-        attempt = ExamAttempt(
-            user_id=int(user_id),
-            exam_id=exam_id,
-            total_questions=total_questions,
-            total_marks=total_marks,
-            score=total_score,
-            status='completed',
-            user_answers=user_answers,
-            completed_at=datetime.now(timezone.utc)
-        )
-        
-        db.session.add(attempt)
-        db.session.commit()
+            db.session.add(attempt)
+            # Update the exam's running statistics in the same transaction
+            ExamStatsService.record(exam_id, [total_score], correct)
+            commit_started = time.monotonic()
+            db.session.commit()
+            score_index.record(exam_id, [total_score], commit_started)
+            submission_id = None
+            attempt_id = attempt.id
         
         # Calculate percentage
         score_percentage = round((total_score / total_marks) * 100, 1) if total_marks > 0 else 0
@@ -136,10 +249,63 @@ def submit_graded_exam(exam_id):
             'score': total_score,
             'total_marks': total_marks,
             'score_percentage': score_percentage,
+            'score_percentile': score_index.percentile(exam_id, total_score),
             'total_questions': total_questions,
-            'attempt_id': attempt.id
+            'attempt_id': attempt_id,
+            'submission_id': submission_id
         }), 200
         
     except Exception as e:
         db.session.rollback()
         return jsonify({'error': 'Failed to grade exam'}), 500
+
+
+@exam_attempt_bp.route('/submit-graded-exam/<int:exam_id>/batch', methods=['POST'])
+@jwt_required()
+def submit_graded_exam_batch(exam_id):
+    """
+    Grade a batch of paper answer sheets for one exam (admin only)
+    
+    Request body:
+    - sheets: list of { "username" or "user_id", "answers": {question_id: answer} }
+    """
+    admin_user = require_admin()
+    if not admin_user:
+        return jsonify({'error': 'Admin access required'}), 403
+    
+    try:
+        exam = exam_cache.get(exam_id)
+        if not exam:
+            return jsonify({'error': 'Exam not found'}), 404
+        
+        if not exam.answer_key:
+            return jsonify({'error': 'Exam has no answers configured'}), 400
+        
+        data = request.get_json()
+        if not data or not isinstance(data.get('sheets'), list) or not data['sheets']:
+            return jsonify({'error': 'Sheets are required'}), 400
+        
+        sheets = data['sheets']
+        max_sheets = current_app.config['BATCH_GRADING_MAX_SHEETS']
+        if len(sheets) > max_sheets:
+            return jsonify({'error': f'At most {max_sheets} sheets can be graded per request'}), 400
+        
+        results, errors, timing = GradingService.grade_batch(exam, sheets)
+        logger.info(
+            f"Graded {len(results)} sheets for exam {exam_id} "
+            f"in {timing['total_ms']}ms ({timing['sheets_per_second']} sheets/s)"
+        )
+        
+        return jsonify({
+            'message': 'Exam sheets graded successfully',
+            'graded': len(results),
+            'results': results,
+            'errors': errors,
+            'timing': timing
+        }), 200
+        
+    except Exception as e:
+        db.session.rollback()
+        logger.error(f"Exception in submit_graded_exam_batch: {str(e)}")
+        logger.error(traceback.format_exc())
+        return jsonify({'error': 'Failed to grade exam sheets'}), 500
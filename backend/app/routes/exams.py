@@ -1,9 +1,21 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, request, jsonify, current_app, stream_with_context
 from flask_jwt_extended import jwt_required, get_jwt_identity
-from app.models.user import User
 from app.models.exam import Exam
 from app.models.exam_attempt import ExamAttempt
+from app.services.exam_cache import exam_cache
+from app.services.auth_service import AuthService
+from app.services.exam_stats_service import ExamStatsService
+from app.services.score_index import score_index
+from app.services.item_analysis_service import ItemAnalysisService
+from app.services.export_service import ExportService, EXPORT_FORMATS
+from app.services.exam_import_service import ExamImportService
+from app.utils.compression import response_compressor
+from app.utils.http_cache import PayloadCache, payload_response, conditional
+from app.utils.validators import validate_answer_key
+from app.utils.answer_codec import encode_answer_key
 from app import db
+from sqlalchemy import and_, func, update
+from datetime import datetime, timedelta
 import logging
 import traceback
 
@@ -12,33 +24,148 @@ logger = logging.getLogger(__name__)
 
 exams_bp = Blueprint('exams', __name__)
 
+# Pre-serialized question sheets keyed by (exam_id, updated_at)
+question_sheet_cache = PayloadCache()
+
+DEFAULT_CATALOG_PAGE_SIZE = 20
+MAX_CATALOG_PAGE_SIZE = 100
+CATALOG_SORT_COLUMNS = {
+    'created_at': Exam.created_at,
+    'updated_at': Exam.updated_at,
+    'title': Exam.title
+}
+
 def require_admin():
-    """Helper function to check if current user is admin"""
-    user_id = get_jwt_identity()
-    user = User.query.get(int(user_id))
+    """Helper function to check if current user is an active admin"""
+    user = AuthService.get_current_user()
     
-    if not user or not user.is_admin:
+    if not user or not user.is_admin or not user.is_active:
         return None
     return user
 
+def parse_date_param(value, end_of_day=False):
+    """Parse an ISO date or datetime query parameter; a bare end date covers the whole day"""
+    if not value:
+        return None
+    parsed = datetime.fromisoformat(value)
+    if end_of_day and len(value) == 10:
+        parsed += timedelta(days=1)
+    elif end_of_day:
+        parsed += timedelta(microseconds=1)
+    return parsed
+
+def latest_attempts_subquery(user_id):
+    """
+    Rank a user's attempts per exam, newest first.
+    
+    Rows with rank == 1 are the latest attempt for each exam, so joining on
+    them replaces a per-exam lookup with a single set-based query.
+    """
+    return db.session.query(
+        ExamAttempt.id.label('attempt_id'),
+        ExamAttempt.exam_id.label('exam_id'),
+        func.row_number().over(
+            partition_by=ExamAttempt.exam_id,
+            order_by=(ExamAttempt.created_at.desc(), ExamAttempt.id.desc())
+        ).label('rank')
+    ).filter(ExamAttempt.user_id == user_id).subquery()
+
+def catalog_query(active=None, created_by=None, created_from=None, created_to=None,
+                  sort='created_at', order='desc', attempts_of=None):
+    """
+    Build the GET /exams query from already validated parameters.
+    
+    Rows are ordered by the sort column with the exam id as a tiebreak so
+    pages are stable. With attempts_of, each row also carries that user's
+    latest attempt (or None).
+    """
+    query = Exam.query
+    if active is not None:
+        query = query.filter_by(is_active=active)
+    if created_by is not None:
+        query = query.filter(Exam.created_by == created_by)
+    if created_from is not None:
+        query = query.filter(Exam.created_at >= created_from)
+    if created_to is not None:
+        query = query.filter(Exam.created_at < created_to)
+    
+    sort_column = CATALOG_SORT_COLUMNS[sort]
+    query = query.order_by(
+        sort_column.desc() if order == 'desc' else sort_column.asc(),
+        Exam.id.desc() if order == 'desc' else Exam.id.asc()
+    )
+    
+    if attempts_of is not None:
+        # Fetch every exam together with the user's latest attempt in one query
+        latest = latest_attempts_subquery(attempts_of)
+        query = query.outerjoin(
+            latest, and_(latest.c.exam_id == Exam.id, latest.c.rank == 1)
+        ).outerjoin(
+            ExamAttempt, ExamAttempt.id == latest.c.attempt_id
+        ).add_entity(ExamAttempt)
+    return query
+
+def catalog_page(query, page, per_page):
+    """One page of a catalog query; each row also carries the total row count"""
+    # A window count returns the total with the page itself, avoiding a second scan
+    return query.add_columns(func.count().over().label('total_count')).limit(per_page).offset((page - 1) * per_page)
+
+def exams_version():
+    """Validator for GET /exams: exam count and latest update, plus the user's attempts if included"""
+    user = AuthService.get_current_user()
+    if not user:
+        return None
+    
+    active_only = request.args.get('status') == 'active' or not user.is_admin
+    include_attempts = request.args.get('include_attempts', '').lower() == 'true'
+    
+    query = db.session.query(func.count(Exam.id), func.max(Exam.updated_at))
+    if active_only:
+        query = query.filter(Exam.is_active == True)
+    if include_attempts:
+        user_attempts = ExamAttempt.user_id == user.id
+        query = query.add_columns(
+            db.session.query(func.count(ExamAttempt.id)).filter(user_attempts).scalar_subquery(),
+            db.session.query(func.max(ExamAttempt.updated_at)).filter(user_attempts).scalar_subquery()
+        )
+    row = tuple(query.one())
+    
+    last_modified = max((value for value in row[1::2] if value is not None), default=None)
+    return (user.is_admin, row), last_modified
+
+def exam_version(exam_id):
+    """Validator for GET /exams/<id>, taken from the exam cache without a query"""
+    user = AuthService.get_current_user()
+    exam = exam_cache.get(exam_id)
+    if not user or not exam:
+        return None
+    return (user.is_admin, exam.version), exam.updated_at
+
 # ============================================================================
 # ADMIN EXAM MANAGEMENT ROUTES
 # ============================================================================
 
 @exams_bp.route('/exams', methods=['GET'])
 @jwt_required()
+@conditional(exams_version)
 def get_exams():
     """
     Get exams with optional filters
     Query params:
     - status: 'active' to get only active exams (for users)
     - include_attempts: 'true' to include user's attempt history
+    - active: 'true' / 'false' to filter by active state (admin catalog)
+    - created_by: creator user id
+    - created_from / created_to: ISO dates bounding created_at (inclusive)
+    - sort: 'created_at' (default), 'updated_at' or 'title'; order: 'desc' (default) or 'asc'
+    - page / per_page: return one page plus pagination info (default: all exams)
+    - include_answers: 'false' to omit answer keys from the listing
     
     If user is admin and no filters: returns all exams
     If user is not admin: only returns active exams
     """
     user_id = get_jwt_identity()
-    user = User.query.get(int(user_id))
+    user = AuthService.get_current_user()
     
     # Validate user exists
     if not user:
@@ -48,45 +175,75 @@ def get_exams():
         # Get query parameters
         status = request.args.get('status')
         include_attempts = request.args.get('include_attempts', '').lower() == 'true'
+        include_answers = request.args.get('include_answers', 'true').lower() != 'false'
+        
+        sort = request.args.get('sort', 'created_at')
+        order = request.args.get('order', 'desc').lower()
+        if sort not in CATALOG_SORT_COLUMNS or order not in ('asc', 'desc'):
+            return jsonify({'error': 'Invalid sort parameters'}), 400
         
-        # Base query
-        query = Exam.query
+        paginate = 'page' in request.args or 'per_page' in request.args
+        try:
+            page = max(1, int(request.args.get('page', 1)))
+            per_page = max(1, min(int(request.args.get('per_page', DEFAULT_CATALOG_PAGE_SIZE)), MAX_CATALOG_PAGE_SIZE))
+            created_by = int(request.args['created_by']) if request.args.get('created_by') else None
+            created_from = parse_date_param(request.args.get('created_from'))
+            created_to = parse_date_param(request.args.get('created_to'), end_of_day=True)
+        except ValueError:
+            return jsonify({'error': 'Invalid filter or pagination parameters'}), 400
         
-        # Apply filters
         if status == 'active' or not user.is_admin:
             # Non-admins can only see active exams
-            query = query.filter_by(is_active=True)
-        
-        exams = query.order_by(Exam.created_at.desc()).all()
-        
-        # If include_attempts is true, add attempt history and question counts
-        if include_attempts:
-            exam_data = []
-            for exam in exams:
-                # Get user's latest attempt for this exam
-                latest_attempt = ExamAttempt.query.filter_by(
-                    user_id=int(user_id), 
-                    exam_id=exam.id
-                ).order_by(ExamAttempt.created_at.desc()).first()
+            active = True
+        elif request.args.get('active') in ('true', 'false'):
+            active = request.args['active'] == 'true'
+        else:
+            active = None
+        
+        query = catalog_query(
+            active=active, created_by=created_by, created_from=created_from, created_to=created_to,
+            sort=sort, order=order, attempts_of=int(user_id) if include_attempts else None
+        )
+        
+        pagination = None
+        if paginate:
+            rows = catalog_page(query, page, per_page).all()
+            if rows:
+                total = rows[0].total_count
+            else:
+                total = query.order_by(None).count() if page > 1 else 0
+            pagination = {
+                'page': page,
+                'per_page': per_page,
+                'total': total,
+                'pages': (total + per_page - 1) // per_page
+            }
+        else:
+            rows = query.all()
+        
+        exam_data = []
+        for row in rows:
+            exam = row[0] if include_attempts or paginate else row
+            exam_info = exam.to_dict(include_answers=include_answers)
+            
+            if include_attempts:
+                latest_attempt = row[1]
                 
                 # Questions are now generated dynamically, so we use a default count
                 question_count = 50
                 total_marks = 50
                 
-                exam_info = exam.to_dict()
                 exam_info['question_count'] = question_count
                 exam_info['total_marks'] = total_marks
                 exam_info['has_attempted'] = latest_attempt is not None
-                exam_info['latest_attempt'] = latest_attempt.to_dict() if latest_attempt else None
-                
-                exam_data.append(exam_info)
+                exam_info['latest_attempt'] = latest_attempt.to_dict(exam=exam) if latest_attempt else None
             
-            return jsonify({'exams': exam_data}), 200
-        else:
-            # Simple response without attempts
-            return jsonify({
-                'exams': [exam.to_dict() for exam in exams]
-            }), 200
+            exam_data.append(exam_info)
+        
+        response = {'exams': exam_data}
+        if pagination:
+            response['pagination'] = pagination
+        return jsonify(response), 200
             
     except Exception as e:
         # Log the exception with full traceback
@@ -115,14 +272,9 @@ def create_exam():
             return jsonify({'error': 'Exam title is required'}), 400
         
         # Validate answers
-        if not answers or len(answers) != 50:
-            return jsonify({'error': 'Exactly 50 answers are required'}), 400
-        
-        # Validate each answer is A, B, C, or D
-        valid_answers = {'A', 'B', 'C', 'D'}
-        for i, answer in enumerate(answers):
-            if answer not in valid_answers:
-                return jsonify({'error': f'Invalid answer for question {i+1}. Must be A, B, C, or D'}), 400
+        is_valid, message = validate_answer_key(answers)
+        if not is_valid:
+            return jsonify({'error': message}), 400
         
         # Create exam record
         exam = Exam(
@@ -146,19 +298,67 @@ def create_exam():
         logger.error(traceback.format_exc())
         return jsonify({'error': 'Failed to create exam'}), 500
 
+@exams_bp.route('/exams/import', methods=['POST'])
+@jwt_required()
+def import_exams():
+    """
+    Create many exams at once (admin only)
+    
+    Accepts either a JSON body { "exams": [{ "title", "description", "answers", "is_active" }] }
+    or a text/csv body with columns title, description, is_active and Q1..Q50.
+    Every exam is validated first; the valid ones are inserted together and
+    the invalid ones are reported by position without blocking the rest.
+    """
+    admin_user = require_admin()
+    if not admin_user:
+        return jsonify({'error': 'Admin access required'}), 403
+    
+    try:
+        if request.mimetype == 'text/csv':
+            exams = ExamImportService.parse_csv(request.get_data(as_text=True))
+        else:
+            data = request.get_json(silent=True)
+            exams = data.get('exams') if isinstance(data, dict) else None
+            if not isinstance(exams, list):
+                return jsonify({'error': 'Exams are required'}), 400
+        
+        if not exams:
+            return jsonify({'error': 'Exams are required'}), 400
+        
+        max_rows = current_app.config['EXAM_IMPORT_MAX_ROWS']
+        if len(exams) > max_rows:
+            return jsonify({'error': f'At most {max_rows} exams can be imported per request'}), 400
+        
+        created, errors = ExamImportService.import_exams(exams, admin_user.id)
+        
+        return jsonify({
+            'message': 'Exams imported successfully' if created else 'No exams were imported',
+            'imported': len(created),
+            'exams': created,
+            'errors': errors
+        }), 201 if created else 400
+        
+    except Exception as e:
+        db.session.rollback()
+        logger.error(f"Exception in import_exams: {str(e)}")
+        logger.error(traceback.format_exc())
+        return jsonify({'error': 'Failed to import exams'}), 500
+
 @exams_bp.route('/exams/<int:exam_id>', methods=['GET'])
 @jwt_required()
+@conditional(exam_version)
 def get_exam(exam_id):
     """
     Get specific exam details
     - Admin: Full access to any exam
     - User: Can view active exams with question counts by subject
     """
-    user_id = get_jwt_identity()
-    user = User.query.get(int(user_id))
+    user = AuthService.get_current_user()
+    if not user:
+        return jsonify({'error': 'User not found'}), 404
     
     try:
-        exam = Exam.query.get(exam_id)
+        exam = exam_cache.get(exam_id)
         if not exam:
             return jsonify({'error': 'Exam not found'}), 404
         
@@ -183,15 +383,30 @@ def get_exam(exam_id):
         logger.error(traceback.format_exc())
         return jsonify({'error': 'Failed to fetch exam'}), 500
 
+def build_question_sheet():
+    """Generate 50 generic questions for grading"""
+    questions_data = []
+    for i in range(1, 51):
+        questions_data.append({
+            'id': i,
+            'question_text': f'Question {i}: Select the correct answer.',
+            'question_type': 'multiple_choice',
+            'subject': 'English' if i <= 25 else 'Maths',
+            'options': ['Option A', 'Option B', 'Option C', 'Option D'],
+            'marks': 1
+        })
+    return {'questions': questions_data}
+
 @exams_bp.route('/exams/<int:exam_id>/questions', methods=['GET'])
 @jwt_required()
 def get_exam_questions(exam_id):
     """Get questions for an exam (for grading purposes) - returns 50 generic questions"""
-    user_id = get_jwt_identity()
-    user = User.query.get(int(user_id))
+    user = AuthService.get_current_user()
+    if not user:
+        return jsonify({'error': 'User not found'}), 404
     
     try:
-        exam = Exam.query.get(exam_id)
+        exam = exam_cache.get(exam_id)
         if not exam:
             return jsonify({'error': 'Exam not found'}), 404
         
@@ -199,21 +414,9 @@ def get_exam_questions(exam_id):
         if not user.is_admin and not exam.is_active:
             return jsonify({'error': 'Exam not found'}), 404
         
-        # Generate 50 generic questions for grading
-        questions_data = []
-        for i in range(1, 51):
-            questions_data.append({
-                'id': i,
-                'question_text': f'Question {i}: Select the correct answer.',
-                'question_type': 'multiple_choice',
-                'subject': 'English' if i <= 25 else 'Maths',
-                'options': ['Option A', 'Option B', 'Option C', 'Option D'],
-                'marks': 1
-            })
-        
-        return jsonify({
-            'questions': questions_data
-        }), 200
+        # Serve the question sheet serialized once per exam version
+        payload = question_sheet_cache.get_or_build(exam.version, build_question_sheet)
+        return payload_response(payload)
     except Exception as e:
         logger.error(f"Exception in get_exam_questions: {str(e)}")
         logger.error(traceback.format_exc())
@@ -232,12 +435,15 @@ def delete_exam(exam_id):
         if not exam:
             return jsonify({'error': 'Exam not found'}), 404
         
-        # Delete associated exam attempts first (foreign key constraint)
+        # Delete associated exam attempts and statistics first (foreign key constraint)
         ExamAttempt.query.filter_by(exam_id=exam_id).delete()
+        ExamStatsService.delete(exam_id)
         
         # Delete the exam
         db.session.delete(exam)
         db.session.commit()
+        exam_cache.invalidate(exam_id)
+        score_index.invalidate(exam_id)
         
         return jsonify({
             'message': 'Exam deleted successfully'
@@ -269,50 +475,53 @@ def update_exam(exam_id):
         return jsonify({'error': 'Admin access required'}), 403
     
     try:
-        exam = Exam.query.get(exam_id)
-        if not exam:
-            return jsonify({'error': 'Exam not found'}), 404
-        
         data = request.get_json()
         if not data:
             return jsonify({'error': 'No data provided'}), 400
         
-        # Update fields if provided
+        # Collect the new values, then apply them with a single UPDATE
+        values = {}
         updated_fields = []
         
         if 'is_active' in data:
-            exam.is_active = bool(data['is_active'])
+            values['is_active'] = bool(data['is_active'])
             updated_fields.append('is_active')
         
         if 'title' in data:
             title = data['title'].strip()
             if title:
-                exam.title = title
+                values['title'] = title
                 updated_fields.append('title')
         
         if 'description' in data:
-            exam.description = data['description'].strip()
+            values['description'] = data['description'].strip()
             updated_fields.append('description')
         
         if 'answers' in data:
             answers = data['answers']
             # Validate answers
-            if not answers or len(answers) != 50:
-                return jsonify({'error': 'Exactly 50 answers are required'}), 400
+            is_valid, message = validate_answer_key(answers)
+            if not is_valid:
+                return jsonify({'error': message}), 400
             
-            # Validate each answer is A, B, C, or D
-            valid_answers = {'A', 'B', 'C', 'D'}
-            for i, answer in enumerate(answers):
-                if answer not in valid_answers:
-                    return jsonify({'error': f'Invalid answer for question {i+1}. Must be A, B, C, or D'}), 400
-            
-            exam.answers = answers
+            values['answer_key'] = encode_answer_key(answers)
             updated_fields.append('answers')
         
         if not updated_fields:
             return jsonify({'error': 'No valid fields provided'}), 400
         
+        statement = update(Exam).where(Exam.id == exam_id).values(**values)
+        if db.engine.dialect.update_returning:
+            # UPDATE ... RETURNING: the updated row comes back with the write
+            exam = db.session.scalars(statement.returning(Exam)).one_or_none()
+        else:
+            exam = db.session.get(Exam, exam_id) if db.session.execute(statement).rowcount else None
+        if not exam:
+            db.session.rollback()
+            return jsonify({'error': 'Exam not found'}), 404
+        
         db.session.commit()
+        exam_cache.invalidate(exam_id)
         
         return jsonify({
             'message': f'Exam updated successfully',
@@ -326,6 +535,105 @@ def update_exam(exam_id):
         logger.error(traceback.format_exc())
         return jsonify({'error': 'Failed to update exam'}), 500
 
+@exams_bp.route('/exams/<int:exam_id>/stats', methods=['GET'])
+@jwt_required()
+def get_exam_stats(exam_id):
+    """
+    Get score statistics for an exam (admin only)
+    
+    Served from the incrementally maintained aggregates, so the cost does not
+    depend on the number of attempts.
+    """
+    admin_user = require_admin()
+    if not admin_user:
+        return jsonify({'error': 'Admin access required'}), 403
+    
+    try:
+        exam = exam_cache.get(exam_id)
+        if not exam:
+            return jsonify({'error': 'Exam not found'}), 404
+        
+        return jsonify({
+            'stats': ExamStatsService.get_summary(exam_id)
+        }), 200
+    except Exception as e:
+        logger.error(f"Exception in get_exam_stats: {str(e)}")
+        logger.error(traceback.format_exc())
+        return jsonify({'error': 'Failed to fetch exam statistics'}), 500
+
+@exams_bp.route('/exams/<int:exam_id>/item-analysis', methods=['GET'])
+@jwt_required()
+def get_exam_item_analysis(exam_id):
+    """
+    Get classical item analysis for an exam (admin only)
+    
+    Returns each question's p-value (difficulty), point-biserial
+    discrimination and how often each option was chosen.
+    """
+    admin_user = require_admin()
+    if not admin_user:
+        return jsonify({'error': 'Admin access required'}), 403
+    
+    try:
+        analysis = ItemAnalysisService.analyze(exam_id)
+        if analysis is None:
+            return jsonify({'error': 'Exam not found'}), 404
+        
+        return jsonify({
+            'item_analysis': analysis
+        }), 200
+    except Exception as e:
+        logger.error(f"Exception in get_exam_item_analysis: {str(e)}")
+        logger.error(traceback.format_exc())
+        return jsonify({'error': 'Failed to compute item analysis'}), 500
+
+@exams_bp.route('/exams/<int:exam_id>/attempts/export', methods=['GET'])
+@jwt_required()
+def export_exam_attempts(exam_id):
+    """
+    Export every attempt on an exam (admin only)
+    Query params:
+    - format: 'csv' (default) or 'ndjson'
+    
+    Rows are streamed as they are read, with answers flattened into Q1..Q50.
+    """
+    admin_user = require_admin()
+    if not admin_user:
+        return jsonify({'error': 'Admin access required'}), 403
+    
+    export_format = request.args.get('format', 'csv').lower()
+    if export_format not in EXPORT_FORMATS:
+        return jsonify({'error': f"Invalid format. Must be one of: {', '.join(EXPORT_FORMATS)}"}), 400
+    
+    try:
+        exam = exam_cache.get(exam_id)
+        if not exam:
+            return jsonify({'error': 'Exam not found'}), 404
+        
+        response = current_app.response_class(
+            stream_with_context(ExportService.iter_export(exam_id, export_format)),
+            mimetype=EXPORT_FORMATS[export_format]
+        )
+        response.headers['Content-Disposition'] = f'attachment; filename=exam-{exam_id}-attempts.{export_format}'
+        return response
+    except Exception as e:
+        logger.error(f"Exception in export_exam_attempts: {str(e)}")
+        logger.error(traceback.format_exc())
+        return jsonify({'error': 'Failed to export exam attempts'}), 500
+
+@exams_bp.route('/exams/cache-stats', methods=['GET'])
+@jwt_required()
+def get_exam_cache_stats():
+    """Get hit/miss counters for this worker's exam and compressed response caches (admin only)"""
+    admin_user = require_admin()
+    if not admin_user:
+        return jsonify({'error': 'Admin access required'}), 403
+    
+    return jsonify({
+        'exam_cache': exam_cache.stats(),
+        'compression': response_compressor.stats()
+    }), 200
+
 # Note: Questions are now generated dynamically for grading
 
 
@@ -1,4 +1,10 @@
-from flask import Blueprint, jsonify
+import hmac
+from flask import Blueprint, jsonify, request, current_app
+from flask_jwt_extended import jwt_required
+from app.services.auth_service import AuthService
+from app.services.submission_pipeline import submission_pipeline
+from app.utils.db_engine import db_stats
+from app.utils.metrics import request_metrics
 
 health_bp = Blueprint('health', __name__)
 
@@ -9,3 +15,29 @@ def health_check():
         'status': 'healthy',
         'message': 'Grammar School API is running'
     }), 200
+
+@health_bp.route('/health/db', methods=['GET'])
+@jwt_required()
+def database_stats():
+    """Connection pool usage, write latency and lock errors for this worker (admin only)"""
+    user = AuthService.get_current_user()
+    if not user or not user.is_admin or not user.is_active:
+        return jsonify({'error': 'Admin access required'}), 403
+    
+    return jsonify({
+        'database': db_stats.snapshot(),
+        'submission_pipeline': submission_pipeline.stats()
+    }), 200
+
+@health_bp.route('/metrics', methods=['GET'])
+def metrics():
+    """Prometheus metrics summed over every worker (requires METRICS_TOKEN as a bearer token when set)"""
+    if not request_metrics.enabled:
+        return jsonify({'error': 'Metrics are disabled'}), 404
+    
+    token = current_app.config.get('METRICS_TOKEN')
+    if token and not hmac.compare_digest(request.headers.get('Authorization', ''), f'Bearer {token}'):
+        return jsonify({'error': 'Metrics token required'}), 401
+    
+    body, content_type = request_metrics.render()
+    return current_app.response_class(body, content_type=content_type)
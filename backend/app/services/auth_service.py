@@ -1,10 +1,54 @@
-from werkzeug.security import generate_password_hash, check_password_hash
-from flask_jwt_extended import create_access_token
+from collections import namedtuple
+from flask_jwt_extended import create_access_token, get_jwt
+from sqlalchemy.exc import IntegrityError
 from app.models.user import User
+from app.services.password_hasher import password_hasher
 from app import db
 from app.utils.validators import validate_email, validate_password, validate_username
 
+# Unique indexes and constraints on user, as PostgreSQL names them and as SQLite reports them
+EMAIL_CONSTRAINTS = ('ix_user_email_lower', 'user_email_key', 'user.email')
+USERNAME_CONSTRAINTS = ('ix_user_username_lower', 'user_username_key', 'user.username')
+
+def violated_constraint(error):
+    """The constraint an IntegrityError names: psycopg2 reports it directly, SQLite only in the message"""
+    diag = getattr(error.orig, 'diag', None)
+    return getattr(diag, 'constraint_name', None) or str(error.orig)
+
+# The authenticated user as described by the access token's claims
+CurrentUser = namedtuple('CurrentUser', ['id', 'is_admin', 'is_active'])
+
 class AuthService:
+    @staticmethod
+    def create_token(user):
+        """Create an access token carrying the user's role and active status as claims"""
+        return create_access_token(
+            identity=str(user.id),
+            additional_claims={
+                'is_admin': bool(user.is_admin),
+                'is_active': bool(user.is_active)
+            }
+        )
+    
+    @staticmethod
+    def get_current_user():
+        """
+        Get the current user's id, role and active status from the token's claims.
+        
+        No database read: tokens of deactivated or demoted users are rejected
+        before the route runs by the revocation check in create_app. Tokens
+        issued before role claims were added fall back to loading the user.
+        """
+        claims = get_jwt()
+        user_id = int(claims['sub'])
+        if 'is_admin' in claims and 'is_active' in claims:
+            return CurrentUser(user_id, bool(claims['is_admin']), bool(claims['is_active']))
+        
+        user = db.session.get(User, user_id)
+        if not user:
+            return None
+        return CurrentUser(user.id, bool(user.is_admin), bool(user.is_active))
+    
     @staticmethod
     def register_user(username, email, password):
         """Register a new user"""
@@ -20,48 +64,58 @@ class AuthService:
         if not is_valid_password:
             return None, password_message
         
-        # Check if user already exists
-        if User.query.filter_by(username=username).first():
-            return None, "Username already exists"
-        
-        if User.query.filter_by(email=email).first():
-            return None, "Email already exists"
-        
-        # Create new user
-        password_hash = generate_password_hash(password)
+        # Create new user; the case-insensitive unique indexes reject existing usernames and emails
+        password_hash = password_hasher.hash(password)
         user = User(username=username, email=email, password_hash=password_hash)
         
         try:
             db.session.add(user)
             db.session.commit()
-            
-            # Generate JWT token
-            access_token = create_access_token(identity=str(user.id))
-            
-            return {
-                'user': user.to_dict(),
-                'access_token': access_token
-            }, None
+        except IntegrityError as e:
+            db.session.rollback()
+            # Match on the constraint, not the message, which on PostgreSQL includes the duplicate value
+            constraint = violated_constraint(e)
+            if any(name in constraint for name in EMAIL_CONSTRAINTS):
+                return None, "Email already exists"
+            if any(name in constraint for name in USERNAME_CONSTRAINTS):
+                return None, "Username already exists"
+            return None, "Registration failed"
         except Exception as e:
             db.session.rollback()
             return None, "Registration failed"
+        
+        # Generate JWT token
+        access_token = AuthService.create_token(user)
+        
+        return {
+            'user': user.to_dict(),
+            'access_token': access_token
+        }, None
     
     @staticmethod
     def authenticate_user(username_or_email, password):
         """Authenticate user login"""
-        # Find user by username or email
-        user = User.query.filter(
-            (User.username == username_or_email) | (User.email == username_or_email)
-        ).first()
+        # Usernames cannot contain '@', so the input decides which index to use
+        login = username_or_email.strip().lower()
+        column = User.email if '@' in login else User.username
+        user = User.query.filter(db.func.lower(column) == login).first()
         
-        if not user or not check_password_hash(user.password_hash, password):
+        if not user or not password_hasher.verify(user.password_hash, password):
             return None, "Invalid credentials"
         
         if not user.is_active:
             return None, "Account is deactivated"
         
+        # Upgrade hashes made with an older scheme or cost while the plain password is at hand
+        if password_hasher.needs_rehash(user.password_hash):
+            try:
+                user.password_hash = password_hasher.hash(password)
+                db.session.commit()
+            except Exception:
+                db.session.rollback()
+        
         # Generate JWT token
-        access_token = create_access_token(identity=str(user.id))
+        access_token = AuthService.create_token(user)
         
         return {
             'user': user.to_dict(),
@@ -71,4 +125,4 @@ class AuthService:
     @staticmethod
     def get_user_by_id(user_id):
         """Get user by ID"""
-        return User.query.get(user_id)
+        return db.session.get(User, user_id)
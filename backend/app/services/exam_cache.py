@@ -0,0 +1,116 @@
+import threading
+import time
+from collections import OrderedDict
+from app.models.exam import Exam
+from app.utils.answer_codec import decode_answer_key
+from app import db
+
+class ExamSnapshot:
+    """Read-only copy of an exam row that is safe to share between requests"""
+    __slots__ = ('id', 'title', 'is_active', 'answer_key', 'updated_at', '_data')
+
+    def __init__(self, exam):
+        self.id = exam.id
+        self.title = exam.title
+        self.is_active = exam.is_active
+        self.answer_key = exam.answer_key
+        self.updated_at = exam.updated_at
+        self._data = exam.to_dict()
+
+    @property
+    def version(self):
+        return (self.id, self.updated_at)
+
+    @property
+    def answers(self):
+        return decode_answer_key(self.answer_key)
+
+    def to_dict(self):
+        return dict(self._data)
+
+class ExamCache:
+    """
+    Bounded LRU cache of exam metadata and answer keys.
+
+    Entries are versioned by (exam_id, updated_at). Writes in this process
+    invalidate the entry immediately; once an entry is older than the TTL it
+    is revalidated with a primary-key lookup of updated_at only, so changes
+    made by other worker processes are picked up without reloading the row
+    when nothing changed.
+    """
+
+    def __init__(self, maxsize=256, ttl=30):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries = OrderedDict()  # exam_id -> (snapshot, checked_at)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.revalidations = 0
+        self.invalidations = 0
+
+    def init_app(self, app):
+        self.maxsize = app.config.get('EXAM_CACHE_MAXSIZE', self.maxsize)
+        self.ttl = app.config.get('EXAM_CACHE_TTL', self.ttl)
+        self.clear()
+
+    def get(self, exam_id):
+        """Return an ExamSnapshot for exam_id, or None if the exam does not exist"""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(exam_id)
+            if entry and now - entry[1] < self.ttl:
+                self._entries.move_to_end(exam_id)
+                self.hits += 1
+                return entry[0]
+
+        if entry:
+            # Expired: keep the snapshot if the row has not changed since it was loaded
+            updated_at = db.session.query(Exam.updated_at).filter(Exam.id == exam_id).scalar()
+            if updated_at is not None and updated_at == entry[0].updated_at:
+                with self._lock:
+                    self.revalidations += 1
+                    self._store(exam_id, entry[0], now)
+                return entry[0]
+
+        exam = db.session.get(Exam, exam_id)
+        with self._lock:
+            self.misses += 1
+            if not exam:
+                self._entries.pop(exam_id, None)
+                return None
+            snapshot = ExamSnapshot(exam)
+            self._store(exam_id, snapshot, now)
+        return snapshot
+
+    def invalidate(self, exam_id):
+        """Drop every cached version of an exam"""
+        with self._lock:
+            if self._entries.pop(exam_id, None):
+                self.invalidations += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses + self.revalidations
+            return {
+                'size': len(self._entries),
+                'maxsize': self.maxsize,
+                'ttl_seconds': self.ttl,
+                'hits': self.hits,
+                'misses': self.misses,
+                'revalidations': self.revalidations,
+                'invalidations': self.invalidations,
+                'hit_rate': round(self.hits / lookups, 4) if lookups else None
+            }
+
+    def _store(self, exam_id, snapshot, checked_at):
+        self._entries[exam_id] = (snapshot, checked_at)
+        self._entries.move_to_end(exam_id)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+exam_cache = ExamCache()
@@ -0,0 +1,125 @@
+import csv
+import io
+from sqlalchemy import func, insert
+from app.models.exam import Exam
+from app.utils.answer_codec import QUESTION_COUNT, encode_answer_key
+from app.utils.validators import validate_answer_key
+from app.utils.timestamps import utcnow
+from app import db
+
+TRUE_VALUES = {'1', 'true', 'yes', 'y'}
+FALSE_VALUES = {'0', 'false', 'no', 'n', ''}
+
+class ExamImportService:
+    @staticmethod
+    def parse_csv(text):
+        """
+        Turn CSV text into exam dicts for import_exams.
+
+        Columns: title, description (optional), is_active (optional) and the
+        answers either as Q1..Q50 or as a single 'answers' column of 50 letters.
+        """
+        exams = []
+        for row in csv.DictReader(io.StringIO(text)):
+            row = {(key or '').strip().lower(): (value or '').strip() for key, value in row.items()}
+            if row.get('answers'):
+                answers = [answer.upper() for answer in row['answers'].replace(',', '').replace(' ', '')]
+            else:
+                answers = [row.get(f'q{q}', '').upper() for q in range(1, QUESTION_COUNT + 1)]
+            exam = {
+                'title': row.get('title', ''),
+                'description': row.get('description', ''),
+                'answers': answers
+            }
+            if 'is_active' in row:
+                exam['is_active'] = row['is_active']
+            exams.append(exam)
+        return exams
+
+    @staticmethod
+    def import_exams(exams, created_by):
+        """
+        Validate every exam up front, then insert the valid ones in one transaction.
+
+        A title that repeats an earlier exam in the input or an existing exam,
+        ignoring case, is rejected so importing the same file twice is harmless.
+        Returns (created, errors): created holds {'index', 'id', 'title'} for each
+        inserted exam and errors holds {'index', 'error'} for each rejected one,
+        where index is the exam's position in the input.
+        """
+        now = utcnow()
+        rows = []
+        indexes = []
+        errors = []
+        seen_titles = set()
+
+        for index, exam in enumerate(exams):
+            if not isinstance(exam, dict):
+                errors.append({'index': index, 'error': 'Exam must be an object'})
+                continue
+
+            title = str(exam.get('title') or '').strip()
+            if not title:
+                errors.append({'index': index, 'error': 'Exam title is required'})
+                continue
+            if len(title) > 200:
+                errors.append({'index': index, 'error': 'Exam title must be at most 200 characters'})
+                continue
+            if title.lower() in seen_titles:
+                errors.append({'index': index, 'error': 'Exam title appears more than once in the import'})
+                continue
+
+            answers = exam.get('answers')
+            if isinstance(answers, str):
+                answers = list(answers.strip().upper())
+            is_valid, message = validate_answer_key(answers)
+            if not is_valid:
+                errors.append({'index': index, 'error': message})
+                continue
+
+            is_active = exam.get('is_active', True)
+            if isinstance(is_active, str):
+                value = is_active.strip().lower()
+                if value not in TRUE_VALUES | FALSE_VALUES:
+                    errors.append({'index': index, 'error': 'is_active must be true or false'})
+                    continue
+                is_active = value in TRUE_VALUES
+
+            rows.append({
+                'title': title,
+                'description': str(exam.get('description') or '').strip(),
+                'created_by': created_by,
+                'is_active': bool(is_active),
+                'answer_key': encode_answer_key(answers),
+                'created_at': now,
+                'updated_at': now
+            })
+            indexes.append(index)
+            seen_titles.add(title.lower())
+
+        if rows:
+            existing = {row.title.lower() for row in db.session.query(Exam.title).filter(
+                func.lower(Exam.title).in_(seen_titles)
+            )}
+            kept = [(index, row) for index, row in zip(indexes, rows) if row['title'].lower() not in existing]
+            errors.extend(
+                {'index': index, 'error': 'An exam with this title already exists'}
+                for index, row in zip(indexes, rows) if row['title'].lower() in existing
+            )
+            errors.sort(key=lambda error: error['index'])
+            indexes = [index for index, _ in kept]
+            rows = [row for _, row in kept]
+
+        created = []
+        if rows:
+            # One executemany; RETURNING keeps the generated ids in input order
+            ids = db.session.scalars(
+                insert(Exam).returning(Exam.id, sort_by_parameter_order=True), rows
+            ).all()
+            created = [
+                {'index': index, 'id': exam_id, 'title': row['title']}
+                for index, exam_id, row in zip(indexes, ids, rows)
+            ]
+        db.session.commit()
+
+        return created, errors
@@ -0,0 +1,159 @@
+import math
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql, sqlite
+from app.models.exam import Exam
+from app.models.exam_attempt import ExamAttempt
+from app.models.exam_stats import ExamStats, ExamScoreBucket, ExamQuestionStat
+from app.services.grading_service import GradingService, TOTAL_MARKS
+from app.services.score_index import score_index
+from app.utils.answer_codec import QUESTION_COUNT, BLANK
+from app.utils.timestamps import utcnow
+from app import db
+
+REBUILD_CHUNK_SIZE = 5000
+
+def increment_rows(model, rows, key_columns, counter_columns, extra_updates=None):
+    """
+    Add each row's counters to the stored row with the same key, inserting it if missing.
+
+    Uses a single INSERT ... ON CONFLICT DO UPDATE, so concurrent submissions
+    never lose increments and no row has to be read first.
+    """
+    if not rows:
+        return
+
+    dialect = db.session.get_bind().dialect.name
+    insert = {'postgresql': postgresql.insert, 'sqlite': sqlite.insert}.get(dialect)
+    table = model.__table__
+
+    if insert is None:
+        # Generic fallback: update in place, insert the rows that did not exist yet
+        for row in rows:
+            key = {column: row[column] for column in key_columns}
+            updated = db.session.query(model).filter_by(**key).update(
+                {table.c[column]: table.c[column] + row[column] for column in counter_columns},
+                synchronize_session=False
+            )
+            if not updated:
+                db.session.execute(table.insert().values(**row))
+        return
+
+    statement = insert(table).values(rows)
+    updates = {column: table.c[column] + statement.excluded[column] for column in counter_columns}
+    updates.update(extra_updates or {})
+    db.session.execute(statement.on_conflict_do_update(index_elements=key_columns, set_=updates))
+
+class ExamStatsService:
+    @staticmethod
+    def record(exam_id, scores, correct):
+        """
+        Add graded attempts to an exam's aggregates in the caller's transaction.
+
+        scores is a vector of attempt scores and correct the matching boolean
+        (n, 50) matrix from GradingService.score_matrix.
+        """
+        scores = np.asarray(scores, dtype=np.int64)
+        if not len(scores):
+            return
+
+        now = utcnow()
+        increment_rows(ExamStats, [{
+            'exam_id': exam_id,
+            'attempt_count': int(len(scores)),
+            'score_sum': int(scores.sum()),
+            'score_sq_sum': int((scores * scores).sum()),
+            'updated_at': now
+        }], ['exam_id'], ['attempt_count', 'score_sum', 'score_sq_sum'], {'updated_at': now})
+
+        histogram = np.bincount(scores, minlength=TOTAL_MARKS + 1)
+        increment_rows(ExamScoreBucket, [
+            {'exam_id': exam_id, 'score': int(score), 'count': int(histogram[score])}
+            for score in np.flatnonzero(histogram)
+        ], ['exam_id', 'score'], ['count'])
+
+        correct_counts = np.asarray(correct).sum(axis=0)
+        increment_rows(ExamQuestionStat, [
+            {'exam_id': exam_id, 'question_number': int(index) + 1, 'correct_count': int(correct_counts[index])}
+            for index in np.flatnonzero(correct_counts)
+        ], ['exam_id', 'question_number'], ['correct_count'])
+
+    @staticmethod
+    def get_summary(exam_id):
+        """Mean, standard deviation, score distribution and per-question accuracy from the aggregates"""
+        stats = db.session.get(ExamStats, exam_id)
+        attempt_count = stats.attempt_count if stats else 0
+
+        histogram = [0] * (TOTAL_MARKS + 1)
+        for score, count in db.session.query(ExamScoreBucket.score, ExamScoreBucket.count).filter_by(exam_id=exam_id):
+            histogram[score] = count
+
+        correct_counts = [0] * QUESTION_COUNT
+        for question_number, count in db.session.query(
+            ExamQuestionStat.question_number, ExamQuestionStat.correct_count
+        ).filter_by(exam_id=exam_id):
+            correct_counts[question_number - 1] = count
+
+        mean = stdev = None
+        if attempt_count:
+            mean = stats.score_sum / attempt_count
+            # Population standard deviation from the running sums
+            variance = max(stats.score_sq_sum / attempt_count - mean * mean, 0.0)
+            stdev = math.sqrt(variance)
+
+        return {
+            'exam_id': exam_id,
+            'attempt_count': attempt_count,
+            'mean_score': round(mean, 3) if mean is not None else None,
+            'mean_percentage': round(mean / TOTAL_MARKS * 100, 1) if mean is not None else None,
+            'stdev': round(stdev, 3) if stdev is not None else None,
+            'score_distribution': histogram,
+            'questions': [{
+                'question_number': index + 1,
+                'correct_count': count,
+                'correct_rate': round(count / attempt_count, 4) if attempt_count else None
+            } for index, count in enumerate(correct_counts)],
+            'updated_at': stats.updated_at if stats else None
+        }
+
+    @staticmethod
+    def delete(exam_id):
+        """Remove an exam's aggregates (caller commits)"""
+        for model in (ExamQuestionStat, ExamScoreBucket, ExamStats):
+            db.session.query(model).filter_by(exam_id=exam_id).delete(synchronize_session=False)
+
+    @staticmethod
+    def rebuild(exam_id):
+        """
+        Recompute an exam's aggregates from all of its attempts and commit.
+
+        Scores come from the stored attempts; per-question counts are graded
+        against the exam's current answer key. Returns the attempt count.
+        """
+        exam = db.session.get(Exam, exam_id)
+        if not exam:
+            return None
+
+        key = GradingService.answer_key_vector(exam.answer_key)
+        ExamStatsService.delete(exam_id)
+
+        total = 0
+        result = db.session.execute(
+            select(ExamAttempt.score, ExamAttempt.answer_sheet)
+            .where(ExamAttempt.exam_id == exam_id)
+            .execution_options(yield_per=REBUILD_CHUNK_SIZE)
+        )
+        for rows in result.partitions():
+            total += ExamStatsService._record_chunk(exam_id, key, rows)
+
+        db.session.commit()
+        score_index.invalidate(exam_id)
+        return total
+
+    @staticmethod
+    def _record_chunk(exam_id, key, rows):
+        scores = np.array([score or 0 for score, _ in rows], dtype=np.int64)
+        matrix = GradingService.answer_sheet_matrix([sheet or BLANK * QUESTION_COUNT for _, sheet in rows])
+        _, correct = GradingService.score_matrix(key, matrix)
+        ExamStatsService.record(exam_id, scores, correct)
+        return len(rows)
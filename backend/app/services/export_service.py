@@ -0,0 +1,81 @@
+import csv
+import io
+import json
+from sqlalchemy import select
+from app.models.user import User
+from app.models.exam_attempt import ExamAttempt
+from app.utils.answer_codec import QUESTION_COUNT, BLANK
+from app import db
+
+EXPORT_CHUNK_SIZE = 2000
+EXPORT_COLUMNS = [
+    'attempt_id', 'user_id', 'username', 'score', 'total_marks', 'status',
+    'started_at', 'completed_at', 'created_at'
+] + [f'Q{q}' for q in range(1, QUESTION_COUNT + 1)]
+EXPORT_FORMATS = {
+    'csv': 'text/csv',
+    'ndjson': 'application/x-ndjson'
+}
+
+class ExportService:
+    """
+    Streams an exam's attempts as CSV or NDJSON.
+
+    Rows are read through a server-side cursor in chunks of EXPORT_CHUNK_SIZE
+    and each chunk is encoded and yielded before the next is fetched, so
+    memory stays flat regardless of the number of attempts.
+    """
+
+    @staticmethod
+    def iter_rows(exam_id, chunk_size=EXPORT_CHUNK_SIZE):
+        """Yield lists of flattened attempt rows, one list per chunk, in attempt id order"""
+        result = db.session.execute(
+            select(
+                ExamAttempt.id, ExamAttempt.user_id, User.username, ExamAttempt.score,
+                ExamAttempt.total_marks, ExamAttempt.status, ExamAttempt.started_at,
+                ExamAttempt.completed_at, ExamAttempt.created_at, ExamAttempt.answer_sheet
+            )
+            .join(User, User.id == ExamAttempt.user_id)
+            .where(ExamAttempt.exam_id == exam_id)
+            .order_by(ExamAttempt.id)
+            .execution_options(yield_per=chunk_size)
+        )
+        blank_sheet = BLANK * QUESTION_COUNT
+        for partition in result.partitions():
+            rows = []
+            for row in partition:
+                answers = ['' if answer == BLANK else answer for answer in (row.answer_sheet or blank_sheet)]
+                rows.append([
+                    row.id, row.user_id, row.username, row.score, row.total_marks, row.status,
+                    _isoformat(row.started_at), _isoformat(row.completed_at), _isoformat(row.created_at)
+                ] + answers)
+            yield rows
+
+    @staticmethod
+    def iter_csv(exam_id, chunk_size=EXPORT_CHUNK_SIZE):
+        """Yield the export as CSV text, a header line then one block per chunk"""
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(EXPORT_COLUMNS)
+        for rows in ExportService.iter_rows(exam_id, chunk_size):
+            writer.writerows(rows)
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+        if buffer.tell():
+            yield buffer.getvalue()
+
+    @staticmethod
+    def iter_ndjson(exam_id, chunk_size=EXPORT_CHUNK_SIZE):
+        """Yield the export as newline-delimited JSON objects, one block per chunk"""
+        for rows in ExportService.iter_rows(exam_id, chunk_size):
+            yield ''.join(json.dumps(dict(zip(EXPORT_COLUMNS, row))) + '\n' for row in rows)
+
+    @staticmethod
+    def iter_export(exam_id, export_format, chunk_size=EXPORT_CHUNK_SIZE):
+        if export_format == 'ndjson':
+            return ExportService.iter_ndjson(exam_id, chunk_size)
+        return ExportService.iter_csv(exam_id, chunk_size)
+
+def _isoformat(value):
+    return value.isoformat() if value else None
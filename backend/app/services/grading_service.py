@@ -0,0 +1,130 @@
+import time
+import numpy as np
+from sqlalchemy import insert
+from app.models.user import User
+from app.models.exam_attempt import ExamAttempt
+from app import db
+
+from app.utils.answer_codec import QUESTION_COUNT, BLANK, encode_user_answers
+from app.utils.timestamps import utcnow
+
+TOTAL_MARKS = 50
+
+BLANK_CODE = ord(BLANK)
+
+class GradingService:
+    @staticmethod
+    def answer_key_vector(answer_key):
+        """View a packed answer key as a (50,) uint8 vector of ASCII codes"""
+        if not answer_key:
+            return np.full(QUESTION_COUNT, BLANK_CODE, dtype=np.uint8)
+        return np.frombuffer(answer_key.encode('ascii'), dtype=np.uint8)
+
+    @staticmethod
+    def answer_sheet_matrix(answer_sheets):
+        """View a list of packed answer sheets as an (n, 50) uint8 matrix without decoding them"""
+        buffer = ''.join(answer_sheets).encode('ascii')
+        return np.frombuffer(buffer, dtype=np.uint8).reshape(len(answer_sheets), QUESTION_COUNT)
+
+    @staticmethod
+    def score_matrix(answer_key, matrix):
+        """
+        Grade every sheet in one pass.
+
+        Returns the per-sheet scores and the boolean matrix of correct answers.
+        Blank answers never score, even against a blank key position.
+        """
+        correct = (matrix == answer_key) & (answer_key != BLANK_CODE)
+        return correct.sum(axis=1), correct
+
+    @staticmethod
+    def grade_sheet(answer_key, answer_sheet):
+        """Grade a single packed answer sheet and return its score and (1, 50) correct matrix"""
+        key = GradingService.answer_key_vector(answer_key)
+        scores, correct = GradingService.score_matrix(key, GradingService.answer_sheet_matrix([answer_sheet]))
+        return int(scores[0]), correct
+
+    @staticmethod
+    def grade_batch(exam, sheets):
+        """
+        Grade many answer sheets for one exam and store every attempt in one bulk write.
+
+        Each sheet is a dict with 'answers' and either 'user_id' or 'username'.
+        Sheets that cannot be matched to a user are reported in errors and skipped.
+        """
+        from app.services.exam_stats_service import ExamStatsService
+        from app.services.score_index import score_index
+
+        started = time.perf_counter()
+
+        # Resolve every referenced user in a single query; usernames match case-insensitively, like login
+        usernames = {
+            s['username'].lower() for s in sheets
+            if isinstance(s, dict) and isinstance(s.get('username'), str) and s['username']
+        }
+        user_ids = {s.get('user_id') for s in sheets if isinstance(s, dict) and isinstance(s.get('user_id'), int)}
+        known_ids = set()
+        user_ids_by_name = {}
+        if usernames or user_ids:
+            for user_id, username in db.session.query(User.id, User.username).filter(
+                db.func.lower(User.username).in_(usernames) | User.id.in_(user_ids)
+            ):
+                known_ids.add(user_id)
+                user_ids_by_name[username.lower()] = user_id
+
+        errors = []
+        valid = []
+        for index, sheet in enumerate(sheets):
+            if not isinstance(sheet, dict) or not isinstance(sheet.get('answers'), dict):
+                errors.append({'index': index, 'error': 'Answers are required'})
+                continue
+            user_id = sheet.get('user_id')
+            if user_id not in known_ids:
+                username = sheet.get('username')
+                user_id = user_ids_by_name.get(username.lower()) if isinstance(username, str) else None
+            if not user_id:
+                errors.append({'index': index, 'error': 'User not found'})
+                continue
+            valid.append((index, user_id, encode_user_answers(sheet['answers'])))
+
+        key = GradingService.answer_key_vector(exam.answer_key)
+        matrix = GradingService.answer_sheet_matrix([answer_sheet for _, _, answer_sheet in valid])
+        scores, correct = GradingService.score_matrix(key, matrix)
+        graded = time.perf_counter()
+
+        completed_at = utcnow()
+        rows = [{
+            'user_id': user_id,
+            'exam_id': exam.id,
+            'total_questions': QUESTION_COUNT,
+            'total_marks': TOTAL_MARKS,
+            'score': int(score),
+            'status': 'completed',
+            'answer_sheet': answer_sheet,
+            'completed_at': completed_at
+        } for (_, user_id, answer_sheet), score in zip(valid, scores)]
+
+        if rows:
+            db.session.execute(insert(ExamAttempt), rows)
+            ExamStatsService.record(exam.id, scores, correct)
+        commit_started = time.monotonic()
+        db.session.commit()
+        score_index.record(exam.id, scores, commit_started)
+        finished = time.perf_counter()
+
+        results = [{
+            'index': index,
+            'user_id': user_id,
+            'score': int(score),
+            'score_percentage': round((int(score) / TOTAL_MARKS) * 100, 1),
+            'score_percentile': score_index.percentile(exam.id, int(score))
+        } for (index, user_id, _), score in zip(valid, scores)]
+
+        elapsed = finished - started
+        timing = {
+            'grading_ms': round((graded - started) * 1000, 2),
+            'write_ms': round((finished - graded) * 1000, 2),
+            'total_ms': round(elapsed * 1000, 2),
+            'sheets_per_second': round(len(rows) / elapsed, 1) if elapsed > 0 else None
+        }
+        return results, errors, timing
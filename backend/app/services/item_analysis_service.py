@@ -0,0 +1,113 @@
+import numpy as np
+from sqlalchemy import select
+from app.models.exam import Exam
+from app.models.exam_attempt import ExamAttempt
+from app.services.grading_service import GradingService
+from app.utils.answer_codec import QUESTION_COUNT, BLANK
+from app import db
+
+DEFAULT_CHUNK_SIZE = 10000
+OPTIONS = ['A', 'B', 'C', 'D']
+OPTION_CODES = np.frombuffer(''.join(OPTIONS).encode('ascii'), dtype=np.uint8)
+BLANK_CODE = ord(BLANK)
+
+class ItemAnalysisService:
+    """
+    Classical item analysis over every attempt on an exam.
+
+    Attempts are streamed in chunks and reduced to sufficient statistics
+    (counts, sums and cross-products per question), so memory depends on the
+    chunk size and not on the number of attempts.
+    """
+
+    @staticmethod
+    def analyze(exam_id, chunk_size=DEFAULT_CHUNK_SIZE):
+        """Return difficulty, discrimination and option frequencies for all 50 questions, or None if the exam does not exist"""
+        exam = db.session.get(Exam, exam_id)
+        if not exam:
+            return None
+
+        key = GradingService.answer_key_vector(exam.answer_key)
+        blank_sheet = BLANK * QUESTION_COUNT
+
+        n = 0
+        sum_total = 0.0
+        sum_total_sq = 0.0
+        correct_counts = np.zeros(QUESTION_COUNT, dtype=np.int64)
+        correct_total_sum = np.zeros(QUESTION_COUNT, dtype=np.float64)  # Sum of total scores among correct answers
+        option_counts = np.zeros((QUESTION_COUNT, len(OPTIONS) + 1), dtype=np.int64)  # A-D then blank
+
+        result = db.session.execute(
+            select(ExamAttempt.answer_sheet)
+            .where(ExamAttempt.exam_id == exam_id)
+            .execution_options(yield_per=chunk_size)
+        )
+        for rows in result.partitions():
+            matrix = GradingService.answer_sheet_matrix([row.answer_sheet or blank_sheet for row in rows])
+            totals, correct = GradingService.score_matrix(key, matrix)
+            totals = totals.astype(np.float64)
+
+            n += len(rows)
+            sum_total += totals.sum()
+            sum_total_sq += (totals * totals).sum()
+            correct_counts += correct.sum(axis=0)
+            correct_total_sum += totals @ correct
+            for index, code in enumerate(OPTION_CODES):
+                option_counts[:, index] += (matrix == code).sum(axis=0)
+            option_counts[:, -1] += (matrix == BLANK_CODE).sum(axis=0)
+
+        return {
+            'exam_id': exam_id,
+            'attempt_count': n,
+            'mean_score': round(sum_total / n, 3) if n else None,
+            'items': ItemAnalysisService._items(
+                exam.answers, n, sum_total, sum_total_sq, correct_counts, correct_total_sum, option_counts
+            )
+        }
+
+    @staticmethod
+    def _items(answers, n, sum_total, sum_total_sq, correct_counts, correct_total_sum, option_counts):
+        """Turn the accumulated sums into per-question statistics in one vectorized pass"""
+        with np.errstate(divide='ignore', invalid='ignore'):
+            p = correct_counts / n if n else np.full(QUESTION_COUNT, np.nan)
+            mean_total = sum_total / n if n else np.nan
+            var_total = sum_total_sq / n - mean_total ** 2 if n else np.nan
+            var_item = p * (1 - p)
+
+            # Point-biserial correlation between the item and the total score
+            cov_total = correct_total_sum / n - p * mean_total if n else np.full(QUESTION_COUNT, np.nan)
+            r_total = cov_total / np.sqrt(var_item * var_total)
+
+            # Corrected (item-rest) correlation, excluding the item from the total
+            if n:
+                sum_rest = sum_total - correct_counts
+                sum_rest_sq = sum_total_sq - 2 * correct_total_sum + correct_counts
+                mean_rest = sum_rest / n
+                var_rest = sum_rest_sq / n - mean_rest ** 2
+                cov_rest = (correct_total_sum - correct_counts) / n - p * mean_rest
+                r_rest = cov_rest / np.sqrt(var_item * var_rest)
+            else:
+                r_rest = np.full(QUESTION_COUNT, np.nan)
+
+        def clean(value, digits=4):
+            return round(float(value), digits) if np.isfinite(value) else None
+
+        items = []
+        for index in range(QUESTION_COUNT):
+            correct_answer = answers[index] if index < len(answers) else None
+            counts = {option: int(option_counts[index, i]) for i, option in enumerate(OPTIONS)}
+            items.append({
+                'question_number': index + 1,
+                'correct_answer': correct_answer,
+                'p_value': clean(p[index]),
+                'point_biserial': clean(r_total[index]),
+                'point_biserial_corrected': clean(r_rest[index]),
+                'option_counts': counts,
+                'blank_count': int(option_counts[index, -1]),
+                # How often each wrong option was chosen, as a share of all attempts
+                'distractors': {
+                    option: round(count / n, 4) if n else None
+                    for option, count in counts.items() if option != correct_answer
+                }
+            })
+        return items
@@ -0,0 +1,130 @@
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+import bcrypt
+from werkzeug.security import generate_password_hash, check_password_hash
+
+SCHEMES = ('werkzeug', 'bcrypt')
+BCRYPT_MAX_BYTES = 72  # bcrypt only looks at the first 72 bytes of a password
+
+# Pool processes start from a clean forkserver instead of forking a threaded worker
+POOL_CONTEXT = multiprocessing.get_context('forkserver')
+
+class PasswordVerifyBusy(Exception):
+    """Every verification slot stayed taken for the whole queue timeout"""
+
+def _bcrypt_secret(password):
+    return password.encode('utf-8')[:BCRYPT_MAX_BYTES]
+
+def verify_password(password_hash, password):
+    """Check a password against a stored hash of either scheme; module-level so pool workers can run it"""
+    if not password_hash:
+        return False
+    if password_hash.startswith('$2'):
+        try:
+            return bcrypt.checkpw(_bcrypt_secret(password), password_hash.encode('ascii'))
+        except ValueError:
+            return False
+    return check_password_hash(password_hash, password)
+
+class PasswordHasher:
+    """
+    Hashes new passwords with the configured scheme and cost, and verifies
+    hashes made with any supported scheme.
+
+    needs_rehash() reports hashes made with an older scheme or cost so the
+    caller can upgrade them on the next successful login. With
+    PASSWORD_VERIFY_WORKERS set, verification runs on a process pool. At most
+    PASSWORD_VERIFY_MAX_PENDING checks wait for or run on it; a login that
+    finds no free slot within PASSWORD_VERIFY_QUEUE_TIMEOUT seconds raises
+    PasswordVerifyBusy, so a burst of logins is shed instead of occupying
+    every request thread with hashing.
+    """
+
+    def __init__(self, scheme='werkzeug', method='scrypt', bcrypt_rounds=12, verify_workers=0,
+                 max_pending=3, queue_timeout=0.5):
+        self.configure(scheme, method, bcrypt_rounds, verify_workers, max_pending, queue_timeout)
+        self._executor = None
+        self._executor_lock = threading.Lock()
+        self.shed = 0
+
+    def init_app(self, app):
+        self.shutdown()
+        self.configure(
+            app.config.get('PASSWORD_HASH_SCHEME', self.scheme),
+            app.config.get('PASSWORD_HASH_METHOD', self.method),
+            app.config.get('BCRYPT_ROUNDS', self.bcrypt_rounds),
+            app.config.get('PASSWORD_VERIFY_WORKERS', self.verify_workers),
+            app.config.get('PASSWORD_VERIFY_MAX_PENDING', self.max_pending),
+            app.config.get('PASSWORD_VERIFY_QUEUE_TIMEOUT', self.queue_timeout)
+        )
+
+    def configure(self, scheme, method, bcrypt_rounds, verify_workers, max_pending=3, queue_timeout=0.5):
+        if scheme not in SCHEMES:
+            raise ValueError(f"Unknown password hash scheme '{scheme}'. Must be one of: {', '.join(SCHEMES)}")
+        self.scheme = scheme
+        self.method = method
+        self.bcrypt_rounds = int(bcrypt_rounds)
+        self.verify_workers = int(verify_workers)
+        self.max_pending = max(int(max_pending), 1)
+        self.queue_timeout = float(queue_timeout)
+        self._method_prefix = None
+        self._slots = threading.BoundedSemaphore(self.max_pending) if self.verify_workers > 0 else None
+
+    def hash(self, password):
+        if self.scheme == 'bcrypt':
+            return bcrypt.hashpw(_bcrypt_secret(password), bcrypt.gensalt(self.bcrypt_rounds)).decode('ascii')
+        return generate_password_hash(password, method=self.method)
+
+    def verify(self, password_hash, password):
+        if self._slots is None:
+            return verify_password(password_hash, password)
+        if not self._slots.acquire(timeout=self.queue_timeout):
+            self.shed += 1
+            raise PasswordVerifyBusy(f"{self.max_pending} password checks already pending")
+        try:
+            return self._get_executor().submit(verify_password, password_hash, password).result()
+        finally:
+            self._slots.release()
+
+    def needs_rehash(self, password_hash):
+        """True when a hash was made with a different scheme or cost than the configured one"""
+        is_bcrypt = password_hash.startswith('$2')
+        if self.scheme == 'bcrypt':
+            if not is_bcrypt:
+                return True
+            try:
+                return int(password_hash.split('$')[2]) != self.bcrypt_rounds
+            except (IndexError, ValueError):
+                return True
+        if is_bcrypt:
+            return True
+        if self._method_prefix is None:
+            # Werkzeug expands defaults into the stored prefix ('scrypt' -> 'scrypt:32768:8:1')
+            self._method_prefix = generate_password_hash('', method=self.method).split('$', 1)[0]
+        return password_hash.split('$', 1)[0] != self._method_prefix
+
+    def shutdown(self):
+        with self._executor_lock:
+            if self._executor:
+                self._executor.shutdown(wait=False)
+                self._executor = None
+
+    def _get_executor(self):
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(max_workers=self.verify_workers, mp_context=POOL_CONTEXT)
+            return self._executor
+
+    def __getstate__(self):
+        # Pool workers only need the settings to hash, not the pool itself
+        state = self.__dict__.copy()
+        for key in ('_executor', '_executor_lock', '_slots'):
+            state[key] = None
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._executor_lock = threading.Lock()
+
+password_hasher = PasswordHasher()
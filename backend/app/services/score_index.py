@@ -0,0 +1,116 @@
+import threading
+import time
+from app.models.exam_stats import ExamStats, ExamScoreBucket
+from app.services.grading_service import TOTAL_MARKS
+from app import db
+
+class ScoreIndex:
+    """Fenwick tree of score frequencies over 0..TOTAL_MARKS for one exam"""
+    __slots__ = ('_tree', 'total')
+
+    def __init__(self, histogram=None):
+        self._tree = [0] * (TOTAL_MARKS + 2)
+        self.total = 0
+        for score, count in (histogram or {}).items():
+            self.add(score, count)
+
+    def add(self, score, count=1):
+        self.total += count
+        position = score + 1
+        while position < len(self._tree):
+            self._tree[position] += count
+            position += position & -position
+
+    def count_below(self, score):
+        """Number of attempts that scored strictly less than score"""
+        count = 0
+        position = min(max(score, 0), TOTAL_MARKS + 1)
+        while position > 0:
+            count += self._tree[position]
+            position -= position & -position
+        return count
+
+    def percentile(self, score):
+        """Percentage of attempts that scored below score, or None before any attempt"""
+        if self.total <= 0:
+            return None
+        return round(self.count_below(score) / self.total * 100, 1)
+
+class ScoreIndexCache:
+    """
+    Per-exam score indexes, loaded lazily from exam_score_bucket.
+
+    Submissions in this process add their scores after committing. An index
+    loaded after such a commit started may already count its scores, so it
+    is dropped and reloaded instead of counting them twice. Once an index is
+    older than the TTL its total is compared with exam_stats.attempt_count (a
+    primary-key lookup) and the index is reloaded if attempts were recorded
+    elsewhere, e.g. by another worker process.
+    """
+
+    def __init__(self, ttl=30):
+        self.ttl = ttl
+        self._entries = {}  # exam_id -> (index, checked_at, loaded_at)
+        self._lock = threading.Lock()
+
+    def init_app(self, app):
+        self.ttl = app.config.get('SCORE_INDEX_TTL', self.ttl)
+        self.clear()
+
+    def percentile(self, exam_id, score):
+        """Percentage of an exam's attempts that scored below score"""
+        if score is None:
+            return None
+        index = self._get(exam_id)
+        with self._lock:
+            return index.percentile(score)
+
+    def record(self, exam_id, scores, commit_started):
+        """
+        Add committed scores to a loaded index; unloaded exams pick them up on load.
+
+        commit_started is the time.monotonic() taken before the commit that
+        wrote the scores.
+        """
+        with self._lock:
+            entry = self._entries.get(exam_id)
+            if not entry:
+                return
+            if entry[2] < commit_started:
+                # Read before the commit, so the scores are not in it yet
+                for score in scores:
+                    entry[0].add(int(score))
+            else:
+                # Read while or after committing: it may already count them
+                del self._entries[exam_id]
+
+    def invalidate(self, exam_id):
+        with self._lock:
+            self._entries.pop(exam_id, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def _get(self, exam_id):
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(exam_id)
+            if entry and now - entry[1] < self.ttl:
+                return entry[0]
+
+        if entry:
+            attempt_count = db.session.query(ExamStats.attempt_count).filter(ExamStats.exam_id == exam_id).scalar() or 0
+            with self._lock:
+                if entry[0].total == attempt_count:
+                    self._entries[exam_id] = (entry[0], now, entry[2])
+                    return entry[0]
+
+        loaded_at = time.monotonic()
+        histogram = dict(db.session.query(ExamScoreBucket.score, ExamScoreBucket.count).filter_by(exam_id=exam_id))
+        index = ScoreIndex(histogram)
+        with self._lock:
+            self._entries[exam_id] = (index, now, loaded_at)
+        return index
+
+score_index = ScoreIndexCache()
@@ -0,0 +1,397 @@
+import atexit
+import glob
+import json
+import logging
+import os
+import threading
+import time
+import traceback
+import uuid
+from datetime import datetime
+import numpy as np
+from sqlalchemy import insert, select
+from sqlalchemy.exc import InterfaceError, OperationalError, TimeoutError as PoolTimeoutError
+from app.models.exam_attempt import ExamAttempt
+from app.services.exam_stats_service import ExamStatsService
+from app.services.score_index import score_index
+from app.utils.answer_codec import QUESTION_COUNT
+from app import db
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+DURABILITY_MODES = ('commit', 'journal', 'none')
+DATETIME_FIELDS = ('started_at', 'completed_at', 'created_at', 'updated_at')
+# Errors that clear up on their own (locked or unreachable database); rows failing with them are retried
+TRANSIENT_ERRORS = (OperationalError, InterfaceError, PoolTimeoutError)
+RETRY_DELAY_MIN = 0.1
+RETRY_DELAY_MAX = 5.0
+
+class PendingSubmission:
+    """A graded attempt waiting for the writer thread"""
+    __slots__ = ('row', 'correct', 'done', 'attempt_id', 'error')
+
+    def __init__(self, row, correct):
+        self.row = row
+        self.correct = np.asarray(correct, dtype=bool).reshape(QUESTION_COUNT)
+        self.done = threading.Event()
+        self.attempt_id = None
+        self.error = None
+
+class SubmissionPipeline:
+    """
+    Write-behind queue for graded exam attempts.
+
+    Requests grade synchronously and hand the attempt row to a writer thread,
+    which inserts queued rows together with their statistics in one
+    transaction every SUBMISSION_BATCH_SIZE rows or SUBMISSION_FLUSH_MS
+    milliseconds, whichever comes first. SUBMISSION_DURABILITY decides when
+    the request returns:
+
+    - 'commit': after the group commit containing the row (no loss on crash)
+    - 'journal': after the row is appended to this process's journal file;
+      journals left behind by a process that died are replayed on startup
+      (POSIX only: a writer holds an flock on its journal while it runs, so
+      a journal is stale exactly when its lock can be taken, whatever pid
+      its name carries)
+    - 'none': immediately; queued rows are lost if the process dies
+
+    Every row carries a submission_id with a unique index, so replaying a
+    journal that was partly committed does not duplicate attempts.
+
+    Once a submission has been acknowledged ('journal' and 'none'), rows that
+    fail with a transient database error go back to the front of the queue
+    and are retried with exponential backoff; the journal is only truncated
+    when nothing is left unwritten. Rows the database rejects outright (for
+    example a deleted user) are appended to rejected-<pid>.jsonl in the
+    journal directory for an admin to inspect instead of being dropped.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self.app = None
+        self._cond = threading.Condition()
+        self._queue = []
+        self._thread = None
+        self._pid = None
+        self._stopping = False
+        self._journal = None
+        self._retry_delay = 0
+        self.flushes = 0
+        self.rows_written = 0
+        self.retries = 0
+        self.rejected = 0
+
+    def init_app(self, app):
+        self.app = app
+        self.enabled = app.config.get('SUBMISSION_PIPELINE_ENABLED', False)
+        self.durability = app.config.get('SUBMISSION_DURABILITY', 'commit')
+        self.batch_size = app.config.get('SUBMISSION_BATCH_SIZE', 200)
+        self.flush_interval = app.config.get('SUBMISSION_FLUSH_MS', 10) / 1000
+        self.journal_dir = app.config.get('SUBMISSION_JOURNAL_DIR', 'submission_journal')
+        if self.durability not in DURABILITY_MODES:
+            raise ValueError(f"Invalid SUBMISSION_DURABILITY '{self.durability}'. Must be one of: {', '.join(DURABILITY_MODES)}")
+        if self.enabled and self.durability == 'journal' and fcntl is None:
+            raise ValueError("SUBMISSION_DURABILITY 'journal' needs file locks (fcntl), which this platform lacks")
+
+        if self.enabled and self.durability == 'journal':
+            os.makedirs(self.journal_dir, exist_ok=True)
+            if glob.glob(os.path.join(self.journal_dir, 'submissions-*.jsonl*')):
+                with app.app_context():
+                    self.recover()
+
+    def submit(self, row, correct):
+        """
+        Queue an attempt row (a dict of ExamAttempt columns including submission_id).
+
+        Returns the PendingSubmission; in 'commit' mode it has been written and
+        attempt_id is set. Raises the write error if the row could not be stored.
+        """
+        pending = PendingSubmission(row, correct)
+        with self._cond:
+            self._ensure_started()
+            if self.durability == 'journal':
+                self._journal_append(pending)
+            self._queue.append(pending)
+            if len(self._queue) == 1 or len(self._queue) >= self.batch_size:
+                self._cond.notify()
+
+        if self.durability == 'commit':
+            pending.done.wait()
+            if pending.error:
+                raise pending.error
+        return pending
+
+    def shutdown(self):
+        """Flush everything still queued and stop the writer thread"""
+        with self._cond:
+            thread = self._thread if self._pid == os.getpid() else None
+            self._stopping = True
+            self._cond.notify()
+        if thread:
+            thread.join()
+        with self._cond:
+            if thread:
+                # The next submit starts a new writer
+                self._pid = None
+            if self._journal and not self._queue:
+                # Clean exit, nothing left to replay
+                self._journal.close()
+                os.remove(self._journal.name)
+                self._journal = None
+
+    def stats(self):
+        with self._cond:
+            return {
+                'enabled': self.enabled,
+                'durability': self.durability if self.enabled else None,
+                'queued': len(self._queue),
+                'flushes': self.flushes,
+                'rows_written': self.rows_written,
+                'retries': self.retries,
+                'rejected': self.rejected,
+                'rows_per_flush': round(self.rows_written / self.flushes, 1) if self.flushes else None
+            }
+
+    def recover(self):
+        """Replay journals left by processes that are no longer running; returns the rows written"""
+        recovered = 0
+        for path in glob.glob(os.path.join(self.journal_dir, 'submissions-*.jsonl*')):
+            # submissions-<pid>-<token>.jsonl, or with a .claimed-<token> suffix while being replayed
+            lock = _lock_stale(path)
+            if lock is None:
+                continue  # Its writer (or another recovery) is still running
+            # Claim it by rename; if that fails, another process took it between our glob and our lock
+            claimed = f"{path.split('.jsonl')[0]}.jsonl.claimed-{uuid.uuid4().hex[:8]}"
+            try:
+                os.rename(path, claimed)
+            except FileNotFoundError:
+                lock.close()
+                continue
+
+            try:
+                with open(claimed) as f:
+                    entries = [json.loads(line) for line in f if line.strip()]
+                pending = [PendingSubmission(_row_from_json(entry['row']), entry['correct']) for entry in entries]
+                unwritten = []
+                # Skip rows whose group commit finished before the crash
+                for start in range(0, len(pending), self.batch_size):
+                    batch = pending[start:start + self.batch_size]
+                    existing = set(db.session.scalars(
+                        select(ExamAttempt.submission_id)
+                        .where(ExamAttempt.submission_id.in_([p.row['submission_id'] for p in batch]))
+                    ))
+                    batch = [p for p in batch if p.row['submission_id'] not in existing]
+                    if batch:
+                        self._write(batch)
+                        recovered += sum(1 for p in batch if p.error is None)
+                        unwritten.extend(p for p in batch if p.error is not None)
+            except Exception:
+                db.session.rollback()
+                # Hand the journal back untouched for the next recovery
+                os.rename(claimed, path)
+                lock.close()
+                raise
+
+            self._reject([p for p in unwritten if not isinstance(p.error, TRANSIENT_ERRORS)])
+            retry = [p for p in unwritten if isinstance(p.error, TRANSIENT_ERRORS)]
+            if retry:
+                with open(claimed, 'w') as f:
+                    f.writelines(_journal_line(p) for p in retry)
+                os.rename(claimed, path)
+                logger.error(f"{len(retry)} journaled exam submissions could not be written yet, kept in {path}")
+            else:
+                os.remove(claimed)
+            lock.close()
+
+        if recovered:
+            logger.info(f"Recovered {recovered} queued exam submissions from the journal")
+        return recovered
+
+    def _ensure_started(self):
+        """Start the writer in this process; threads do not survive a fork, so check the pid (caller holds the lock)"""
+        if self._pid == os.getpid():
+            return
+        self._pid = os.getpid()
+        self._queue = []
+        self._stopping = False
+        if self._journal:
+            # The parent's journal (and its lock) stays with the parent
+            self._journal.close()
+        self._journal = None
+        self._thread = threading.Thread(target=self._run, name='submission-writer', daemon=True)
+        self._thread.start()
+        atexit.register(self.shutdown)
+
+    def _run(self):
+        if self.durability == 'journal':
+            # A worker that replaces a crashed one picks up its journal
+            with self.app.app_context():
+                try:
+                    self.recover()
+                except Exception as e:
+                    logger.error(f"Exception recovering exam submissions: {str(e)}")
+                    logger.error(traceback.format_exc())
+                db.session.remove()
+
+        while True:
+            with self._cond:
+                while not self._queue and not self._stopping:
+                    self._cond.wait()
+                if not self._queue:
+                    return
+
+                # Give the batch up to flush_interval to fill
+                deadline = time.monotonic() + self.flush_interval
+                while len(self._queue) < self.batch_size and not self._stopping:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+
+                batch = self._queue[:self.batch_size]
+                del self._queue[:self.batch_size]
+
+            with self.app.app_context():
+                try:
+                    self._write(batch)
+                except Exception as e:
+                    # Never leave a request waiting on a batch that will not be written
+                    logger.error(f"Exception in submission writer: {str(e)}")
+                    logger.error(traceback.format_exc())
+                    for pending in batch:
+                        if not pending.done.is_set():
+                            pending.error = e
+                            pending.done.set()
+                db.session.remove()
+
+            failed = [pending for pending in batch if pending.error is not None]
+            retry = []
+            if failed and self.durability != 'commit':
+                # These were acknowledged already, so they must not be dropped
+                retry = [pending for pending in failed if isinstance(pending.error, TRANSIENT_ERRORS)]
+                self._reject([pending for pending in failed if not isinstance(pending.error, TRANSIENT_ERRORS)])
+
+            with self._cond:
+                self.flushes += 1
+                self.rows_written += len(batch) - len(failed)
+                if retry:
+                    for pending in retry:
+                        pending.error = None
+                        pending.done.clear()
+                    self._queue[:0] = retry
+                    self.retries += len(retry)
+                    if self._stopping:
+                        # The journal keeps them for the next start; without one they are lost
+                        logger.error(f"Stopping with {len(self._queue)} exam submissions unwritten")
+                        return
+                    self._retry_delay = min(max(self._retry_delay * 2, RETRY_DELAY_MIN), RETRY_DELAY_MAX)
+                    deadline = time.monotonic() + self._retry_delay
+                    while not self._stopping and time.monotonic() < deadline:
+                        self._cond.wait(deadline - time.monotonic())
+                    continue
+
+                self._retry_delay = 0
+                if self._journal and not self._queue:
+                    # Everything journaled so far is committed or set aside as rejected
+                    self._journal.truncate(0)
+                    self._journal.seek(0)
+
+    def _write(self, batch):
+        """Insert a batch with its statistics in one transaction, falling back to one row at a time"""
+        commit_started = time.monotonic()
+        try:
+            ids = self._insert(batch)
+            db.session.commit()
+        except Exception as e:
+            db.session.rollback()
+            logger.error(f"Group commit of {len(batch)} exam submissions failed, retrying one by one: {str(e)}")
+            ids = []
+            for pending in batch:
+                try:
+                    ids.extend(self._insert([pending]))
+                    db.session.commit()
+                except Exception as row_error:
+                    db.session.rollback()
+                    logger.error(f"Failed to store exam submission {pending.row['submission_id']}: {str(row_error)}")
+                    pending.error = row_error
+                    ids.append(None)
+
+        for pending, attempt_id in zip(batch, ids):
+            pending.attempt_id = attempt_id
+        for exam_id, scores in _group_scores(p for p in batch if p.error is None).items():
+            score_index.record(exam_id, scores, commit_started)
+        for pending in batch:
+            pending.done.set()
+
+    def _insert(self, batch):
+        ids = db.session.scalars(
+            insert(ExamAttempt).returning(ExamAttempt.id, sort_by_parameter_order=True),
+            [pending.row for pending in batch]
+        ).all()
+        by_exam = {}
+        for pending in batch:
+            by_exam.setdefault(pending.row['exam_id'], []).append(pending)
+        for exam_id, rows in by_exam.items():
+            ExamStatsService.record(
+                exam_id,
+                [pending.row['score'] for pending in rows],
+                np.stack([pending.correct for pending in rows])
+            )
+        return ids
+
+    def _journal_append(self, pending):
+        if self._journal is None:
+            # A fresh name, so a process that reuses a dead worker's pid never appends to its journal
+            path = os.path.join(self.journal_dir, f'submissions-{os.getpid()}-{uuid.uuid4().hex[:8]}.jsonl')
+            self._journal = open(path, 'x+')
+            fcntl.flock(self._journal, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        self._journal.write(_journal_line(pending))
+        # Survives a crash of this process; the OS writes it to disk on its own schedule
+        self._journal.flush()
+
+    def _reject(self, pendings):
+        """Set aside rows the database refuses, so an admin can fix and replay them"""
+        if not pendings:
+            return
+        os.makedirs(self.journal_dir, exist_ok=True)
+        path = os.path.join(self.journal_dir, f'rejected-{os.getpid()}.jsonl')
+        with open(path, 'a') as f:
+            f.writelines(_journal_line(pending) for pending in pendings)
+        with self._cond:
+            self.rejected += len(pendings)
+        logger.error(f"{len(pendings)} exam submissions were rejected by the database, saved to {path}")
+
+def _journal_line(pending):
+    return json.dumps({'row': _row_to_json(pending.row), 'correct': pending.correct.astype(int).tolist()}) + '\n'
+
+def _group_scores(pendings):
+    scores = {}
+    for pending in pendings:
+        scores.setdefault(pending.row['exam_id'], []).append(pending.row['score'])
+    return scores
+
+def _row_to_json(row):
+    return {key: value.isoformat() if key in DATETIME_FIELDS and value else value for key, value in row.items()}
+
+def _row_from_json(row):
+    return {key: datetime.fromisoformat(value) if key in DATETIME_FIELDS and value else value for key, value in row.items()}
+
+def _lock_stale(path):
+    """Open and lock a journal whose writer is gone; None while another process holds it"""
+    try:
+        f = open(path)
+    except FileNotFoundError:
+        return None
+    try:
+        fcntl.flock(f, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        f.close()
+        return None
+    return f
+
+submission_pipeline = SubmissionPipeline()
@@ -0,0 +1,169 @@
+import csv
+import io
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from sqlalchemy import func, insert, or_
+from sqlalchemy.exc import IntegrityError
+from app.models.user import User
+from app.services.password_hasher import password_hasher, POOL_CONTEXT
+from app.utils.validators import validate_email, validate_password, validate_username
+from app.utils.timestamps import utcnow
+from app import db
+
+DEFAULT_BATCH_SIZE = 1000
+
+class UserImportService:
+    @staticmethod
+    def parse_csv(text):
+        """Turn CSV text with columns username, email, password into user dicts"""
+        users = []
+        for row in csv.DictReader(io.StringIO(text)):
+            row = {(key or '').strip().lower(): (value or '').strip() for key, value in row.items()}
+            users.append({
+                'username': row.get('username', ''),
+                'email': row.get('email', ''),
+                'password': row.get('password', '')
+            })
+        return users
+
+    @staticmethod
+    def validate(users):
+        """
+        Check every user against the registration rules and against each other.
+
+        Returns (valid, errors) where valid holds (index, user) pairs and errors
+        holds {'index', 'error'} dicts, index being the user's position in the input.
+        """
+        valid = []
+        errors = []
+        seen_usernames = set()
+        seen_emails = set()
+
+        for index, user in enumerate(users):
+            username, email, password = user['username'], user['email'], user['password']
+
+            is_valid, message = validate_username(username)
+            if is_valid and not validate_email(email):
+                is_valid, message = False, "Invalid email format"
+            if is_valid:
+                is_valid, message = validate_password(password)
+            # Usernames and emails are unique regardless of case
+            if is_valid and username.lower() in seen_usernames:
+                is_valid, message = False, "Username appears more than once in the file"
+            if is_valid and email.lower() in seen_emails:
+                is_valid, message = False, "Email appears more than once in the file"
+
+            if not is_valid:
+                errors.append({'index': index, 'error': message})
+                continue
+
+            seen_usernames.add(username.lower())
+            seen_emails.add(email.lower())
+            valid.append((index, user))
+
+        return valid, errors
+
+    @staticmethod
+    def import_users(users, workers=None, batch_size=DEFAULT_BATCH_SIZE, progress=None):
+        """
+        Create accounts for many users at once.
+
+        Users that fail validation or already exist are reported and skipped.
+        Passwords are hashed across a pool of worker processes while the main
+        process inserts finished batches, one INSERT executemany and commit per
+        batch. progress, if given, is called with (processed, total) after each
+        batch. Returns (created, errors, timing).
+        """
+        started = time.perf_counter()
+        valid, errors = UserImportService.validate(users)
+
+        # Skip accounts that already exist, checked one batch at a time
+        pending = []
+        for start in range(0, len(valid), batch_size):
+            chunk = valid[start:start + batch_size]
+            existing = db.session.query(User.username, User.email).filter(or_(
+                func.lower(User.username).in_([user['username'].lower() for _, user in chunk]),
+                func.lower(User.email).in_([user['email'].lower() for _, user in chunk])
+            )).all()
+            taken_usernames = {row.username.lower() for row in existing}
+            taken_emails = {row.email.lower() for row in existing}
+            for index, user in chunk:
+                if user['username'].lower() in taken_usernames:
+                    errors.append({'index': index, 'error': 'Username already exists'})
+                elif user['email'].lower() in taken_emails:
+                    errors.append({'index': index, 'error': 'Email already exists'})
+                else:
+                    pending.append((index, user))
+
+        workers = workers or os.cpu_count() or 1
+        passwords = [user['password'] for _, user in pending]
+        created = 0
+        processed = len(users) - len(pending)
+        if progress:
+            progress(processed, len(users))
+
+        executor = ProcessPoolExecutor(max_workers=workers, mp_context=POOL_CONTEXT) if workers > 1 and len(pending) > 1 else None
+        try:
+            if executor:
+                chunksize = max(1, min(64, len(passwords) // (workers * 4)))
+                # The hasher is pickled with its settings, so workers hash like the app does
+                hashes = executor.map(password_hasher.hash, passwords, chunksize=chunksize)
+            else:
+                hashes = map(password_hasher.hash, passwords)
+
+            now = utcnow()
+            batch = []
+            for (index, user), password_hash in zip(pending, hashes):
+                batch.append((index, {
+                    'username': user['username'],
+                    'email': user['email'],
+                    'password_hash': password_hash,
+                    'created_at': now,
+                    'is_active': True,
+                    'is_admin': False
+                }))
+                if len(batch) == batch_size:
+                    created += UserImportService._insert_batch(batch, errors)
+                    processed += len(batch)
+                    batch = []
+                    if progress:
+                        progress(processed, len(users))
+            if batch:
+                created += UserImportService._insert_batch(batch, errors)
+                processed += len(batch)
+                if progress:
+                    progress(processed, len(users))
+        finally:
+            if executor:
+                executor.shutdown()
+
+        errors.sort(key=lambda error: error['index'])
+        elapsed = time.perf_counter() - started
+        timing = {
+            'total_ms': round(elapsed * 1000, 1),
+            'users_per_second': round(created / elapsed, 1) if elapsed > 0 else None,
+            'workers': workers if executor else 1
+        }
+        return created, errors, timing
+
+    @staticmethod
+    def _insert_batch(batch, errors):
+        """Insert a batch in one statement, falling back to row by row if another writer created a duplicate"""
+        try:
+            db.session.execute(insert(User), [row for _, row in batch])
+            db.session.commit()
+            return len(batch)
+        except IntegrityError:
+            db.session.rollback()
+
+        created = 0
+        for index, row in batch:
+            try:
+                db.session.execute(insert(User), [row])
+                db.session.commit()
+                created += 1
+            except IntegrityError:
+                db.session.rollback()
+                errors.append({'index': index, 'error': 'Username or email already exists'})
+        return created
@@ -0,0 +1,55 @@
+import threading
+import time
+from sqlalchemy import or_
+from app.models.user import User
+from app import db
+
+class UserStateCache:
+    """
+    Revocation check for access tokens.
+
+    Tokens carry the user's role and active status as claims, and routes
+    authorize from those. This cache only decides whether a token is still
+    valid: it keeps the ids of deactivated users and of admins, read with a
+    single query at most once every USER_STATE_TTL seconds per worker. A
+    token is revoked when its user has been deactivated, or when it claims
+    admin rights the user no longer has, so deactivate and remove-admin in
+    admin_cli (another process) take effect within the TTL.
+    """
+
+    def __init__(self, ttl=10):
+        self.ttl = ttl
+        self._inactive_ids = frozenset()
+        self._admin_ids = frozenset()
+        self._loaded_at = None
+        self._lock = threading.Lock()
+        self.refreshes = 0
+
+    def init_app(self, app):
+        self.ttl = app.config.get('USER_STATE_TTL', self.ttl)
+        self.clear()
+
+    def is_revoked(self, user_id, claims_admin):
+        """True when the token of user_id, claiming admin or not, must no longer be accepted"""
+        inactive_ids, admin_ids = self._snapshot()
+        return user_id in inactive_ids or (claims_admin and user_id not in admin_ids)
+
+    def clear(self):
+        with self._lock:
+            self._loaded_at = None
+
+    def _snapshot(self):
+        with self._lock:
+            now = time.monotonic()
+            if self._loaded_at is None or now - self._loaded_at >= self.ttl:
+                # Both sets are small: most accounts are active students
+                rows = db.session.query(User.id, User.is_admin, User.is_active).filter(
+                    or_(User.is_active.is_(False), User.is_admin.is_(True))
+                ).all()
+                self._inactive_ids = frozenset(row.id for row in rows if not row.is_active)
+                self._admin_ids = frozenset(row.id for row in rows if row.is_admin)
+                self._loaded_at = now
+                self.refreshes += 1
+            return self._inactive_ids, self._admin_ids
+
+user_state = UserStateCache()
@@ -0,0 +1,49 @@
+"""
+Compact storage format for answer keys and answer sheets.
+
+Answers are stored as a fixed-width string with one character per question:
+'A'-'D' for a chosen option and '-' for a blank. A full sheet is 50 bytes,
+and two sheets can be compared position by position without any parsing.
+"""
+
+QUESTION_COUNT = 50
+VALID_OPTIONS = frozenset('ABCD')
+BLANK = '-'
+
+
+def is_option(answer):
+    """True for 'A'-'D'; anything else, including lists and other unhashable values, is a blank"""
+    return isinstance(answer, str) and answer in VALID_OPTIONS
+
+
+def encode_answer_key(answers):
+    """Encode an answer key list ['A', 'B', ...] as a fixed-width string"""
+    if not answers:
+        return None
+    return ''.join(
+        answers[i] if i < len(answers) and is_option(answers[i]) else BLANK
+        for i in range(QUESTION_COUNT)
+    )
+
+
+def decode_answer_key(answer_key):
+    """Decode a fixed-width answer key back into a list of answers"""
+    if not answer_key:
+        return []
+    return list(answer_key)
+
+
+def encode_user_answers(user_answers):
+    """Encode a {question_id: answer} dict as a fixed-width string"""
+    user_answers = user_answers or {}
+    return ''.join(
+        answer if is_option(answer) else BLANK
+        for answer in (user_answers.get(str(q)) for q in range(1, QUESTION_COUNT + 1))
+    )
+
+
+def decode_user_answers(answer_sheet):
+    """Decode a fixed-width answer sheet into a {question_id: answer} dict, omitting blanks"""
+    if not answer_sheet:
+        return {}
+    return {str(i + 1): answer for i, answer in enumerate(answer_sheet) if answer != BLANK}
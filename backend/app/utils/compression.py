@@ -0,0 +1,146 @@
+"""
+Response compression for API payloads.
+
+JSON and CSV responses of at least COMPRESSION_MIN_SIZE bytes are compressed
+with brotli or gzip, whichever the client prefers (brotli needs the optional
+brotli package). Bodies of responses that carry an ETag, such as the cached
+question sheet and the conditional catalog and review endpoints, are
+requested again and again, so their compressed bytes are kept in a small LRU
+keyed by a digest of the body and reused instead of being compressed anew.
+"""
+
+import gzip
+import hashlib
+import threading
+from collections import OrderedDict
+from flask import request
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+COMPRESSIBLE_MIMETYPES = {'application/json', 'application/x-ndjson', 'text/csv', 'text/plain'}
+
+class ResponseCompressor:
+    """after_request hook compressing responses, with a cache of compressed ETag'd bodies"""
+
+    def __init__(self):
+        self.enabled = False
+        self.min_size = 1024
+        self.gzip_level = 6
+        self.brotli_quality = 5
+        self.maxsize = 256
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+        self.reset_stats()
+
+    def init_app(self, app):
+        self.enabled = app.config.get('COMPRESSION_ENABLED', True)
+        self.min_size = app.config.get('COMPRESSION_MIN_SIZE', 1024)
+        self.gzip_level = app.config.get('COMPRESSION_GZIP_LEVEL', 6)
+        self.brotli_quality = app.config.get('COMPRESSION_BROTLI_QUALITY', 5)
+        self.maxsize = app.config.get('COMPRESSION_CACHE_SIZE', 256)
+        self.clear()
+        app.after_request(self.compress_response)
+
+    @property
+    def encodings(self):
+        return ('br', 'gzip') if brotli else ('gzip',)
+
+    def negotiate(self, accept_encodings):
+        """Pick the encoding the client rates highest, preferring brotli on a tie"""
+        best, best_quality = None, 0
+        for encoding in self.encodings:
+            quality = accept_encodings.quality(encoding)
+            if quality > best_quality:
+                best, best_quality = encoding, quality
+        return best
+
+    def compress(self, body, encoding):
+        if encoding == 'br':
+            return brotli.compress(body, quality=self.brotli_quality)
+        return gzip.compress(body, compresslevel=self.gzip_level, mtime=0)
+
+    def compress_response(self, response):
+        if not self.enabled or response.mimetype not in COMPRESSIBLE_MIMETYPES:
+            return response
+        response.vary.add('Accept-Encoding')
+        # Streamed exports are sent as they are generated, and partial or empty bodies are left alone
+        if response.status_code < 200 or response.status_code in (204, 206, 304) \
+                or response.direct_passthrough or response.is_streamed \
+                or 'Content-Encoding' in response.headers:
+            return response
+
+        encoding = self.negotiate(request.accept_encodings)
+        if encoding is None:
+            return response
+        body = response.get_data()
+        if len(body) < self.min_size:
+            return response
+
+        etag, weak = response.get_etag()
+        compressed = self._cached(body, encoding) if etag else self._compress(body, encoding)
+        if len(compressed) >= len(body):
+            return response
+
+        response.set_data(compressed)
+        response.headers['Content-Encoding'] = encoding
+        if etag and not weak:
+            # The bytes differ from the identity encoding, so the validator is only weakly equal
+            response.set_etag(etag, weak=True)
+        return response
+
+    def _compress(self, body, encoding):
+        compressed = self.compress(body, encoding)
+        with self._lock:
+            self.compressed += 1
+            self.bytes_in += len(body)
+            self.bytes_out += len(compressed)
+        return compressed
+
+    def _cached(self, body, encoding):
+        key = (hashlib.blake2b(body, digest_size=16).digest(), encoding)
+        with self._lock:
+            compressed = self._cache.get(key)
+            if compressed is not None:
+                self._cache.move_to_end(key)
+                self.hits += 1
+                self.bytes_in += len(body)
+                self.bytes_out += len(compressed)
+                return compressed
+            self.misses += 1
+
+        compressed = self._compress(body, encoding)
+        with self._lock:
+            self._cache[key] = compressed
+            while len(self._cache) > self.maxsize:
+                self._cache.popitem(last=False)
+        return compressed
+
+    def clear(self):
+        with self._lock:
+            self._cache.clear()
+
+    def reset_stats(self):
+        with self._lock:
+            self.compressed = 0
+            self.hits = 0
+            self.misses = 0
+            self.bytes_in = 0
+            self.bytes_out = 0
+
+    def stats(self):
+        with self._lock:
+            return {
+                'enabled': self.enabled,
+                'encodings': list(self.encodings),
+                'min_size': self.min_size,
+                'compressed': self.compressed,
+                'cache_hits': self.hits,
+                'cache_misses': self.misses,
+                'cache_size': len(self._cache),
+                'ratio': round(self.bytes_out / self.bytes_in, 3) if self.bytes_in else None
+            }
+
+response_compressor = ResponseCompressor()
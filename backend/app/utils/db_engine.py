@@ -0,0 +1,139 @@
+"""
+Per-backend engine settings and connection statistics.
+
+SQLite gets WAL journaling, a busy timeout, relaxed fsyncs and memory-mapped
+reads, applied with PRAGMAs on every new connection. Server databases such as
+PostgreSQL get a sized, pre-pinged and recycled connection pool. Both report
+pool usage and how long writes waited through db_stats.
+"""
+
+import threading
+import time
+from sqlalchemy import event
+
+SQLITE_JOURNAL_MODES = {'DELETE', 'TRUNCATE', 'PERSIST', 'MEMORY', 'WAL', 'OFF'}
+SQLITE_SYNCHRONOUS_MODES = {'OFF', 'NORMAL', 'FULL', 'EXTRA'}
+WRITE_VERBS = ('INSERT', 'UPDATE', 'DELETE')
+# PostgreSQL lock_not_available and deadlock_detected
+POSTGRES_LOCK_CODES = {'55P03', '40P01'}
+
+def engine_options(config):
+    """SQLALCHEMY_ENGINE_OPTIONS for the configured database"""
+    if config['SQLALCHEMY_DATABASE_URI'].startswith('sqlite'):
+        # Pool sizing does not apply; the PRAGMAs are set by install_sqlite_pragmas
+        return {}
+    return {
+        'pool_size': config['DB_POOL_SIZE'],
+        'max_overflow': config['DB_MAX_OVERFLOW'],
+        'pool_timeout': config['DB_POOL_TIMEOUT'],
+        'pool_recycle': config['DB_POOL_RECYCLE'],
+        'pool_pre_ping': config['DB_POOL_PRE_PING']
+    }
+
+def sqlite_pragmas(config):
+    """PRAGMA statements for a new SQLite connection, validated against the allowed values"""
+    journal_mode = config['SQLITE_JOURNAL_MODE'].upper()
+    synchronous = config['SQLITE_SYNCHRONOUS'].upper()
+    if journal_mode not in SQLITE_JOURNAL_MODES:
+        raise ValueError(f"Invalid SQLITE_JOURNAL_MODE '{journal_mode}'")
+    if synchronous not in SQLITE_SYNCHRONOUS_MODES:
+        raise ValueError(f"Invalid SQLITE_SYNCHRONOUS '{synchronous}'")
+    return [
+        f"PRAGMA journal_mode={journal_mode}",
+        f"PRAGMA busy_timeout={int(config['SQLITE_BUSY_TIMEOUT_MS'])}",
+        f"PRAGMA synchronous={synchronous}",
+        f"PRAGMA mmap_size={int(config['SQLITE_MMAP_SIZE'])}"
+    ]
+
+def install_sqlite_pragmas(engine, config):
+    pragmas = sqlite_pragmas(config)
+
+    @event.listens_for(engine, 'connect')
+    def set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for pragma in pragmas:
+            cursor.execute(pragma)
+        cursor.close()
+
+class DatabaseStats:
+    """Connection pool usage, write latency and lock errors for this worker's engine"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._engine = None
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.connections_opened = 0
+            self.checkouts = 0
+            self.writes = 0
+            self.write_ms_total = 0.0
+            self.write_ms_max = 0.0
+            self.lock_errors = 0
+
+    def install(self, engine):
+        """Attach the counters to an engine (once per engine)"""
+        self._engine = engine
+        if getattr(engine, '_stats_installed', False):
+            return
+        engine._stats_installed = True
+
+        @event.listens_for(engine, 'connect')
+        def on_connect(dbapi_connection, connection_record):
+            with self._lock:
+                self.connections_opened += 1
+
+        @event.listens_for(engine, 'checkout')
+        def on_checkout(dbapi_connection, connection_record, connection_proxy):
+            with self._lock:
+                self.checkouts += 1
+
+        @event.listens_for(engine, 'before_cursor_execute')
+        def before_execute(conn, cursor, statement, parameters, context, executemany):
+            if statement.lstrip()[:6].upper() in WRITE_VERBS:
+                conn.info['write_started'] = time.perf_counter()
+
+        @event.listens_for(engine, 'after_cursor_execute')
+        def after_execute(conn, cursor, statement, parameters, context, executemany):
+            started = conn.info.pop('write_started', None)
+            if started is not None:
+                # Under contention this is mostly time spent waiting for the write lock
+                elapsed = (time.perf_counter() - started) * 1000
+                with self._lock:
+                    self.writes += 1
+                    self.write_ms_total += elapsed
+                    self.write_ms_max = max(self.write_ms_max, elapsed)
+
+        @event.listens_for(engine, 'handle_error')
+        def on_error(context):
+            if context.connection is not None:
+                context.connection.info.pop('write_started', None)
+            error = context.original_exception
+            message = str(error).lower()
+            if 'database is locked' in message or 'database is busy' in message \
+                    or getattr(error, 'pgcode', None) in POSTGRES_LOCK_CODES:
+                with self._lock:
+                    self.lock_errors += 1
+
+    def snapshot(self):
+        pool = self._engine.pool if self._engine is not None else None
+        pool_stats = {'class': type(pool).__name__ if pool is not None else None}
+        for name in ('size', 'checkedin', 'checkedout', 'overflow'):
+            method = getattr(pool, name, None)
+            if callable(method):
+                pool_stats[name] = method()
+
+        with self._lock:
+            return {
+                'dialect': self._engine.dialect.name if self._engine is not None else None,
+                'pool': pool_stats,
+                'connections_opened': self.connections_opened,
+                'checkouts': self.checkouts,
+                'writes': self.writes,
+                'write_ms_avg': round(self.write_ms_total / self.writes, 3) if self.writes else None,
+                'write_ms_max': round(self.write_ms_max, 3),
+                'lock_errors': self.lock_errors
+            }
+
+db_stats = DatabaseStats()
@@ -0,0 +1,119 @@
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from datetime import timezone
+from functools import wraps
+from flask import current_app, request, make_response
+from flask_jwt_extended import get_jwt_identity
+
+logger = logging.getLogger(__name__)
+
+class CachedPayload:
+    """A JSON response body serialized once, with its strong ETag"""
+    __slots__ = ('body', 'etag')
+
+    def __init__(self, body, etag):
+        self.body = body
+        self.etag = etag
+
+    @classmethod
+    def from_data(cls, data):
+        body = current_app.json.dump_bytes(data)
+        return cls(body, hashlib.sha256(body).hexdigest()[:32])
+
+class PayloadCache:
+    """Bounded LRU of pre-serialized payloads, keyed by a resource version"""
+
+    def __init__(self, maxsize=256):
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_or_build(self, key, build):
+        """Return the cached payload for key, serializing build() on a miss"""
+        with self._lock:
+            payload = self._entries.get(key)
+            if payload is not None:
+                self._entries.move_to_end(key)
+                return payload
+
+        payload = CachedPayload.from_data(build())
+        with self._lock:
+            self._entries[key] = payload
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        return payload
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+def payload_response(payload, status=200):
+    """Serve a cached payload, answering 304 when the client already has it"""
+    if request.if_none_match.contains_weak(payload.etag):
+        response = current_app.response_class(status=304)
+    else:
+        response = current_app.response_class(payload.body, status=status, mimetype='application/json')
+    response.set_etag(payload.etag)
+    # Let browsers keep the body but revalidate it on every load
+    response.headers['Cache-Control'] = 'private, no-cache'
+    return response
+
+def conditional(validator):
+    """
+    Decorator adding ETag / Last-Modified validation to a GET view.
+    
+    validator receives the view's arguments and returns (version, last_modified),
+    where version is any tuple that changes whenever the response would change
+    (typically counts and max(updated_at) read with an aggregate query), or None
+    to skip validation. The ETag is weak because it is derived from row
+    metadata rather than the serialized body.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            try:
+                state = validator(*args, **kwargs)
+            except Exception as e:
+                logger.error(f"Failed to compute validator for {request.path}: {str(e)}")
+                state = None
+            
+            if state is None:
+                return view(*args, **kwargs)
+            
+            version, last_modified = state
+            etag = make_etag(version)
+            if last_modified is not None:
+                # HTTP dates have second precision and updated_at is stored as naive UTC
+                last_modified = last_modified.replace(microsecond=0)
+                if last_modified.tzinfo is None:
+                    last_modified = last_modified.replace(tzinfo=timezone.utc)
+            
+            if not_modified(etag, last_modified):
+                response = current_app.response_class(status=304)
+            else:
+                response = make_response(view(*args, **kwargs))
+                if response.status_code != 200:
+                    return response
+            
+            response.set_etag(etag, weak=True)
+            if last_modified is not None:
+                response.last_modified = last_modified
+            response.headers['Cache-Control'] = 'private, no-cache'
+            return response
+        return wrapper
+    return decorator
+
+def make_etag(version):
+    """Hash a resource version together with the request URL and caller identity"""
+    raw = repr((request.full_path, get_jwt_identity(), version))
+    return hashlib.sha256(raw.encode('utf-8')).hexdigest()[:32]
+
+def not_modified(etag, last_modified):
+    """Evaluate If-None-Match, falling back to If-Modified-Since when no ETag was sent"""
+    if request.if_none_match:
+        return request.if_none_match.contains_weak(etag)
+    if request.if_modified_since and last_modified is not None:
+        return last_modified <= request.if_modified_since
+    return False
@@ -0,0 +1,56 @@
+"""
+JSON provider for API responses.
+
+Uses orjson when it is installed and the standard library otherwise. Both
+write dates and datetimes as ISO 8601, so models return them as they are
+instead of formatting them in to_dict().
+"""
+
+from datetime import date
+from flask.json.provider import DefaultJSONProvider, _default as flask_default
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+def _default(o):
+    if isinstance(o, date):
+        return o.isoformat()
+    # orjson only takes exact floats; numpy.float64 and friends arrive here
+    if isinstance(o, float):
+        return float(o)
+    return flask_default(o)
+
+class APIJSONProvider(DefaultJSONProvider):
+    default = staticmethod(_default)
+    use_orjson = orjson is not None
+
+    def dumps(self, obj, **kwargs):
+        # Callers asking for stdlib options (indent, separators, ...) get the stdlib
+        if not self.use_orjson or kwargs:
+            return super().dumps(obj, **kwargs)
+        return self.dump_bytes(obj).decode('utf-8')
+
+    def dump_bytes(self, obj, pretty=False):
+        """Serialize obj straight to UTF-8 bytes, skipping the str round trip"""
+        if not self.use_orjson:
+            dump_args = {'indent': 2} if pretty else {'separators': (',', ':')}
+            return super().dumps(obj, **dump_args).encode('utf-8')
+        option = orjson.OPT_NON_STR_KEYS
+        if self.sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        if pretty:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, default=self.default, option=option)
+
+    def loads(self, s, **kwargs):
+        if not self.use_orjson or kwargs:
+            return super().loads(s, **kwargs)
+        # orjson.JSONDecodeError is a ValueError, so bad request bodies fail as before
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        pretty = (self.compact is None and self._app.debug) or self.compact is False
+        return self._app.response_class(self.dump_bytes(obj, pretty) + b'\n', mimetype=self.mimetype)
@@ -0,0 +1,129 @@
+"""
+Prometheus metrics for requests and the SQL they run.
+
+Every request is counted by blueprint, endpoint, method and status. Its
+latency and the number and total time of its SQL statements are recorded in
+histograms, and requests in flight are tracked by a gauge. GET /api/metrics
+renders them in the Prometheus text format.
+
+Under gunicorn each worker has its own counters. When PROMETHEUS_MULTIPROC_DIR
+is set (gunicorn.conf.py sets it), prometheus_client keeps them in
+memory-mapped files in that directory, and a scrape of any worker sums the
+files of all of them. The variable must be set before prometheus_client is
+first imported, which is why it is only imported in init_app.
+"""
+
+import os
+import time
+from flask import g, has_request_context, request
+from sqlalchemy import event
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SQL_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+SQL_TIME_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+
+class RequestMetrics:
+    """Request and SQL metrics, shared by every app created in this process"""
+
+    def __init__(self):
+        self.enabled = False
+        self.registry = None
+
+    @property
+    def multiprocess(self):
+        return 'PROMETHEUS_MULTIPROC_DIR' in os.environ
+
+    def init_app(self, app):
+        self.enabled = app.config.get('METRICS_ENABLED', True)
+        if not self.enabled:
+            return
+        if self.registry is None:
+            self._create_metrics()
+
+        # First before_request hook, so the timing covers the others too
+        app.before_request_funcs.setdefault(None, []).insert(0, self._before_request)
+        app.after_request(self._after_request)
+        app.teardown_request(self._teardown_request)
+
+    def install(self, engine):
+        """Count SQL statements and their time against the request that runs them (once per engine)"""
+        if getattr(engine, '_metrics_installed', False):
+            return
+        engine._metrics_installed = True
+
+        @event.listens_for(engine, 'before_cursor_execute')
+        def before_execute(conn, cursor, statement, parameters, context, executemany):
+            if has_request_context() and 'metrics_started' in g:
+                g.metrics_sql_started = time.perf_counter()
+
+        @event.listens_for(engine, 'after_cursor_execute')
+        def after_execute(conn, cursor, statement, parameters, context, executemany):
+            if has_request_context() and 'metrics_sql_started' in g:
+                g.metrics_sql_count += 1
+                g.metrics_sql_seconds += time.perf_counter() - g.pop('metrics_sql_started')
+
+    def render(self):
+        """The current metrics as (body, content type), summed over every worker in multiprocess mode"""
+        from prometheus_client import CollectorRegistry, generate_latest, CONTENT_TYPE_LATEST
+
+        if self.multiprocess:
+            from prometheus_client import multiprocess
+            registry = CollectorRegistry()
+            multiprocess.MultiProcessCollector(registry)
+        else:
+            registry = self.registry
+        return generate_latest(registry), CONTENT_TYPE_LATEST
+
+    def _create_metrics(self):
+        from prometheus_client import CollectorRegistry, Counter, Gauge, Histogram
+
+        # A private registry, so creating several apps in one process does not register twice
+        self.registry = CollectorRegistry()
+        labels = ['blueprint', 'endpoint']
+        self.requests = Counter(
+            'http_requests_total', 'HTTP requests by endpoint, method and status',
+            labels + ['method', 'status'], registry=self.registry
+        )
+        self.latency = Histogram(
+            'http_request_duration_seconds', 'Time from request start to response',
+            labels + ['method'], buckets=LATENCY_BUCKETS, registry=self.registry
+        )
+        self.in_progress = Gauge(
+            'http_requests_in_progress', 'Requests currently being handled',
+            labels, multiprocess_mode='livesum', registry=self.registry
+        )
+        self.sql_statements = Histogram(
+            'http_request_sql_statements', 'SQL statements run per request',
+            labels, buckets=SQL_COUNT_BUCKETS, registry=self.registry
+        )
+        self.sql_duration = Histogram(
+            'http_request_sql_duration_seconds', 'Time spent in SQL per request',
+            labels, buckets=SQL_TIME_BUCKETS, registry=self.registry
+        )
+
+    def _labels(self):
+        # Unmatched URLs share one label so scanners cannot grow the series without bound
+        return request.blueprint or '', request.endpoint or 'unmatched'
+
+    def _before_request(self):
+        g.metrics_started = time.perf_counter()
+        g.metrics_sql_count = 0
+        g.metrics_sql_seconds = 0.0
+        self.in_progress.labels(*self._labels()).inc()
+
+    def _after_request(self, response):
+        if 'metrics_started' not in g:
+            return response
+        blueprint, endpoint = self._labels()
+        self.requests.labels(blueprint, endpoint, request.method, str(response.status_code)).inc()
+        self.latency.labels(blueprint, endpoint, request.method).observe(time.perf_counter() - g.metrics_started)
+        self.sql_statements.labels(blueprint, endpoint).observe(g.metrics_sql_count)
+        self.sql_duration.labels(blueprint, endpoint).observe(g.metrics_sql_seconds)
+        return response
+
+    def _teardown_request(self, exc):
+        if 'metrics_started' in g:
+            self.in_progress.labels(*self._labels()).dec()
+            g.pop('metrics_started')
+
+request_metrics = RequestMetrics()
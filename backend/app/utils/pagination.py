@@ -0,0 +1,24 @@
+import base64
+from datetime import datetime
+
+def encode_cursor(created_at, row_id):
+    """Encode a (created_at, id) keyset position as an opaque URL-safe cursor"""
+    raw = f'{created_at.isoformat()}|{row_id}'
+    return base64.urlsafe_b64encode(raw.encode('utf-8')).decode('ascii').rstrip('=')
+
+def decode_cursor(cursor):
+    """Decode a cursor produced by encode_cursor, returning None if it is malformed"""
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        created_at, row_id = base64.urlsafe_b64decode(padded).decode('utf-8').split('|')
+        return datetime.fromisoformat(created_at), int(row_id)
+    except (ValueError, UnicodeDecodeError):
+        return None
+
+def parse_limit(value, default, maximum):
+    """Parse a page size query parameter, clamped to 1..maximum"""
+    try:
+        limit = int(value) if value is not None else default
+    except ValueError:
+        return None
+    return max(1, min(limit, maximum))
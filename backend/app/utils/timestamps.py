@@ -0,0 +1,8 @@
+from datetime import datetime, timezone
+
+def utcnow():
+    """
+    The current time as naive UTC, the form DateTime columns store and return.
+    Rows that were just written then serialize and compare like rows read back.
+    """
+    return datetime.now(timezone.utc).replace(tzinfo=None)
@@ -1,4 +1,5 @@
 import re
+from app.utils.answer_codec import QUESTION_COUNT, VALID_OPTIONS
 
 def validate_email(email):
     """Validate email format"""
@@ -24,3 +25,12 @@ def validate_username(username):
     if not re.match(r'^[a-zA-Z0-9_]+$', username):
         return False, "Username can only contain letters, numbers, and underscores"
     return True, "Valid username"
+
+def validate_answer_key(answers):
+    """Validate a list of exactly 50 answers, each A, B, C, or D"""
+    if not isinstance(answers, (list, tuple)) or len(answers) != QUESTION_COUNT:
+        return False, f"Exactly {QUESTION_COUNT} answers are required"
+    for i, answer in enumerate(answers):
+        if not isinstance(answer, str) or answer not in VALID_OPTIONS:
+            return False, f"Invalid answer for question {i+1}. Must be A, B, C, or D"
+    return True, "Valid answers"
@@ -5,14 +5,57 @@ class Config:
     SECRET_KEY = os.getenv('SECRET_KEY', 'dev-secret-key-change-in-production')
     SQLALCHEMY_DATABASE_URI = os.getenv('DATABASE_URL', 'sqlite:///grammar_school.db')
     SQLALCHEMY_TRACK_MODIFICATIONS = False
+    # SQLite connection PRAGMAs: WAL lets reads run alongside a write, busy_timeout makes
+    # writers wait for the lock instead of failing, NORMAL only fsyncs at checkpoints in WAL
+    SQLITE_JOURNAL_MODE = os.getenv('SQLITE_JOURNAL_MODE', 'WAL')
+    SQLITE_BUSY_TIMEOUT_MS = int(os.getenv('SQLITE_BUSY_TIMEOUT_MS', '5000'))
+    SQLITE_SYNCHRONOUS = os.getenv('SQLITE_SYNCHRONOUS', 'NORMAL')
+    SQLITE_MMAP_SIZE = int(os.getenv('SQLITE_MMAP_SIZE', str(256 * 1024 * 1024)))
+    # Connection pool for server databases (PostgreSQL), per worker process
+    DB_POOL_SIZE = int(os.getenv('DB_POOL_SIZE', '5'))
+    DB_MAX_OVERFLOW = int(os.getenv('DB_MAX_OVERFLOW', '10'))
+    DB_POOL_TIMEOUT = int(os.getenv('DB_POOL_TIMEOUT', '30'))
+    DB_POOL_RECYCLE = int(os.getenv('DB_POOL_RECYCLE', '1800'))  # Seconds, below typical server/proxy idle timeouts
+    DB_POOL_PRE_PING = os.getenv('DB_POOL_PRE_PING', 'true').lower() == 'true'
     JWT_SECRET_KEY = os.getenv('JWT_SECRET_KEY', 'jwt-secret-key-change-in-production')
     JWT_ACCESS_TOKEN_EXPIRES = timedelta(hours=24)
+    BATCH_GRADING_MAX_SHEETS = int(os.getenv('BATCH_GRADING_MAX_SHEETS', '1000'))
+    EXAM_IMPORT_MAX_ROWS = int(os.getenv('EXAM_IMPORT_MAX_ROWS', '500'))
+    EXAM_CACHE_MAXSIZE = int(os.getenv('EXAM_CACHE_MAXSIZE', '256'))
+    EXAM_CACHE_TTL = int(os.getenv('EXAM_CACHE_TTL', '30'))  # Seconds before a cached exam is revalidated
+    PASSWORD_HASH_SCHEME = os.getenv('PASSWORD_HASH_SCHEME', 'werkzeug')  # 'werkzeug' or 'bcrypt'
+    PASSWORD_HASH_METHOD = os.getenv('PASSWORD_HASH_METHOD', 'scrypt')  # Werkzeug method, e.g. 'pbkdf2:sha256:600000'
+    BCRYPT_ROUNDS = int(os.getenv('BCRYPT_ROUNDS', '12'))
+    PASSWORD_VERIFY_WORKERS = int(os.getenv('PASSWORD_VERIFY_WORKERS', '0'))  # Processes for login verification, 0 verifies inline
+    # Logins waiting on or running in the pool, below the thread count so other requests keep a thread
+    PASSWORD_VERIFY_MAX_PENDING = int(os.getenv('PASSWORD_VERIFY_MAX_PENDING', str(max(int(os.getenv('GUNICORN_THREADS', '4')) - 1, 1))))
+    PASSWORD_VERIFY_QUEUE_TIMEOUT = float(os.getenv('PASSWORD_VERIFY_QUEUE_TIMEOUT', '0.5'))  # Seconds a login waits for a slot before a 503
+    USER_STATE_TTL = int(os.getenv('USER_STATE_TTL', '10'))  # Seconds before the inactive user and admin ids are reread
+    SCORE_INDEX_TTL = int(os.getenv('SCORE_INDEX_TTL', '30'))  # Seconds before a score index is checked against exam_stats
+    # Response compression: gzip, or brotli when installed, for JSON/CSV bodies of at least COMPRESSION_MIN_SIZE bytes
+    COMPRESSION_ENABLED = os.getenv('COMPRESSION_ENABLED', 'true').lower() == 'true'
+    COMPRESSION_MIN_SIZE = int(os.getenv('COMPRESSION_MIN_SIZE', '1024'))
+    COMPRESSION_GZIP_LEVEL = int(os.getenv('COMPRESSION_GZIP_LEVEL', '6'))
+    COMPRESSION_BROTLI_QUALITY = int(os.getenv('COMPRESSION_BROTLI_QUALITY', '5'))
+    COMPRESSION_CACHE_SIZE = int(os.getenv('COMPRESSION_CACHE_SIZE', '256'))  # Compressed ETag'd bodies kept per worker
+    # Prometheus metrics at /api/metrics; when METRICS_TOKEN is set, scrapers must send it as a bearer token
+    METRICS_ENABLED = os.getenv('METRICS_ENABLED', 'true').lower() == 'true'
+    METRICS_TOKEN = os.getenv('METRICS_TOKEN')
+    # Write-behind submissions: graded attempts are inserted by a writer thread in group commits
+    SUBMISSION_PIPELINE_ENABLED = os.getenv('SUBMISSION_PIPELINE_ENABLED', 'false').lower() == 'true'
+    SUBMISSION_DURABILITY = os.getenv('SUBMISSION_DURABILITY', 'commit')  # 'commit', 'journal' or 'none'
+    SUBMISSION_BATCH_SIZE = int(os.getenv('SUBMISSION_BATCH_SIZE', '200'))
+    SUBMISSION_FLUSH_MS = int(os.getenv('SUBMISSION_FLUSH_MS', '10'))
+    SUBMISSION_JOURNAL_DIR = os.getenv('SUBMISSION_JOURNAL_DIR', 'submission_journal')
 
 class DevelopmentConfig(Config):
     DEBUG = True
 
 class ProductionConfig(Config):
     DEBUG = False
+    # Enough connections for every gunicorn thread in a worker, plus headroom
+    DB_POOL_SIZE = int(os.getenv('DB_POOL_SIZE', '8'))
+    DB_MAX_OVERFLOW = int(os.getenv('DB_MAX_OVERFLOW', '8'))
 
 class TestingConfig(Config):
     TESTING = True
@@ -0,0 +1,68 @@
+"""
+Gunicorn settings for production.
+
+    gunicorn -c gunicorn.conf.py wsgi:app
+
+Every setting can be overridden with the environment variable named next to it.
+"""
+
+import multiprocessing
+import os
+import shutil
+import tempfile
+
+# Workers keep Prometheus metrics in files here so /api/metrics can sum them; must be set before the app loads
+os.environ.setdefault('PROMETHEUS_MULTIPROC_DIR', os.path.join(tempfile.gettempdir(), 'grammar-school-metrics'))
+
+# Listen on the same port as the development server
+bind = os.getenv('GUNICORN_BIND', '0.0.0.0:5001')
+
+# Pre-forked workers, each with a small thread pool so requests waiting on the
+# database do not hold a whole process
+workers = int(os.getenv('GUNICORN_WORKERS', multiprocessing.cpu_count() * 2 + 1))
+threads = int(os.getenv('GUNICORN_THREADS', '4'))
+worker_class = 'gthread'
+
+# Build the app once in the master and fork it into the workers
+preload_app = True
+
+# Recycle workers regularly to cap slow memory growth; jitter keeps them from restarting together.
+# A restart drops connections the worker has already accepted, and at a few hundred requests a
+# second per worker a limit of 1000 restarted them every few seconds, so keep it high
+max_requests = int(os.getenv('GUNICORN_MAX_REQUESTS', '10000'))
+max_requests_jitter = int(os.getenv('GUNICORN_MAX_REQUESTS_JITTER', '1000'))
+
+# Kill requests stuck this long; on shutdown, let in-flight requests finish first
+timeout = int(os.getenv('GUNICORN_TIMEOUT', '60'))
+graceful_timeout = int(os.getenv('GUNICORN_GRACEFUL_TIMEOUT', '30'))
+keepalive = int(os.getenv('GUNICORN_KEEPALIVE', '5'))
+
+accesslog = os.getenv('GUNICORN_ACCESS_LOG', '-')
+errorlog = '-'
+loglevel = os.getenv('GUNICORN_LOG_LEVEL', 'info')
+
+def on_starting(server):
+    """Start every run with empty metrics"""
+    metrics_dir = os.environ['PROMETHEUS_MULTIPROC_DIR']
+    shutil.rmtree(metrics_dir, ignore_errors=True)
+    os.makedirs(metrics_dir)
+
+def post_fork(server, worker):
+    """Give each worker its own database connections instead of sharing the master's sockets"""
+    from wsgi import app
+    from app import db
+
+    with app.app_context():
+        db.engine.dispose(close=False)
+
+def worker_exit(server, worker):
+    """Write any queued exam submissions before the worker goes away"""
+    from app.services.submission_pipeline import submission_pipeline
+
+    submission_pipeline.shutdown()
+
+def child_exit(server, worker):
+    """Drop the exited worker's in-flight gauge; its counters stay in the totals"""
+    from prometheus_client import multiprocess
+
+    multiprocess.mark_process_dead(worker.pid)
@@ -0,0 +1,107 @@
+"""Pack answer keys and answer sheets into fixed-width strings
+
+Revision ID: 3c7e2a9b41d0
+Revises: a1b2c3d4e5f6
+Create Date: 2026-10-18 09:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3c7e2a9b41d0'
+down_revision = 'a1b2c3d4e5f6'
+branch_labels = None
+depends_on = None
+
+QUESTION_COUNT = 50
+VALID_OPTIONS = {'A', 'B', 'C', 'D'}
+BLANK = '-'
+BATCH_SIZE = 1000
+
+
+def is_option(answer):
+    # Legacy JSON may hold lists or objects; those are stored as blanks
+    return isinstance(answer, str) and answer in VALID_OPTIONS
+
+
+def pack_answer_key(answers):
+    if not answers or not isinstance(answers, list):
+        return None
+    return ''.join(
+        answers[i] if i < len(answers) and is_option(answers[i]) else BLANK
+        for i in range(QUESTION_COUNT)
+    )
+
+
+def pack_user_answers(user_answers):
+    if not isinstance(user_answers, dict):
+        user_answers = {}
+    return ''.join(
+        answer if is_option(answer) else BLANK
+        for answer in (user_answers.get(str(q)) for q in range(1, QUESTION_COUNT + 1))
+    )
+
+
+def unpack_answer_key(answer_key):
+    return list(answer_key) if answer_key else []
+
+
+def unpack_user_answers(answer_sheet):
+    if not answer_sheet:
+        return {}
+    return {str(i + 1): answer for i, answer in enumerate(answer_sheet) if answer != BLANK}
+
+
+def convert(table_name, source, target, transform):
+    """Copy every row's source column into target through transform, in batches"""
+    connection = op.get_bind()
+    table = sa.table(table_name, sa.column('id', sa.Integer()), source, target)
+    update = table.update().where(table.c.id == sa.bindparam('row_id')).values(
+        {target.name: sa.bindparam('value')}
+    )
+
+    last_id = 0
+    while True:
+        rows = connection.execute(
+            sa.select(table.c.id, table.c[source.name])
+            .where(table.c.id > last_id)
+            .order_by(table.c.id)
+            .limit(BATCH_SIZE)
+        ).fetchall()
+        if not rows:
+            break
+        connection.execute(update, [{'row_id': row[0], 'value': transform(row[1])} for row in rows])
+        last_id = rows[-1][0]
+
+
+def upgrade():
+    op.add_column('exam', sa.Column('answer_key', sa.String(length=QUESTION_COUNT), nullable=True))
+    op.add_column('exam_attempt', sa.Column('answer_sheet', sa.String(length=QUESTION_COUNT), nullable=True))
+
+    convert('exam', sa.column('answers', sa.JSON()),
+            sa.column('answer_key', sa.String()), pack_answer_key)
+    convert('exam_attempt', sa.column('user_answers', sa.JSON()),
+            sa.column('answer_sheet', sa.String()), pack_user_answers)
+
+    # SQLite cannot drop columns in place, so use batch mode
+    with op.batch_alter_table('exam') as batch_op:
+        batch_op.drop_column('answers')
+    with op.batch_alter_table('exam_attempt') as batch_op:
+        batch_op.drop_column('user_answers')
+
+
+def downgrade():
+    op.add_column('exam', sa.Column('answers', sa.JSON(), nullable=True))
+    op.add_column('exam_attempt', sa.Column('user_answers', sa.JSON(), nullable=True))
+
+    convert('exam', sa.column('answer_key', sa.String()),
+            sa.column('answers', sa.JSON()), unpack_answer_key)
+    convert('exam_attempt', sa.column('answer_sheet', sa.String()),
+            sa.column('user_answers', sa.JSON()), unpack_user_answers)
+
+    with op.batch_alter_table('exam') as batch_op:
+        batch_op.drop_column('answer_key')
+    with op.batch_alter_table('exam_attempt') as batch_op:
+        batch_op.drop_column('answer_sheet')
@@ -0,0 +1,39 @@
+"""Add case-insensitive unique indexes for login lookups
+
+Revision ID: 4e8b2c6d9a17
+Revises: b5e93a0d6c12
+Create Date: 2026-10-18 14:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '4e8b2c6d9a17'
+down_revision = 'b5e93a0d6c12'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Accounts that differ only by case would make the unique indexes fail; report them instead
+    connection = op.get_bind()
+    for column in ('username', 'email'):
+        duplicates = connection.execute(sa.text(
+            f'SELECT lower({column}) FROM "user" GROUP BY lower({column}) HAVING count(*) > 1'
+        )).scalars().all()
+        if duplicates:
+            raise RuntimeError(
+                f"Cannot add a case-insensitive unique index on user.{column}: "
+                f"these values are used by more than one account: {', '.join(duplicates)}"
+            )
+
+    # Login looks users up by lower(username) or lower(email)
+    op.create_index('ix_user_username_lower', 'user', [sa.text('lower(username)')], unique=True)
+    op.create_index('ix_user_email_lower', 'user', [sa.text('lower(email)')], unique=True)
+
+
+def downgrade():
+    op.drop_index('ix_user_email_lower', table_name='user')
+    op.drop_index('ix_user_username_lower', table_name='user')
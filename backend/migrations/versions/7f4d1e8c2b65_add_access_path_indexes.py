@@ -0,0 +1,34 @@
+"""Add indexes for exam and exam_attempt access paths
+
+Revision ID: 7f4d1e8c2b65
+Revises: 3c7e2a9b41d0
+Create Date: 2026-10-18 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '7f4d1e8c2b65'
+down_revision = '3c7e2a9b41d0'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Attempt history ordered by created_at, paginated on (created_at, id)
+    op.create_index('ix_exam_attempt_user_created', 'exam_attempt', ['user_id', 'created_at', 'id'])
+    # Latest attempt per (user, exam)
+    op.create_index('ix_exam_attempt_user_exam_created', 'exam_attempt', ['user_id', 'exam_id', 'created_at'])
+    # Per-exam scans and deletes
+    op.create_index('ix_exam_attempt_exam_id', 'exam_attempt', ['exam_id'])
+    # Active exam listings ordered by created_at
+    op.create_index('ix_exam_active_created', 'exam', ['is_active', 'created_at'])
+
+
+def downgrade():
+    op.drop_index('ix_exam_active_created', table_name='exam')
+    op.drop_index('ix_exam_attempt_exam_id', table_name='exam_attempt')
+    op.drop_index('ix_exam_attempt_user_exam_created', table_name='exam_attempt')
+    op.drop_index('ix_exam_attempt_user_created', table_name='exam_attempt')
@@ -0,0 +1,28 @@
+"""Add submission_id to exam attempts for write-behind submissions
+
+Revision ID: 8d3f6b1a2c47
+Revises: 4e8b2c6d9a17
+Create Date: 2026-10-18 16:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8d3f6b1a2c47'
+down_revision = '4e8b2c6d9a17'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('exam_attempt', sa.Column('submission_id', sa.String(length=36), nullable=True))
+    # Replaying a submission journal skips attempts that were already written
+    op.create_index('ix_exam_attempt_submission_id', 'exam_attempt', ['submission_id'], unique=True)
+
+
+def downgrade():
+    op.drop_index('ix_exam_attempt_submission_id', table_name='exam_attempt')
+    with op.batch_alter_table('exam_attempt') as batch_op:
+        batch_op.drop_column('submission_id')
@@ -0,0 +1,75 @@
+"""Add incrementally maintained exam statistics tables
+
+Revision ID: b5e93a0d6c12
+Revises: 7f4d1e8c2b65
+Create Date: 2026-10-18 11:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b5e93a0d6c12'
+down_revision = '7f4d1e8c2b65'
+branch_labels = None
+depends_on = None
+
+QUESTION_COUNT = 50
+
+
+def upgrade():
+    op.create_table('exam_stats',
+    sa.Column('exam_id', sa.Integer(), nullable=False),
+    sa.Column('attempt_count', sa.Integer(), nullable=False),
+    sa.Column('score_sum', sa.BigInteger(), nullable=False),
+    sa.Column('score_sq_sum', sa.BigInteger(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['exam_id'], ['exam.id'], ),
+    sa.PrimaryKeyConstraint('exam_id')
+    )
+    op.create_table('exam_score_bucket',
+    sa.Column('exam_id', sa.Integer(), nullable=False),
+    sa.Column('score', sa.Integer(), autoincrement=False, nullable=False),
+    sa.Column('count', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['exam_id'], ['exam.id'], ),
+    sa.PrimaryKeyConstraint('exam_id', 'score')
+    )
+    op.create_table('exam_question_stat',
+    sa.Column('exam_id', sa.Integer(), nullable=False),
+    sa.Column('question_number', sa.Integer(), autoincrement=False, nullable=False),
+    sa.Column('correct_count', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['exam_id'], ['exam.id'], ),
+    sa.PrimaryKeyConstraint('exam_id', 'question_number')
+    )
+
+    # Backfill from existing attempts with set-based SQL that runs on SQLite and PostgreSQL
+    op.execute("""
+        INSERT INTO exam_stats (exam_id, attempt_count, score_sum, score_sq_sum, updated_at)
+        SELECT exam_id, COUNT(*), SUM(COALESCE(score, 0)),
+               SUM(COALESCE(score, 0) * COALESCE(score, 0)), CURRENT_TIMESTAMP
+        FROM exam_attempt
+        GROUP BY exam_id
+    """)
+    op.execute("""
+        INSERT INTO exam_score_bucket (exam_id, score, count)
+        SELECT exam_id, COALESCE(score, 0), COUNT(*)
+        FROM exam_attempt
+        GROUP BY exam_id, COALESCE(score, 0)
+    """)
+    for question in range(1, QUESTION_COUNT + 1):
+        op.execute(f"""
+            INSERT INTO exam_question_stat (exam_id, question_number, correct_count)
+            SELECT a.exam_id, {question}, COUNT(*)
+            FROM exam_attempt a
+            JOIN exam e ON e.id = a.exam_id
+            WHERE SUBSTR(e.answer_key, {question}, 1) IN ('A', 'B', 'C', 'D')
+              AND SUBSTR(a.answer_sheet, {question}, 1) = SUBSTR(e.answer_key, {question}, 1)
+            GROUP BY a.exam_id
+        """)
+
+
+def downgrade():
+    op.drop_table('exam_question_stat')
+    op.drop_table('exam_score_bucket')
+    op.drop_table('exam_stats')
@@ -12,17 +12,34 @@ Commands:
   activate <username>                          - Activate user account
   deactivate <username>                        - Deactivate user account
   stats                                        - Show system statistics
+  grade-batch <exam_id> <csv_file>             - Grade paper answer sheets from a CSV
+                                                 (columns: username, Q1..Q50)
+  rebuild-stats [exam_id]                      - Rebuild exam statistics from all attempts
+  item-analysis <exam_id>                      - Show difficulty/discrimination per question
+  export-attempts <exam_id> <file> [format]    - Export all attempts on an exam
+                                                 (format: csv or ndjson, default csv)
+  import-exams <file> <admin_username>         - Import exams from a CSV or JSON file
+                                                 (CSV columns: title, description, Q1..Q50)
+  import-users <csv_file> [workers]            - Create student accounts from a CSV
+                                                 (columns: username, email, password)
 """
 
 import sys
 import os
-from werkzeug.security import generate_password_hash
+import csv
+import time
 
 # Add the parent directory to the path so we can import from app
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from app import create_app, db
 from app.models.user import User
+from app.models.exam import Exam
+from app.services.password_hasher import password_hasher
+
+def find_user(username):
+    """Look up a user by username, ignoring case like login does"""
+    return User.query.filter(db.func.lower(User.username) == username.lower()).first()
 
 def create_first_admin(username, email, password):
     """Create the first admin user"""
@@ -37,7 +54,7 @@ def create_first_admin(username, email, password):
         
         # Check if user already exists
         existing_user = User.query.filter(
-            (User.username == username) | (User.email == email)
+            (db.func.lower(User.username) == username.lower()) | (db.func.lower(User.email) == email.lower())
         ).first()
         
         if existing_user:
@@ -45,7 +62,7 @@ def create_first_admin(username, email, password):
             return False
         
         # Create admin user
-        password_hash = generate_password_hash(password)
+        password_hash = password_hasher.hash(password)
         admin_user = User(
             username=username,
             email=email,
@@ -72,7 +89,7 @@ def make_user_admin(username):
     app = create_app()
     
     with app.app_context():
-        user = User.query.filter_by(username=username).first()
+        user = find_user(username)
         if not user:
             print(f"❌ User '{username}' not found")
             return False
@@ -96,7 +113,7 @@ def remove_user_admin(username):
     app = create_app()
     
     with app.app_context():
-        user = User.query.filter_by(username=username).first()
+        user = find_user(username)
         if not user:
             print(f"❌ User '{username}' not found")
             return False
@@ -161,7 +178,7 @@ def activate_user(username):
     app = create_app()
     
     with app.app_context():
-        user = User.query.filter_by(username=username).first()
+        user = find_user(username)
         if not user:
             print(f"❌ User '{username}' not found")
             return False
@@ -185,7 +202,7 @@ def deactivate_user(username):
     app = create_app()
     
     with app.app_context():
-        user = User.query.filter_by(username=username).first()
+        user = find_user(username)
         if not user:
             print(f"❌ User '{username}' not found")
             return False
@@ -221,6 +238,248 @@ def show_stats():
         print(f"Admin Users:     {admin_users}")
         print(f"Regular Users:   {total_users - admin_users}")
 
+def grade_batch(exam_id, csv_file):
+    """Grade a CSV of paper answer sheets for one exam"""
+    from app.services.grading_service import GradingService
+    from app.utils.answer_codec import QUESTION_COUNT
+    
+    try:
+        with open(csv_file, newline='') as f:
+            reader = csv.DictReader(f)
+            sheets = []
+            for row in reader:
+                answers = {}
+                for q in range(1, QUESTION_COUNT + 1):
+                    answer = (row.get(f'Q{q}') or row.get(str(q)) or '').strip().upper()
+                    if answer:
+                        answers[str(q)] = answer
+                sheets.append({'username': (row.get('username') or '').strip(), 'answers': answers})
+    except OSError as e:
+        print(f"❌ Could not read '{csv_file}': {str(e)}")
+        return False
+    
+    if not sheets:
+        print(f"❌ No answer sheets found in '{csv_file}'")
+        return False
+    
+    app = create_app()
+    
+    with app.app_context():
+        exam = Exam.query.get(exam_id)
+        if not exam:
+            print(f"❌ Exam {exam_id} not found")
+            return False
+        
+        if not exam.answer_key:
+            print(f"❌ Exam {exam_id} has no answers configured")
+            return False
+        
+        try:
+            results, errors, timing = GradingService.grade_batch(exam, sheets)
+        except Exception as e:
+            db.session.rollback()
+            print(f"❌ Failed to grade answer sheets: {str(e)}")
+            return False
+        
+        print(f"\n📝 Graded Sheets for '{exam.title}' ({len(results)} graded):")
+        print("-" * 50)
+        print(f"{'Row':<6} {'Username':<20} {'Score':<8} {'Percent'}")
+        print("-" * 50)
+        
+        for result in results:
+            username = sheets[result['index']]['username']
+            print(f"{result['index'] + 2:<6} {username:<20} {result['score']:<8} {result['score_percentage']}%")
+        
+        for error in errors:
+            print(f"⚠️  Row {error['index'] + 2}: {error['error']}")
+        
+        print("-" * 50)
+        print(f"Grading:    {timing['grading_ms']} ms")
+        print(f"Writing:    {timing['write_ms']} ms")
+        print(f"Throughput: {timing['sheets_per_second']} sheets/s")
+        return not errors
+
+def rebuild_stats(exam_id=None):
+    """Rebuild the per-exam statistics tables from scratch"""
+    from app.services.exam_stats_service import ExamStatsService
+    
+    app = create_app()
+    
+    with app.app_context():
+        if exam_id is not None:
+            exam_ids = [exam_id]
+        else:
+            exam_ids = [row.id for row in db.session.query(Exam.id).order_by(Exam.id)]
+        
+        if not exam_ids:
+            print("No exams found")
+            return True
+        
+        print(f"\n📊 Rebuilding Exam Statistics ({len(exam_ids)} exams):")
+        print("-" * 40)
+        
+        for current_id in exam_ids:
+            try:
+                attempts = ExamStatsService.rebuild(current_id)
+            except Exception as e:
+                db.session.rollback()
+                print(f"❌ Failed to rebuild statistics for exam {current_id}: {str(e)}")
+                return False
+            
+            if attempts is None:
+                print(f"❌ Exam {current_id} not found")
+                return False
+            print(f"✅ Exam {current_id}: {attempts} attempts")
+        
+        return True
+
+def item_analysis(exam_id):
+    """Print classical item analysis for an exam"""
+    from app.services.item_analysis_service import ItemAnalysisService
+    
+    app = create_app()
+    
+    with app.app_context():
+        analysis = ItemAnalysisService.analyze(exam_id)
+        if analysis is None:
+            print(f"❌ Exam {exam_id} not found")
+            return False
+        
+        def fmt(value):
+            return f"{value:.3f}" if value is not None else "-"
+        
+        print(f"\n🔍 Item Analysis for Exam {exam_id} ({analysis['attempt_count']} attempts):")
+        print("-" * 78)
+        print(f"{'Q':<4} {'Key':<4} {'p':<7} {'r_pb':<7} {'r_rest':<7} {'A':<7} {'B':<7} {'C':<7} {'D':<7} {'Blank'}")
+        print("-" * 78)
+        
+        for item in analysis['items']:
+            counts = item['option_counts']
+            print(
+                f"{item['question_number']:<4} {item['correct_answer'] or '-':<4} "
+                f"{fmt(item['p_value']):<7} {fmt(item['point_biserial']):<7} {fmt(item['point_biserial_corrected']):<7} "
+                f"{counts['A']:<7} {counts['B']:<7} {counts['C']:<7} {counts['D']:<7} {item['blank_count']}"
+            )
+        return True
+
+def export_attempts(exam_id, output_file, export_format='csv'):
+    """Stream every attempt on an exam to a CSV or NDJSON file"""
+    from app.services.export_service import ExportService, EXPORT_FORMATS
+    
+    if export_format not in EXPORT_FORMATS:
+        print(f"❌ Invalid format '{export_format}'. Must be one of: {', '.join(EXPORT_FORMATS)}")
+        return False
+    
+    app = create_app()
+    
+    with app.app_context():
+        exam = Exam.query.get(exam_id)
+        if not exam:
+            print(f"❌ Exam {exam_id} not found")
+            return False
+        
+        try:
+            with open(output_file, 'w', newline='') as f:
+                for block in ExportService.iter_export(exam_id, export_format):
+                    f.write(block)
+        except OSError as e:
+            print(f"❌ Could not write '{output_file}': {str(e)}")
+            return False
+        
+        print(f"✅ Exported attempts for '{exam.title}' to {output_file}")
+        return True
+
+def import_exams(import_file, admin_username):
+    """Create exams from a CSV or JSON file of answer keys"""
+    import json
+    from app.services.exam_import_service import ExamImportService
+    
+    try:
+        with open(import_file, newline='') as f:
+            if import_file.lower().endswith('.json'):
+                data = json.load(f)
+                exams = data.get('exams') if isinstance(data, dict) else data
+            else:
+                exams = ExamImportService.parse_csv(f.read())
+    except (OSError, ValueError) as e:
+        print(f"❌ Could not read '{import_file}': {str(e)}")
+        return False
+    
+    if not isinstance(exams, list) or not exams:
+        print(f"❌ No exams found in '{import_file}'")
+        return False
+    
+    app = create_app()
+    
+    with app.app_context():
+        admin = User.query.filter(
+            db.func.lower(User.username) == admin_username.lower(), User.is_admin.is_(True)
+        ).first()
+        if not admin:
+            print(f"❌ Admin user '{admin_username}' not found")
+            return False
+        
+        try:
+            created, errors = ExamImportService.import_exams(exams, admin.id)
+        except Exception as e:
+            db.session.rollback()
+            print(f"❌ Failed to import exams: {str(e)}")
+            return False
+        
+        for exam in created:
+            print(f"✅ Imported '{exam['title']}' (ID: {exam['id']})")
+        
+        for error in errors:
+            print(f"⚠️  Exam {error['index'] + 1}: {error['error']}")
+        
+        print(f"\n📚 Imported {len(created)} of {len(exams)} exams")
+        return not errors
+
+def import_users(csv_file, workers=None):
+    """Create student accounts from a CSV, hashing passwords in parallel"""
+    from app.services.user_import_service import UserImportService
+    
+    try:
+        with open(csv_file, newline='') as f:
+            users = UserImportService.parse_csv(f.read())
+    except OSError as e:
+        print(f"❌ Could not read '{csv_file}': {str(e)}")
+        return False
+    
+    if not users:
+        print(f"❌ No users found in '{csv_file}'")
+        return False
+    
+    app = create_app()
+    
+    with app.app_context():
+        started = time.perf_counter()
+        
+        def report(processed, total):
+            elapsed = time.perf_counter() - started
+            rate = processed / elapsed if elapsed > 0 else 0
+            print(f"\r⏳ {processed}/{total} users processed ({rate:.0f}/s)", end='', flush=True)
+        
+        try:
+            created, errors, timing = UserImportService.import_users(users, workers=workers, progress=report)
+        except Exception as e:
+            db.session.rollback()
+            print(f"\n❌ Failed to import users: {str(e)}")
+            return False
+        print()
+        
+        for error in errors[:20]:
+            print(f"⚠️  Row {error['index'] + 2}: {error['error']}")
+        if len(errors) > 20:
+            print(f"⚠️  ... and {len(errors) - 20} more rows skipped")
+        
+        print("-" * 50)
+        print(f"Created:    {created} of {len(users)} users")
+        print(f"Workers:    {timing['workers']}")
+        print(f"Time:       {timing['total_ms']} ms")
+        print(f"Throughput: {timing['users_per_second']} users/s")
+        return not errors
+
 def show_help():
     """Show help message"""
     print(__doc__)
@@ -284,6 +543,51 @@ def main():
     elif command == "stats":
         show_stats()
     
+    elif command == "grade-batch":
+        if len(sys.argv) != 4 or not sys.argv[2].isdigit():
+            print("Usage: python admin_cli.py grade-batch <exam_id> <csv_file>")
+            sys.exit(1)
+        success = grade_batch(int(sys.argv[2]), sys.argv[3])
+        sys.exit(0 if success else 1)
+    
+    elif command == "rebuild-stats":
+        if len(sys.argv) > 3 or (len(sys.argv) == 3 and not sys.argv[2].isdigit()):
+            print("Usage: python admin_cli.py rebuild-stats [exam_id]")
+            sys.exit(1)
+        exam_id = int(sys.argv[2]) if len(sys.argv) == 3 else None
+        success = rebuild_stats(exam_id)
+        sys.exit(0 if success else 1)
+    
+    elif command == "item-analysis":
+        if len(sys.argv) != 3 or not sys.argv[2].isdigit():
+            print("Usage: python admin_cli.py item-analysis <exam_id>")
+            sys.exit(1)
+        success = item_analysis(int(sys.argv[2]))
+        sys.exit(0 if success else 1)
+    
+    elif command == "export-attempts":
+        if len(sys.argv) not in (4, 5) or not sys.argv[2].isdigit():
+            print("Usage: python admin_cli.py export-attempts <exam_id> <output_file> [csv|ndjson]")
+            sys.exit(1)
+        export_format = sys.argv[4].lower() if len(sys.argv) == 5 else 'csv'
+        success = export_attempts(int(sys.argv[2]), sys.argv[3], export_format)
+        sys.exit(0 if success else 1)
+    
+    elif command == "import-exams":
+        if len(sys.argv) != 4:
+            print("Usage: python admin_cli.py import-exams <file> <admin_username>")
+            sys.exit(1)
+        success = import_exams(sys.argv[2], sys.argv[3])
+        sys.exit(0 if success else 1)
+    
+    elif command == "import-users":
+        if len(sys.argv) not in (3, 4) or (len(sys.argv) == 4 and not sys.argv[3].isdigit()):
+            print("Usage: python admin_cli.py import-users <csv_file> [workers]")
+            sys.exit(1)
+        workers = int(sys.argv[3]) if len(sys.argv) == 4 else None
+        success = import_users(sys.argv[2], workers)
+        sys.exit(0 if success else 1)
+    
     elif command == "help":
         show_help()
     
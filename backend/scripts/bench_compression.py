@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Measure response sizes, compression cost and transfer time per endpoint for each encoding.
+Usage: python scripts/bench_compression.py [link_mbit] [repeats]
+
+Seeds an in-memory database with a catalog of exams and a student with an
+attempt history, then requests each endpoint through the Flask test client
+with no compression, gzip and (when installed) brotli. For every encoding it
+reports the body size, the server time per request averaged over `repeats`
+requests (default 200) and the time to move the body over a `link_mbit` link
+(default 2 Mbit/s, a busy school Wi-Fi), which dominates the tail latency
+on slow connections.
+"""
+
+import sys
+import os
+import time
+import logging
+
+# Add the parent directory to the path so we can import from app
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import create_app, db
+from app.models.user import User
+from app.models.exam import Exam
+from app.models.exam_attempt import ExamAttempt
+from app.services.auth_service import AuthService
+from app.utils.compression import response_compressor
+
+EXAMS = 40
+ATTEMPTS = 300
+ANSWERS = ['A', 'B', 'C', 'D'] * 12 + ['A', 'B']
+
+def seed():
+    admin = User(username='bench_admin', email='bench_admin@example.com', password_hash='-', is_admin=True)
+    student = User(username='bench_student', email='bench_student@example.com', password_hash='-')
+    db.session.add_all([admin, student])
+    db.session.flush()
+    exams = [Exam(title=f'Practice Test {i + 1}', description='Benchmark exam', created_by=admin.id, answers=ANSWERS)
+             for i in range(EXAMS)]
+    db.session.add_all(exams)
+    db.session.flush()
+    for i in range(ATTEMPTS):
+        attempt = ExamAttempt(user_id=student.id, exam_id=exams[i % EXAMS].id, total_questions=50, total_marks=50,
+                              score=(i * 7) % 51, status='completed')
+        attempt.user_answers = {str(q): ANSWERS[(q + i) % 50] for q in range(1, 51)}
+        db.session.add(attempt)
+    db.session.commit()
+    return admin, student
+
+def main():
+    link_mbit = float(sys.argv[1]) if len(sys.argv) > 1 else 2.0
+    repeats = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+
+    app = create_app('testing')
+    logging.getLogger('sqlalchemy.engine').setLevel(logging.WARNING)
+    logging.getLogger('werkzeug').setLevel(logging.WARNING)
+    with app.app_context():
+        db.create_all()
+        admin, student = seed()
+        admin_headers = {'Authorization': f'Bearer {AuthService.create_token(admin)}'}
+        student_headers = {'Authorization': f'Bearer {AuthService.create_token(student)}'}
+        attempt_id = ExamAttempt.query.filter_by(user_id=student.id).first().id
+
+    endpoints = [
+        ('GET /exams (admin catalog)', '/api/exams', admin_headers),
+        ('GET /exams?include_attempts', '/api/exams?status=active&include_attempts=true', student_headers),
+        ('GET /exams/<id>/questions', '/api/exams/1/questions', student_headers),
+        ('GET /exam-attempts/<id>', f'/api/exam-attempts/{attempt_id}', student_headers),
+    ]
+    encodings = ['identity'] + list(reversed(response_compressor.encodings))
+
+    print(f"\n🗜️  Response compression ({repeats} requests each, transfer at {link_mbit:g} Mbit/s)")
+    print("-" * 88)
+    print(f"{'Endpoint':<30} {'encoding':<10} {'bytes':<9} {'ratio':<7} {'server ms':<11} {'transfer ms':<12} {'total ms'}")
+    print("-" * 88)
+    client = app.test_client()
+    for label, url, headers in endpoints:
+        identity_size = None
+        for encoding in encodings:
+            request_headers = {**headers, 'Accept-Encoding': encoding}
+            size = len(client.get(url, headers=request_headers).data)  # Also warms the caches
+            identity_size = identity_size or size
+
+            started = time.perf_counter()
+            for _ in range(repeats):
+                client.get(url, headers=request_headers)
+            server_ms = (time.perf_counter() - started) / repeats * 1000
+            transfer_ms = size * 8 / (link_mbit * 1000)
+            print(f"{label:<30} {encoding:<10} {size:<9} {size / identity_size:<7.2f} "
+                  f"{server_ms:<11.2f} {transfer_ms:<12.1f} {server_ms + transfer_ms:.1f}")
+            label = ''
+
+    print(f"\nCompressed response cache: {response_compressor.stats()}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Measure requests per second and latency for an API endpoint.
+Usage: python scripts/bench_http.py <url> [concurrency] [seconds] [token]
+
+Runs `concurrency` client threads that request the URL back to back for
+`seconds` seconds (defaults: 16 threads, 10 seconds). Pass a JWT as `token`
+for endpoints that need one. Compare the development server with gunicorn:
+
+    python run.py                                   # terminal 1
+    python scripts/bench_http.py http://localhost:5001/api/health
+
+    gunicorn -c gunicorn.conf.py wsgi:app           # terminal 1
+    python scripts/bench_http.py http://localhost:5001/api/health
+"""
+
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+
+def worker(url, headers, deadline, latencies, errors, lock):
+    local_latencies = []
+    local_errors = 0
+    while time.perf_counter() < deadline:
+        started = time.perf_counter()
+        try:
+            with urllib.request.urlopen(urllib.request.Request(url, headers=headers), timeout=30) as response:
+                response.read()
+            local_latencies.append(time.perf_counter() - started)
+        except (urllib.error.URLError, OSError):
+            local_errors += 1
+    with lock:
+        latencies.extend(local_latencies)
+        errors[0] += local_errors
+
+def percentile(sorted_values, fraction):
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * fraction))]
+
+def main():
+    if len(sys.argv) < 2:
+        print(__doc__)
+        sys.exit(1)
+
+    url = sys.argv[1]
+    concurrency = int(sys.argv[2]) if len(sys.argv) > 2 else 16
+    seconds = float(sys.argv[3]) if len(sys.argv) > 3 else 10.0
+    headers = {'Authorization': f'Bearer {sys.argv[4]}'} if len(sys.argv) > 4 else {}
+
+    latencies = []
+    errors = [0]
+    lock = threading.Lock()
+    started = time.perf_counter()
+    deadline = started + seconds
+    threads = [
+        threading.Thread(target=worker, args=(url, headers, deadline, latencies, errors, lock))
+        for _ in range(concurrency)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    print(f"\n⚡ {url} ({concurrency} clients, {elapsed:.1f}s)")
+    print("-" * 50)
+    print(f"Requests:   {len(latencies)} ok, {errors[0]} failed")
+    print(f"Throughput: {len(latencies) / elapsed:.1f} requests/s")
+    print(f"Latency:    p50 {percentile(latencies, 0.50) * 1000:.1f} ms, "
+          f"p95 {percentile(latencies, 0.95) * 1000:.1f} ms, "
+          f"p99 {percentile(latencies, 0.99) * 1000:.1f} ms")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Measure JSON serialization time per endpoint with the standard library and with orjson.
+Usage: python scripts/bench_json.py [repeats]
+
+Seeds an in-memory database with a catalog of exams and a student with a long
+attempt history, calls each endpoint once through the Flask test client to
+capture the exact object it serializes, then serializes that object `repeats`
+times (default 2000) with each backend. The stdlib column is what every
+response cost before the orjson provider; both format datetimes as ISO 8601.
+"""
+
+import sys
+import os
+import time
+import logging
+
+# Add the parent directory to the path so we can import from app
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import create_app, db
+from app.models.user import User
+from app.models.exam import Exam
+from app.models.exam_attempt import ExamAttempt
+from app.services.auth_service import AuthService
+from app.services.exam_stats_service import ExamStatsService
+from app.utils.json_provider import APIJSONProvider, orjson
+
+EXAMS = 40
+ATTEMPTS = 300
+ANSWERS = ['A', 'B', 'C', 'D'] * 12 + ['A', 'B']
+
+class CapturingProvider(APIJSONProvider):
+    """Keeps the last object serialized so it can be timed on its own"""
+    captured = None
+
+    def dump_bytes(self, obj, pretty=False):
+        CapturingProvider.captured = obj
+        return super().dump_bytes(obj, pretty)
+
+class StdlibProvider(APIJSONProvider):
+    use_orjson = False
+
+def seed():
+    admin = User(username='bench_admin', email='bench_admin@example.com', password_hash='-', is_admin=True)
+    student = User(username='bench_student', email='bench_student@example.com', password_hash='-')
+    db.session.add_all([admin, student])
+    db.session.flush()
+    exams = [Exam(title=f'Practice Test {i + 1}', description='Benchmark exam', created_by=admin.id, answers=ANSWERS)
+             for i in range(EXAMS)]
+    db.session.add_all(exams)
+    db.session.flush()
+    for i in range(ATTEMPTS):
+        exam = exams[i % EXAMS]
+        attempt = ExamAttempt(user_id=student.id, exam_id=exam.id, total_questions=50, total_marks=50,
+                              score=(i * 7) % 51, status='completed')
+        attempt.user_answers = {str(q): ANSWERS[(q + i) % 50] for q in range(1, 51)}
+        db.session.add(attempt)
+    db.session.commit()
+    ExamStatsService.rebuild(exams[0].id)
+    return admin, student
+
+def time_backend(provider, obj, repeats):
+    started = time.perf_counter()
+    for _ in range(repeats):
+        body = provider.dump_bytes(obj)
+    return (time.perf_counter() - started) / repeats * 1e6, len(body)
+
+def main():
+    repeats = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+
+    app = create_app('testing')
+    logging.getLogger('sqlalchemy.engine').setLevel(logging.WARNING)
+    logging.getLogger('werkzeug').setLevel(logging.WARNING)
+    app.json = CapturingProvider(app)
+    stdlib = StdlibProvider(app)
+    fast = APIJSONProvider(app) if orjson else None
+
+    with app.app_context():
+        db.create_all()
+        admin, student = seed()
+        admin_headers = {'Authorization': f'Bearer {AuthService.create_token(admin)}'}
+        student_headers = {'Authorization': f'Bearer {AuthService.create_token(student)}'}
+        attempt_id = ExamAttempt.query.filter_by(user_id=student.id).first().id
+
+    endpoints = [
+        ('GET /exams (admin catalog)', '/api/exams', admin_headers),
+        ('GET /exams?include_attempts', '/api/exams?status=active&include_attempts=true', student_headers),
+        ('GET /exam-attempts', '/api/exam-attempts', student_headers),
+        ('GET /exam-attempts/<id>', f'/api/exam-attempts/{attempt_id}', student_headers),
+        ('GET /exams/<id>/stats', '/api/exams/1/stats', admin_headers),
+        ('GET /exams/<id>/item-analysis', '/api/exams/1/item-analysis', admin_headers),
+    ]
+
+    print(f"\n🧾 JSON serialization per response ({repeats} runs each, orjson {'available' if orjson else 'NOT installed'})")
+    print("-" * 86)
+    print(f"{'Endpoint':<32} {'bytes':<9} {'stdlib µs':<11} {'orjson µs':<11} {'speedup'}")
+    print("-" * 86)
+    client = app.test_client()
+    for label, url, headers in endpoints:
+        CapturingProvider.captured = None
+        response = client.get(url, headers=headers)
+        if response.status_code != 200 or CapturingProvider.captured is None:
+            print(f"{label:<32} skipped (HTTP {response.status_code})")
+            continue
+        obj = CapturingProvider.captured
+
+        with app.app_context():
+            stdlib_us, size = time_backend(stdlib, obj, repeats)
+            if fast:
+                fast_us, _ = time_backend(fast, obj, repeats)
+                print(f"{label:<32} {size:<9} {stdlib_us:<11.1f} {fast_us:<11.1f} {stdlib_us / fast_us:.1f}x")
+            else:
+                print(f"{label:<32} {size:<9} {stdlib_us:<11.1f} {'-':<11} -")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Measure password verification throughput (logins per second) for each hasher setting.
+Usage: python scripts/bench_password_hashing.py [seconds_per_setting]
+
+For every setting it reports verifications per second on one core and, when
+more than one CPU is available, across a process pool with one worker per CPU.
+The configured setting (PASSWORD_HASH_SCHEME / PASSWORD_HASH_METHOD /
+BCRYPT_ROUNDS) is marked with '*'. Use the per-core figure to size workers:
+peak logins per second / logins per second per core = cores spent on login.
+"""
+
+import sys
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+# Add the parent directory to the path so we can import from app
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import Config
+from app.services.password_hasher import PasswordHasher, verify_password
+
+PASSWORD = 'Benchmark1Password'
+SETTINGS = [
+    ('werkzeug', 'scrypt', None),
+    ('werkzeug', 'pbkdf2:sha256:600000', None),
+    ('werkzeug', 'pbkdf2:sha256:260000', None),
+    ('bcrypt', None, 10),
+    ('bcrypt', None, 12),
+]
+
+def verify_many(password_hash, count):
+    for _ in range(count):
+        verify_password(password_hash, PASSWORD)
+    return count
+
+def single_core_rate(password_hash, seconds):
+    """Verifications per second on the current process"""
+    count = 0
+    started = time.perf_counter()
+    while time.perf_counter() - started < seconds:
+        verify_password(password_hash, PASSWORD)
+        count += 1
+    return count / (time.perf_counter() - started)
+
+def pool_rate(executor, workers, password_hash, per_worker):
+    """Verifications per second with every pool worker busy"""
+    started = time.perf_counter()
+    total = sum(executor.map(verify_many, [password_hash] * workers, [per_worker] * workers))
+    return total / (time.perf_counter() - started)
+
+def main():
+    seconds = float(sys.argv[1]) if len(sys.argv) > 1 else 2.0
+    workers = os.cpu_count() or 1
+    if Config.PASSWORD_HASH_SCHEME == 'bcrypt':
+        configured = ('bcrypt', None, Config.BCRYPT_ROUNDS)
+    else:
+        configured = ('werkzeug', Config.PASSWORD_HASH_METHOD, None)
+    settings = SETTINGS if configured in SETTINGS else SETTINGS + [configured]
+
+    print(f"\n🔐 Password verification benchmark ({workers} CPU{'s' if workers != 1 else ''}, {seconds:g}s per setting)")
+    print("-" * 72)
+    print(f"{'Setting':<34} {'ms/login':<10} {'logins/s/core':<15} {'logins/s (pool)'}")
+    print("-" * 72)
+
+    executor = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+    try:
+        for scheme, method, rounds in settings:
+            hasher = PasswordHasher(scheme, method or 'scrypt', rounds or 12)
+            password_hash = hasher.hash(PASSWORD)
+            rate = single_core_rate(password_hash, seconds)
+
+            pooled = '-'
+            if executor:
+                per_worker = max(1, int(rate * seconds))
+                pooled = f"{pool_rate(executor, workers, password_hash, per_worker):.1f}"
+
+            label = f"{scheme} {method}" if scheme == 'werkzeug' else f"bcrypt rounds={rounds}"
+            marker = '*' if (scheme, method, rounds) == configured else ' '
+            print(f"{marker}{label:<33} {1000 / rate:<10.1f} {rate:<15.1f} {pooled}")
+    finally:
+        if executor:
+            executor.shutdown()
+
+if __name__ == "__main__":
+    main()
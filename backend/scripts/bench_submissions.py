@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+Compare exam submission throughput under concurrent writers for SQLite engine profiles.
+Usage: python scripts/bench_submissions.py [processes] [seconds]
+
+Each profile gets a fresh SQLite database in a temporary directory with one
+exam and one student per process. Every process then submits graded exams
+through the API (Flask test client) as fast as it can for `seconds` seconds
+(defaults: 4 processes, 10 seconds), like gunicorn workers sharing one file.
+
+Profiles:
+  rollback-journal  journal_mode=DELETE, synchronous=FULL, no mmap (SQLite defaults)
+  tuned             the configured profile: WAL, synchronous=NORMAL, mmap, busy_timeout
+  pipeline-commit   tuned, with the write-behind submission pipeline waiting for its group commit
+  pipeline-journal  tuned, with the pipeline answering once the attempt is journaled
+
+Each process sends one request at a time, so pipeline-commit only shows the
+cost of waiting for a flush; its batches grow with gunicorn threads per worker.
+"""
+
+import sys
+import os
+import shutil
+import tempfile
+import time
+import multiprocessing
+
+# Add the parent directory to the path so we can import from app
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+PROFILES = [
+    ('rollback-journal', {
+        'SQLITE_JOURNAL_MODE': 'DELETE',
+        'SQLITE_SYNCHRONOUS': 'FULL',
+        'SQLITE_MMAP_SIZE': '0',
+        'SQLITE_BUSY_TIMEOUT_MS': '5000'
+    }),
+    ('tuned', {}),
+    ('pipeline-commit', {'SUBMISSION_PIPELINE_ENABLED': 'true', 'SUBMISSION_DURABILITY': 'commit'}),
+    ('pipeline-journal', {'SUBMISSION_PIPELINE_ENABLED': 'true', 'SUBMISSION_DURABILITY': 'journal'}),
+]
+ANSWERS = ['A', 'B', 'C', 'D'] * 12 + ['A', 'B']
+
+def use_profile(database_path, settings):
+    """Point the app at the profile's database; must run before the app is imported"""
+    os.environ['DATABASE_URL'] = f'sqlite:///{database_path}'
+    os.environ['SUBMISSION_JOURNAL_DIR'] = os.path.join(os.path.dirname(database_path), 'journal')
+    os.environ.update(settings)
+
+def setup(database_path, settings, processes):
+    use_profile(database_path, settings)
+    import logging
+    from app import create_app, db
+    from app.models.user import User
+    from app.models.exam import Exam
+
+    app = create_app('production')
+    logging.getLogger('sqlalchemy.engine').setLevel(logging.WARNING)
+    with app.app_context():
+        db.create_all()
+        admin = User(username='bench_admin', email='bench_admin@example.com', password_hash='-', is_admin=True)
+        db.session.add(admin)
+        db.session.flush()
+        db.session.add(Exam(title='Benchmark', created_by=admin.id, answers=ANSWERS))
+        db.session.add_all([
+            User(username=f'bench_{i}', email=f'bench_{i}@example.com', password_hash='-')
+            for i in range(processes)
+        ])
+        db.session.commit()
+
+def submit_loop(database_path, settings, worker_index, seconds, start_at, results):
+    use_profile(database_path, settings)
+    import logging
+    from app import create_app
+    from app.models.user import User
+    from app.services.auth_service import AuthService
+    from app.services.submission_pipeline import submission_pipeline
+    from app.utils.db_engine import db_stats
+
+    app = create_app('production')
+    logging.getLogger('werkzeug').setLevel(logging.WARNING)
+    logging.getLogger('sqlalchemy.engine').setLevel(logging.WARNING)
+    client = app.test_client()
+    with app.app_context():
+        user = User.query.filter_by(username=f'bench_{worker_index}').first()
+        headers = {'Authorization': f'Bearer {AuthService.create_token(user)}'}
+
+    answers = {str(q): ANSWERS[(q * 7) % 50] for q in range(1, 51)}
+    latencies = []
+    failures = 0
+    time.sleep(max(0, start_at - time.time()))
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        started = time.perf_counter()
+        response = client.post('/api/submit-graded-exam/1', json={'answers': answers}, headers=headers)
+        if response.status_code == 200:
+            latencies.append(time.perf_counter() - started)
+        else:
+            failures += 1
+
+    # Write whatever the pipeline still holds so its writes are counted
+    submission_pipeline.shutdown()
+    results.put((latencies, failures, db_stats.snapshot()))
+
+def run_profile(name, settings, processes, seconds):
+    directory = tempfile.mkdtemp(prefix='bench_submissions_')
+    database_path = os.path.join(directory, f'{name}.db')
+    context = multiprocessing.get_context('spawn')
+
+    # Build the schema in a child so this process never imports the app with another profile
+    setup_process = context.Process(target=setup, args=(database_path, settings, processes))
+    setup_process.start()
+    setup_process.join()
+
+    results = context.Queue()
+    start_at = time.time() + 3  # Let every worker finish importing before the clock starts
+    workers = [
+        context.Process(target=submit_loop, args=(database_path, settings, i, seconds, start_at, results))
+        for i in range(processes)
+    ]
+    for worker in workers:
+        worker.start()
+    collected = [results.get() for _ in workers]
+    for worker in workers:
+        worker.join()
+    shutil.rmtree(directory, ignore_errors=True)
+
+    latencies = sorted(latency for result in collected for latency in result[0])
+    failures = sum(result[1] for result in collected)
+    writes = sum(result[2]['writes'] for result in collected)
+    write_ms = sum((result[2]['write_ms_avg'] or 0) * result[2]['writes'] for result in collected)
+    lock_errors = sum(result[2]['lock_errors'] for result in collected)
+
+    def percentile(fraction):
+        return latencies[min(len(latencies) - 1, int(len(latencies) * fraction))] * 1000 if latencies else 0.0
+
+    print(f"{name:<18} {len(latencies) / seconds:<12.1f} {percentile(0.5):<9.1f} {percentile(0.95):<9.1f} "
+          f"{(write_ms / writes if writes else 0):<13.2f} {failures:<9} {lock_errors}")
+
+def main():
+    processes = int(sys.argv[1]) if len(sys.argv) > 1 else 4
+    seconds = float(sys.argv[2]) if len(sys.argv) > 2 else 10.0
+
+    print(f"\n📝 Submission throughput, {processes} writer processes, {seconds:g}s per profile")
+    print("-" * 80)
+    print(f"{'Profile':<18} {'submits/s':<12} {'p50 ms':<9} {'p95 ms':<9} {'write ms avg':<13} {'failed':<9} {'lock errors'}")
+    print("-" * 80)
+    for name, settings in PROFILES:
+        run_profile(name, settings, processes, seconds)
+
+if __name__ == "__main__":
+    main()
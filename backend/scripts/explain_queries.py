@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Show the query plan for each hot route query and check it uses the expected index.
+Usage: python scripts/explain_queries.py
+
+Runs against DATABASE_URL (SQLite or PostgreSQL) after `flask db upgrade`.
+PostgreSQL prefers sequential scans on small tables, so run it against a
+populated database or let the script disable seqscan for the session.
+"""
+
+import sys
+import os
+from datetime import datetime, timezone
+
+# Add the parent directory to the path so we can import from app
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import and_, delete, func, or_, text
+from app import create_app, db
+from app.models.exam_attempt import ExamAttempt
+from app.models.user import User
+
+def route_queries():
+    """(route, acceptable indexes, statement) for each hot query, mirroring the route code"""
+    from app.routes.exams import catalog_query, catalog_page
+
+    user_id, exam_id = 1, 1
+    cursor_time = datetime.now(timezone.utc)
+    history = ExamAttempt.query.filter_by(user_id=user_id).order_by(
+        ExamAttempt.created_at.desc(), ExamAttempt.id.desc()
+    )
+    # Either composite index leading with user_id serves a plain per-user filter
+    user_indexes = ('ix_exam_attempt_user_created', 'ix_exam_attempt_user_exam_created')
+
+    return [
+        ('GET /exam-attempts (first page)', ('ix_exam_attempt_user_created',), history.limit(21).statement),
+        ('GET /exam-attempts?after=...', ('ix_exam_attempt_user_created',), history.filter(or_(
+            ExamAttempt.created_at < cursor_time,
+            and_(ExamAttempt.created_at == cursor_time, ExamAttempt.id < 100)
+        )).limit(21).statement),
+        ('GET /exam-attempts (validator)', user_indexes, db.session.query(
+            func.count(ExamAttempt.id), func.max(ExamAttempt.updated_at)
+        ).filter(ExamAttempt.user_id == user_id).statement),
+        ('GET /exams?include_attempts=true', ('ix_exam_attempt_user_exam_created',), catalog_query(
+            active=True, attempts_of=user_id
+        ).statement),
+        ('GET /exams?status=active', ('ix_exam_active_created',), catalog_query(active=True).statement),
+        ('GET /exams?status=active&page=2', ('ix_exam_active_created',), catalog_page(
+            catalog_query(active=True), page=2, per_page=20
+        ).statement),
+        ('DELETE /exams/<id> (attempts)', ('ix_exam_attempt_exam_id',), delete(ExamAttempt).where(
+            ExamAttempt.exam_id == exam_id
+        )),
+        ('POST /login (username)', ('ix_user_username_lower',), User.query.filter(
+            func.lower(User.username) == 'student'
+        ).limit(1).statement),
+        ('POST /login (email)', ('ix_user_email_lower',), User.query.filter(
+            func.lower(User.email) == 'student@example.com'
+        ).limit(1).statement),
+    ]
+
+def explain_all():
+    app = create_app()
+
+    with app.app_context():
+        dialect = db.engine.dialect
+        if dialect.name == 'sqlite':
+            prefix = 'EXPLAIN QUERY PLAN '
+        elif dialect.name == 'postgresql':
+            prefix = 'EXPLAIN '
+            db.session.execute(text('SET enable_seqscan = off'))
+        else:
+            print(f"❌ Unsupported database: {dialect.name}")
+            return False
+
+        all_ok = True
+        for route, expected_indexes, statement in route_queries():
+            sql = str(statement.compile(dialect=dialect, compile_kwargs={'literal_binds': True}))
+            plan = '\n'.join(' '.join(str(col) for col in row) for row in db.session.execute(text(prefix + sql)))
+            ok = any(index in plan for index in expected_indexes)
+            all_ok = all_ok and ok
+
+            print(f"\n{'✅' if ok else '❌'} {route} (expects {' or '.join(expected_indexes)})")
+            print("-" * 80)
+            print(plan)
+
+        db.session.rollback()
+        print()
+        print("✅ All queries use their indexes" if all_ok else "❌ Some queries do not use their expected index")
+        return all_ok
+
+if __name__ == "__main__":
+    sys.exit(0 if explain_all() else 1)
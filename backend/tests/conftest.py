@@ -0,0 +1,73 @@
+import logging
+import pytest
+from sqlalchemy import event
+from app import create_app, db
+from app.models.user import User
+from app.services.auth_service import AuthService
+
+class StatementCounter:
+    """Records every SQL statement and commit sent to the database while it is listening"""
+
+    def __init__(self):
+        self.statements = []
+        self.commits = 0
+
+    def __call__(self, conn, cursor, statement, parameters, context, executemany):
+        self.statements.append(statement)
+
+    def on_commit(self, conn):
+        self.commits += 1
+
+    def clear(self):
+        self.statements.clear()
+        self.commits = 0
+
+    @property
+    def count(self):
+        return len(self.statements)
+
+    def writes(self):
+        """INSERT, UPDATE and DELETE statements, in the order they ran"""
+        return [s for s in self.statements if s.lstrip().split(None, 1)[0].upper() in ('INSERT', 'UPDATE', 'DELETE')]
+
+@pytest.fixture
+def app():
+    app = create_app('testing')
+    logging.getLogger('sqlalchemy.engine').setLevel(logging.WARNING)
+    logging.getLogger('werkzeug').setLevel(logging.WARNING)
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+@pytest.fixture
+def statements(app):
+    counter = StatementCounter()
+    event.listen(db.engine, 'before_cursor_execute', counter)
+    event.listen(db.engine, 'commit', counter.on_commit)
+    yield counter
+    event.remove(db.engine, 'before_cursor_execute', counter)
+    event.remove(db.engine, 'commit', counter.on_commit)
+
+@pytest.fixture
+def make_user(app):
+    """Create a user and return the headers that authenticate as them"""
+    def make_user(username, is_admin=False):
+        user = User(username=username, email=f'{username}@example.com', password_hash='-', is_admin=is_admin)
+        db.session.add(user)
+        db.session.commit()
+        return {'Authorization': f'Bearer {AuthService.create_token(user)}'}
+    return make_user
+
+@pytest.fixture
+def admin_headers(make_user):
+    return make_user('admin', is_admin=True)
+
+@pytest.fixture
+def student_headers(make_user):
+    return make_user('student')
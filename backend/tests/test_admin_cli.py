@@ -0,0 +1,52 @@
+"""
+admin_cli account commands find users by username regardless of case, the
+same way login does.
+"""
+
+import pytest
+from app import db
+from app.models.user import User
+from scripts import admin_cli
+
+@pytest.fixture
+def cli(app, monkeypatch):
+    monkeypatch.setattr(admin_cli, 'create_app', lambda: app)
+    return admin_cli
+
+def student():
+    return db.session.query(User.is_admin, User.is_active).filter_by(username='student').one()
+
+def test_account_commands_ignore_username_case(cli, make_user):
+    make_user('student')
+
+    assert cli.make_user_admin('STUDENT')
+    assert student() == (True, True)
+    assert cli.deactivate_user('Student')
+    assert student() == (True, False)
+    assert cli.activate_user('sTuDeNt')
+    assert student() == (True, True)
+    assert cli.remove_user_admin('STUDENT')
+    assert student() == (False, True)
+
+def test_unknown_user_is_reported(cli, make_user, capsys):
+    make_user('student')
+    assert not cli.make_user_admin('students')
+    assert "User 'students' not found" in capsys.readouterr().out
+
+@pytest.mark.parametrize('username, email', [
+    ('STUDENT', 'new@example.com'),
+    ('newadmin', 'Student@Example.COM'),
+])
+def test_first_admin_cannot_reuse_a_username_or_email(cli, make_user, capsys, username, email):
+    make_user('student')
+    assert not cli.create_first_admin(username, email, 'Passw0rd!x')
+    # Reported by the duplicate check, before hashing and the insert
+    assert 'already exists' in capsys.readouterr().out
+    assert User.query.count() == 1
+
+def test_first_admin_is_created_once(cli, make_user, monkeypatch):
+    monkeypatch.setattr(admin_cli.password_hasher, 'hash', lambda password: '-')
+    make_user('student')
+    assert cli.create_first_admin('Head', 'head@example.com', 'Passw0rd!x')
+    assert User.query.filter_by(username='Head').one().is_admin
+    assert not cli.create_first_admin('deputy', 'deputy@example.com', 'Passw0rd!x')
@@ -0,0 +1,33 @@
+import importlib.util
+from pathlib import Path
+import pytest
+from app.utils.answer_codec import encode_answer_key, encode_user_answers
+
+ANSWER_KEY = ['A', 'B', 'C', 'D'] * 12 + ['A', 'B']
+MALFORMED_ANSWERS = [['A'], {'option': 'A'}, 1, None, 'a', 'AB']
+
+def load_pack_migration():
+    path = next(Path(__file__).parent.parent.glob('migrations/versions/3c7e2a9b41d0_*.py'))
+    spec = importlib.util.spec_from_file_location('pack_migration', path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+@pytest.mark.parametrize('encode', [encode_user_answers, load_pack_migration().pack_user_answers])
+def test_non_option_answers_are_blank(encode):
+    sheet = encode({'1': 'A', **{str(q): answer for q, answer in enumerate(MALFORMED_ANSWERS, start=2)}})
+    assert sheet == 'A' + '-' * 49
+
+def test_answer_key_with_malformed_entries_packs_blanks():
+    assert encode_answer_key(['A', ['B'], 'C']) == 'A-C' + '-' * 47
+    assert load_pack_migration().pack_answer_key(['A', ['B'], 'C']) == 'A-C' + '-' * 47
+
+def test_submission_with_list_answer_scores_it_wrong(client, admin_headers, student_headers):
+    exam_id = client.post('/api/exams', json={'title': 'Practice Test 1', 'answers': ANSWER_KEY},
+                          headers=admin_headers).json['exam']['id']
+    answers = {str(q): ANSWER_KEY[q - 1] for q in range(1, 51)}
+    answers['1'] = ['A']
+
+    response = client.post(f'/api/submit-graded-exam/{exam_id}', json={'answers': answers}, headers=student_headers)
+    assert response.status_code == 200, response.json
+    assert response.json['score'] == 49
@@ -0,0 +1,80 @@
+"""
+Keyset pagination of the attempt history on (created_at, id), newest first.
+"""
+
+from datetime import datetime
+import pytest
+from app import db
+from app.models.exam import Exam
+from app.models.exam_attempt import ExamAttempt
+from app.models.user import User
+
+ANSWER_KEY = ['A', 'B', 'C', 'D'] * 12 + ['A', 'B']
+SAME_TIME = datetime(2026, 3, 1, 9, 0, 0)
+
+@pytest.fixture
+def attempt_ids(client, admin_headers, student_headers):
+    """Seven attempts of the student, newest first; the middle five share a created_at"""
+    exam_id = client.post('/api/exams', json={'title': 'Practice Test 1', 'answers': ANSWER_KEY},
+                          headers=admin_headers).json['exam']['id']
+    student = User.query.filter_by(username='student').first()
+    created = [datetime(2026, 3, 1, 8, 0, 0)] + [SAME_TIME] * 5 + [datetime(2026, 3, 1, 10, 0, 0)]
+    attempts = [
+        ExamAttempt(user_id=student.id, exam_id=exam_id, total_questions=50, total_marks=50, score=score,
+                    status='completed', created_at=created_at, completed_at=created_at)
+        for score, created_at in enumerate(created)
+    ]
+    db.session.add_all(attempts)
+    db.session.commit()
+    return [attempt.id for attempt in sorted(attempts, key=lambda a: (a.created_at, a.id), reverse=True)]
+
+def page(client, headers, **params):
+    response = client.get('/api/exam-attempts', query_string=params, headers=headers)
+    assert response.status_code == 200, response.json
+    return response.json
+
+def test_pages_split_attempts_sharing_a_created_at(client, student_headers, attempt_ids):
+    seen, after = [], None
+    for expected_more in (True, True, True, False):
+        params = {'limit': 2, **({'after': after} if after else {})}
+        body = page(client, student_headers, **params)
+        seen += [attempt['id'] for attempt in body['exam_attempts']]
+        assert body['has_more'] is expected_more
+        after = body['next_cursor']
+    # No attempt is skipped or repeated where a page boundary falls between equal timestamps
+    assert seen == attempt_ids
+
+def test_last_page_has_no_cursor(client, student_headers, attempt_ids):
+    body = page(client, student_headers, limit=len(attempt_ids))
+    assert [attempt['id'] for attempt in body['exam_attempts']] == attempt_ids
+    assert body['has_more'] is False
+    assert body['next_cursor'] is None
+
+    # A full page followed by an empty one is still the last page
+    body = page(client, student_headers, limit=len(attempt_ids) - 1)
+    assert body['has_more'] is True
+    body = page(client, student_headers, limit=len(attempt_ids) - 1, after=body['next_cursor'])
+    assert [attempt['id'] for attempt in body['exam_attempts']] == attempt_ids[-1:]
+    assert (body['has_more'], body['next_cursor']) == (False, None)
+
+def test_all_returns_the_whole_history(client, student_headers, attempt_ids):
+    body = page(client, student_headers, all='true', limit=1)
+    assert [attempt['id'] for attempt in body['exam_attempts']] == attempt_ids
+    assert (body['has_more'], body['next_cursor']) == (False, None)
+
+def test_limit_is_clamped(client, student_headers, attempt_ids):
+    assert len(page(client, student_headers, limit=0)['exam_attempts']) == 1
+    assert len(page(client, student_headers, limit=1000)['exam_attempts']) == len(attempt_ids)
+
+@pytest.mark.parametrize('params, error', [
+    ({'limit': 'ten'}, 'Invalid limit'),
+    ({'after': 'not-a-cursor'}, 'Invalid cursor'),
+    ({'after': 'MjAyNi0wMy0wMVQwOTowMDowMA'}, 'Invalid cursor'),  # A timestamp without an id
+])
+def test_invalid_parameters_get_400(client, student_headers, attempt_ids, params, error):
+    response = client.get('/api/exam-attempts', query_string=params, headers=student_headers)
+    assert response.status_code == 400
+    assert response.json == {'error': error}
+
+def test_history_is_per_user(client, make_user, attempt_ids):
+    assert page(client, make_user('other'))['exam_attempts'] == []
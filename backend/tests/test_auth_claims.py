@@ -0,0 +1,39 @@
+from app import db
+from app.models.user import User
+from app.services.user_state import user_state
+
+def user_table_reads(statements):
+    return [s for s in statements.statements if 'FROM user' in s]
+
+def test_catalog_reads_authorize_from_token_claims(client, statements, admin_headers, student_headers):
+    client.get('/api/exams', headers=student_headers)  # Loads the revocation snapshot
+
+    statements.clear()
+    for headers in (student_headers, admin_headers, student_headers):
+        assert client.get('/api/exams', headers=headers).status_code == 200
+        assert client.get('/api/exams/cache-stats', headers=headers).status_code == (200 if headers is admin_headers else 403)
+    assert user_table_reads(statements) == []
+
+def test_deactivation_and_admin_removal_revoke_tokens(client, admin_headers, student_headers):
+    user_state.ttl = 0
+    try:
+        admin = User.query.filter_by(username='admin').first()
+        admin.is_admin = False
+        db.session.commit()
+        assert client.get('/api/exams/cache-stats', headers=admin_headers).status_code == 401
+
+        student = User.query.filter_by(username='student').first()
+        student.is_active = False
+        db.session.commit()
+        assert client.get('/api/exams', headers=student_headers).status_code == 401
+    finally:
+        user_state.ttl = 10
+
+def test_revocation_snapshot_is_one_query_per_ttl(client, statements, make_user):
+    headers = [make_user(f'student{i}') for i in range(5)]
+    user_state.clear()
+
+    statements.clear()
+    for user_headers in headers:
+        assert client.get('/api/exams', headers=user_headers).status_code == 200
+    assert len(user_table_reads(statements)) == 1
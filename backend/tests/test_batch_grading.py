@@ -0,0 +1,17 @@
+ANSWER_KEY = ['A', 'B', 'C', 'D'] * 12 + ['A', 'B']
+
+def test_batch_grading_matches_usernames_case_insensitively(client, admin_headers, make_user):
+    make_user('Student_One')
+    exam_id = client.post('/api/exams', json={'title': 'Practice Test 1', 'answers': ANSWER_KEY},
+                          headers=admin_headers).json['exam']['id']
+    answers = {str(q): 'A' for q in range(1, 51)}
+
+    response = client.post(f'/api/submit-graded-exam/{exam_id}/batch', json={'sheets': [
+        {'username': 'student_one', 'answers': answers},
+        {'username': 'STUDENT_ONE', 'answers': answers},
+        {'username': 'nobody', 'answers': answers},
+        {'username': 42, 'answers': answers},
+    ]}, headers=admin_headers)
+    assert response.status_code == 200, response.json
+    assert len(response.json['results']) == 2
+    assert [error['index'] for error in response.json['errors']] == [2, 3]
@@ -0,0 +1,111 @@
+"""
+Accept-Encoding negotiation and the size, status and streaming rules for
+compressing API responses.
+"""
+
+import gzip
+import brotli
+import pytest
+from app.utils import compression
+from app.utils.compression import response_compressor
+
+ANSWER_KEY = ['A', 'B', 'C', 'D'] * 12 + ['A', 'B']
+SHEET = {'answers': {str(q): 'A' for q in range(1, 51)}}
+
+@pytest.fixture
+def exam_ids(client, admin_headers):
+    return [client.post('/api/exams', json={'title': f'Practice Test {n}', 'answers': ANSWER_KEY},
+                        headers=admin_headers).json['exam']['id'] for n in range(1, 4)]
+
+def get(client, url, headers, accept_encoding=None):
+    if accept_encoding is not None:
+        headers = {**headers, 'Accept-Encoding': accept_encoding}
+    return client.get(url, headers=headers)
+
+@pytest.mark.parametrize('accept_encoding, expected', [
+    ('gzip, deflate, br', 'br'),
+    ('gzip', 'gzip'),
+    ('br;q=0.5, gzip', 'gzip'),
+    ('gzip;q=0.5, br', 'br'),
+    ('*', 'br'),
+])
+def test_client_preference_picks_the_encoding(client, admin_headers, exam_ids, accept_encoding, expected):
+    identity = get(client, '/api/exams', admin_headers)
+    response = get(client, '/api/exams', admin_headers, accept_encoding)
+    assert response.headers['Content-Encoding'] == expected
+    assert 'Accept-Encoding' in response.headers['Vary']
+    assert len(response.data) < len(identity.data)
+
+    decompress = brotli.decompress if expected == 'br' else gzip.decompress
+    assert decompress(response.data) == identity.data
+
+@pytest.mark.parametrize('accept_encoding', [None, 'identity', 'deflate', 'gzip;q=0, br;q=0'])
+def test_identity_when_nothing_acceptable(client, admin_headers, exam_ids, accept_encoding):
+    response = get(client, '/api/exams', admin_headers, accept_encoding)
+    assert 'Content-Encoding' not in response.headers
+    assert response.json['exams']
+    # Caches still need to know the body depends on the header
+    assert 'Accept-Encoding' in response.headers['Vary']
+
+def test_gzip_only_without_brotli(client, admin_headers, exam_ids, monkeypatch):
+    monkeypatch.setattr(compression, 'brotli', None)
+    assert get(client, '/api/exams', admin_headers, 'br, gzip').headers['Content-Encoding'] == 'gzip'
+    assert 'Content-Encoding' not in get(client, '/api/exams', admin_headers, 'br').headers
+
+def test_bodies_under_min_size_are_sent_as_is(client, admin_headers, exam_ids, monkeypatch):
+    small = get(client, f'/api/exams/{exam_ids[0]}', admin_headers)
+    assert len(small.data) < response_compressor.min_size
+    assert 'Content-Encoding' not in get(client, f'/api/exams/{exam_ids[0]}', admin_headers, 'gzip').headers
+
+    monkeypatch.setattr(response_compressor, 'min_size', len(small.data))
+    assert get(client, f'/api/exams/{exam_ids[0]}', admin_headers, 'gzip').headers['Content-Encoding'] == 'gzip'
+
+def test_not_modified_is_not_compressed(client, student_headers, exam_ids):
+    first = get(client, '/api/exams', student_headers, 'gzip')
+    assert first.headers['Content-Encoding'] == 'gzip'
+
+    again = client.get('/api/exams', headers={**student_headers, 'Accept-Encoding': 'gzip',
+                                              'If-None-Match': first.headers['ETag']})
+    assert again.status_code == 304
+    assert again.data == b''
+    assert 'Content-Encoding' not in again.headers
+
+def test_strong_etag_becomes_weak_and_still_revalidates(client, student_headers, exam_ids):
+    url = f'/api/exams/{exam_ids[0]}/questions'
+    identity = get(client, url, student_headers)
+    compressed = get(client, url, student_headers, 'gzip')
+    assert compressed.headers['Content-Encoding'] == 'gzip'
+    assert compressed.headers['ETag'] == 'W/' + identity.headers['ETag']
+
+    again = client.get(url, headers={**student_headers, 'Accept-Encoding': 'gzip',
+                                     'If-None-Match': compressed.headers['ETag']})
+    assert again.status_code == 304
+
+def test_etag_bodies_are_compressed_once(client, admin_headers, student_headers, exam_ids):
+    response_compressor.clear()
+    response_compressor.reset_stats()
+    url = f'/api/exams/{exam_ids[0]}/questions'
+    for _ in range(3):
+        assert get(client, url, student_headers, 'br').headers['Content-Encoding'] == 'br'
+    get(client, url, student_headers, 'gzip')
+
+    stats = get(client, '/api/exams/cache-stats', admin_headers).json['compression']
+    assert (stats['cache_misses'], stats['cache_hits'], stats['compressed']) == (2, 2, 2)
+    assert stats['ratio'] < 1
+
+def test_streamed_export_is_not_compressed(client, admin_headers, student_headers, exam_ids):
+    for _ in range(30):
+        client.post(f'/api/submit-graded-exam/{exam_ids[0]}', json=SHEET, headers=student_headers)
+
+    response = get(client, f'/api/exams/{exam_ids[0]}/attempts/export', admin_headers, 'gzip, br')
+    assert response.status_code == 200
+    assert response.is_streamed
+    assert 'Content-Encoding' not in response.headers
+    assert len(response.data) > response_compressor.min_size
+    assert response.data.count(b'\n') == 31
+
+def test_disabled_compression_leaves_responses_alone(client, admin_headers, exam_ids, monkeypatch):
+    monkeypatch.setattr(response_compressor, 'enabled', False)
+    response = get(client, '/api/exams', admin_headers, 'gzip')
+    assert 'Content-Encoding' not in response.headers
+    assert 'Vary' not in response.headers or 'Accept-Encoding' not in response.headers['Vary']
@@ -0,0 +1,88 @@
+"""
+ETag / Last-Modified validation of the catalog, exam, question sheet and
+attempt endpoints: matching validators get a 304, changes get a 200 with a
+new ETag.
+"""
+
+import pytest
+
+ANSWER_KEY = ['A', 'B', 'C', 'D'] * 12 + ['A', 'B']
+SHEET = {'answers': {str(q): 'A' for q in range(1, 51)}}
+
+@pytest.fixture
+def exam_id(client, admin_headers):
+    return client.post('/api/exams', json={'title': 'Practice Test 1', 'answers': ANSWER_KEY},
+                       headers=admin_headers).json['exam']['id']
+
+def revalidate(client, url, headers, response):
+    return client.get(url, headers={**headers, 'If-None-Match': response.headers['ETag']})
+
+@pytest.mark.parametrize('url', ['/api/exams', '/api/exams?status=active&include_attempts=true', '/api/exams/{id}'])
+def test_matching_etag_gets_304(client, student_headers, exam_id, url):
+    url = url.format(id=exam_id)
+    first = client.get(url, headers=student_headers)
+    assert first.status_code == 200
+    assert first.headers['ETag'].startswith('W/')
+    assert first.headers['Cache-Control'] == 'private, no-cache'
+
+    again = revalidate(client, url, student_headers, first)
+    assert again.status_code == 304
+    assert again.data == b''
+    assert again.headers['ETag'] == first.headers['ETag']
+
+def test_if_modified_since_gets_304_until_modified(client, student_headers, exam_id):
+    first = client.get('/api/exams', headers=student_headers)
+    since = {**student_headers, 'If-Modified-Since': first.headers['Last-Modified']}
+    assert client.get('/api/exams', headers=since).status_code == 304
+
+    # Last-Modified has second precision, so a date well before the exam is "modified"
+    earlier = {**student_headers, 'If-Modified-Since': 'Mon, 01 Jan 2001 00:00:00 GMT'}
+    assert client.get('/api/exams', headers=earlier).status_code == 200
+
+def test_exam_change_gets_200_with_new_etag(client, admin_headers, student_headers, exam_id):
+    catalog = client.get('/api/exams', headers=student_headers)
+    exam = client.get(f'/api/exams/{exam_id}', headers=student_headers)
+
+    client.patch(f'/api/exams/{exam_id}', json={'title': 'Practice Test 1 (revised)'}, headers=admin_headers)
+
+    for url, before in (('/api/exams', catalog), (f'/api/exams/{exam_id}', exam)):
+        after = revalidate(client, url, student_headers, before)
+        assert after.status_code == 200
+        assert after.headers['ETag'] != before.headers['ETag']
+    assert after.json['exam']['title'] == 'Practice Test 1 (revised)'
+
+def test_new_attempt_gets_200_with_new_etag(client, student_headers, exam_id):
+    client.post(f'/api/submit-graded-exam/{exam_id}', json=SHEET, headers=student_headers)
+    history = client.get('/api/exam-attempts', headers=student_headers)
+    catalog = client.get('/api/exams?include_attempts=true', headers=student_headers)
+    assert revalidate(client, '/api/exam-attempts', student_headers, history).status_code == 304
+
+    client.post(f'/api/submit-graded-exam/{exam_id}', json=SHEET, headers=student_headers)
+    for url, before in (('/api/exam-attempts', history), ('/api/exams?include_attempts=true', catalog)):
+        after = revalidate(client, url, student_headers, before)
+        assert after.status_code == 200
+        assert after.headers['ETag'] != before.headers['ETag']
+    assert len(after.json['exams']) == 1
+
+def test_attempt_detail_revalidates_against_its_exam(client, admin_headers, student_headers, exam_id):
+    attempt_id = client.post(f'/api/submit-graded-exam/{exam_id}', json=SHEET, headers=student_headers).json['attempt_id']
+    url = f'/api/exam-attempts/{attempt_id}'
+    detail = client.get(url, headers=student_headers)
+    assert revalidate(client, url, student_headers, detail).status_code == 304
+
+    client.patch(f'/api/exams/{exam_id}', json={'title': 'Practice Test 1 (revised)'}, headers=admin_headers)
+    after = revalidate(client, url, student_headers, detail)
+    assert after.status_code == 200
+    assert after.json['attempt']['exam_title'] == 'Practice Test 1 (revised)'
+
+def test_etags_are_per_user(client, make_user, student_headers, exam_id):
+    mine = client.get('/api/exams', headers=student_headers)
+    other_headers = make_user('other')
+    assert revalidate(client, '/api/exams', other_headers, mine).status_code == 200
+
+def test_question_sheet_revalidates_with_its_body_etag(client, student_headers, exam_id):
+    url = f'/api/exams/{exam_id}/questions'
+    first = client.get(url, headers=student_headers)
+    assert first.status_code == 200
+    assert not first.headers['ETag'].startswith('W/')
+    assert revalidate(client, url, student_headers, first).status_code == 304
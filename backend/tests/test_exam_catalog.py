@@ -0,0 +1,90 @@
+"""
+Filters, ordering and pagination of the exam catalog (GET /api/exams).
+"""
+
+from datetime import datetime
+import pytest
+from app import db
+from app.models.exam import Exam
+from app.models.user import User
+
+ANSWER_KEY = ['A', 'B', 'C', 'D'] * 12 + ['A', 'B']
+
+@pytest.fixture
+def exams(admin_headers, make_user):
+    """Six exams by two admins; two are inactive and two share a created_at"""
+    make_user('admin2', is_admin=True)
+    admin, admin2 = (User.query.filter_by(username=name).first() for name in ('admin', 'admin2'))
+    rows = [
+        ('Algebra', admin, datetime(2026, 1, 10, 9), True),
+        ('Biology', admin, datetime(2026, 1, 20, 9), True),
+        ('Chemistry', admin2, datetime(2026, 1, 20, 9), True),
+        ('Drama', admin2, datetime(2026, 2, 1, 9), False),
+        ('English', admin, datetime(2026, 2, 15, 9), True),
+        ('French', admin2, datetime(2026, 3, 1, 9), False),
+    ]
+    exams = [Exam(title=title, created_by=creator.id, created_at=created_at, updated_at=created_at,
+                  is_active=is_active, answers=ANSWER_KEY)
+             for title, creator, created_at, is_active in rows]
+    db.session.add_all(exams)
+    db.session.commit()
+    return {exam.title: exam for exam in exams}
+
+def titles(client, headers, **params):
+    response = client.get('/api/exams', query_string=params, headers=headers)
+    assert response.status_code == 200, response.json
+    return [exam['title'] for exam in response.json['exams']]
+
+def test_default_order_is_newest_first_with_id_tiebreak(client, admin_headers, exams):
+    # Biology and Chemistry share a created_at; the later id comes first
+    assert titles(client, admin_headers) == ['French', 'English', 'Drama', 'Chemistry', 'Biology', 'Algebra']
+    assert titles(client, admin_headers, order='asc') == ['Algebra', 'Biology', 'Chemistry', 'Drama', 'English', 'French']
+
+def test_sort_by_title(client, admin_headers, exams):
+    assert titles(client, admin_headers, sort='title', order='asc') == sorted(exams)
+    assert titles(client, admin_headers, sort='title') == sorted(exams, reverse=True)
+
+def test_students_only_see_active_exams(client, admin_headers, student_headers, exams):
+    assert titles(client, student_headers) == ['English', 'Chemistry', 'Biology', 'Algebra']
+    # A student cannot ask for inactive ones
+    assert titles(client, student_headers, active='false') == ['English', 'Chemistry', 'Biology', 'Algebra']
+    assert titles(client, admin_headers, status='active') == ['English', 'Chemistry', 'Biology', 'Algebra']
+
+def test_admin_filters(client, admin_headers, exams):
+    assert titles(client, admin_headers, active='false') == ['French', 'Drama']
+    assert titles(client, admin_headers, active='true', created_by=exams['Chemistry'].created_by) == ['Chemistry']
+    # A bare end date covers the whole day
+    assert titles(client, admin_headers, created_from='2026-01-20', created_to='2026-02-01') == ['Drama', 'Chemistry', 'Biology']
+    assert titles(client, admin_headers, created_from='2026-01-20T09:00:01', created_to='2026-02-01T09:00:00') == ['Drama']
+
+def test_pages_carry_the_window_count_total(client, admin_headers, statements, exams):
+    statements.clear()
+    response = client.get('/api/exams', query_string={'page': 2, 'per_page': 4}, headers=admin_headers)
+    assert [exam['title'] for exam in response.json['exams']] == ['Biology', 'Algebra']
+    assert response.json['pagination'] == {'page': 2, 'per_page': 4, 'total': 6, 'pages': 2}
+    # The total comes with the page rather than from a separate COUNT query
+    [listing] = [s for s in statements.statements if s.startswith('SELECT exam.id')]
+    assert 'count(*) OVER ()' in listing
+
+    filtered = client.get('/api/exams', query_string={'per_page': 1, 'active': 'false'}, headers=admin_headers).json
+    assert [exam['title'] for exam in filtered['exams']] == ['French']
+    assert filtered['pagination'] == {'page': 1, 'per_page': 1, 'total': 2, 'pages': 2}
+
+def test_page_past_the_end_still_reports_the_total(client, admin_headers, exams):
+    response = client.get('/api/exams', query_string={'page': 5, 'per_page': 4}, headers=admin_headers)
+    assert response.json['exams'] == []
+    assert response.json['pagination'] == {'page': 5, 'per_page': 4, 'total': 6, 'pages': 2}
+
+    empty = client.get('/api/exams', query_string={'page': 1, 'created_from': '2030-01-01'}, headers=admin_headers)
+    assert empty.json['pagination']['total'] == 0
+
+def test_per_page_is_clamped(client, admin_headers, exams):
+    response = client.get('/api/exams', query_string={'per_page': 1000}, headers=admin_headers)
+    assert response.json['pagination']['per_page'] == 100
+    assert len(response.json['exams']) == 6
+
+@pytest.mark.parametrize('params', [
+    {'sort': 'score'}, {'order': 'sideways'}, {'page': 'two'}, {'created_by': 'me'}, {'created_from': '20-01-2026'}
+])
+def test_invalid_parameters_get_400(client, admin_headers, exams, params):
+    assert client.get('/api/exams', query_string=params, headers=admin_headers).status_code == 400
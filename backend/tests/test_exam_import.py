@@ -0,0 +1,97 @@
+"""
+Bulk exam import: every row is validated first, rejected rows are reported
+by position and the valid rows are inserted together in one transaction.
+"""
+
+import pytest
+from app import db
+from app.models.exam import Exam
+from app.services.exam_import_service import ExamImportService
+
+ANSWER_KEY = ['A', 'B', 'C', 'D'] * 12 + ['A', 'B']
+
+def exam(title, answers=ANSWER_KEY, **fields):
+    return {'title': title, 'answers': answers, **fields}
+
+def catalog():
+    return sorted(db.session.query(Exam.title, Exam.is_active).all())
+
+def test_rejected_rows_are_reported_by_position(client, admin_headers):
+    response = client.post('/api/exams/import', headers=admin_headers, json={'exams': [
+        exam('Paper 1'),
+        exam(''),
+        exam('Paper 2', answers=ANSWER_KEY[:49]),
+        'not an exam',
+        exam('Paper 3', answers=''.join(ANSWER_KEY), is_active='no'),
+        exam('Paper 4', is_active='maybe'),
+    ]})
+    assert response.status_code == 201
+    assert [(e['index'], e['title']) for e in response.json['exams']] == [(0, 'Paper 1'), (4, 'Paper 3')]
+    assert [error['index'] for error in response.json['errors']] == [1, 2, 3, 5]
+    assert response.json['errors'][0] == {'index': 1, 'error': 'Exam title is required'}
+    assert response.json['errors'][3] == {'index': 5, 'error': 'is_active must be true or false'}
+    assert catalog() == [('Paper 1', True), ('Paper 3', False)]
+
+def test_csv_rows_are_numbered_from_the_first_data_row(client, admin_headers):
+    header = 'title,description,' + ','.join(f'Q{q}' for q in range(1, 51))
+    rows = [f'Paper 1,Mock,{",".join(ANSWER_KEY)}', f'Paper 2,Mock,{",".join(ANSWER_KEY[:-1])},E']
+    response = client.post('/api/exams/import', headers=admin_headers, data='\n'.join([header, *rows]),
+                           content_type='text/csv')
+    assert response.status_code == 201
+    assert [e['title'] for e in response.json['exams']] == ['Paper 1']
+    assert [error['index'] for error in response.json['errors']] == [1]
+
+def test_duplicate_titles_within_the_import(client, admin_headers):
+    response = client.post('/api/exams/import', headers=admin_headers, json={'exams': [
+        exam('Paper 1', answers=ANSWER_KEY[:10]),  # Invalid, so the later row is the first valid one
+        exam('paper 1'),
+        exam('PAPER 1 '),
+    ]})
+    assert [e['index'] for e in response.json['exams']] == [1]
+    assert response.json['errors'][1] == {'index': 2, 'error': 'Exam title appears more than once in the import'}
+    assert catalog() == [('paper 1', True)]
+
+def test_reimporting_skips_exams_that_exist(client, admin_headers):
+    client.post('/api/exams/import', headers=admin_headers, json={'exams': [exam('Paper 1'), exam('Paper 2')]})
+
+    response = client.post('/api/exams/import', headers=admin_headers, json={'exams': [
+        exam('Paper 3'), exam('PAPER 2'), exam('Paper 1'),
+    ]})
+    assert response.status_code == 201
+    assert [e['title'] for e in response.json['exams']] == ['Paper 3']
+    assert response.json['errors'] == [
+        {'index': 1, 'error': 'An exam with this title already exists'},
+        {'index': 2, 'error': 'An exam with this title already exists'},
+    ]
+    assert [title for title, _ in catalog()] == ['Paper 1', 'Paper 2', 'Paper 3']
+
+def test_nothing_valid_is_a_400_and_writes_nothing(client, admin_headers, statements):
+    response = client.post('/api/exams/import', headers=admin_headers, json={'exams': [exam(''), exam('Paper 1', answers=[])]})
+    assert response.status_code == 400
+    assert response.json['imported'] == 0
+    assert statements.writes() == []
+    assert catalog() == []
+
+def test_valid_rows_go_in_with_one_commit(app, make_user, statements):
+    make_user('admin', is_admin=True)
+    statements.clear()
+    created, errors = ExamImportService.import_exams([exam(f'Paper {n}') for n in range(1, 6)] + [exam('')], created_by=1)
+    assert [e['index'] for e in created] == [0, 1, 2, 3, 4]
+    assert len(errors) == 1
+    # SQLite gets one INSERT ... RETURNING per row to keep the ids ordered; PostgreSQL gets batches
+    assert {s.split('(', 1)[0] for s in statements.writes()} == {'INSERT INTO exam '}
+    assert statements.commits == 1
+    assert [e['id'] for e in created] == [exam_id for exam_id, in db.session.query(Exam.id).order_by(Exam.title)]
+
+def test_a_failed_insert_writes_no_exam(app, make_user, monkeypatch):
+    make_user('admin', is_admin=True)
+    monkeypatch.setattr(db.session, 'commit', lambda: (_ for _ in ()).throw(RuntimeError('disk full')))
+    with pytest.raises(RuntimeError):
+        ExamImportService.import_exams([exam('Paper 1'), exam('Paper 2')], created_by=1)
+    monkeypatch.undo()
+    db.session.rollback()
+    # All or nothing: the valid rows share a transaction
+    assert catalog() == []
+
+def test_import_requires_an_admin(client, student_headers):
+    assert client.post('/api/exams/import', headers=student_headers, json={'exams': [exam('Paper 1')]}).status_code == 403
@@ -0,0 +1,33 @@
+import pytest
+from werkzeug.security import generate_password_hash
+from app import db
+from app.models.user import User
+from app.services.password_hasher import password_hasher
+
+@pytest.fixture
+def verify_pool(app):
+    password_hasher.configure('werkzeug', 'pbkdf2:sha256:1000', 12, verify_workers=1, max_pending=1, queue_timeout=0.05)
+    yield password_hasher
+    password_hasher.init_app(app)
+
+def login(client):
+    return client.post('/api/login', json={'username_or_email': 'student', 'password': 'Passw0rd!x'})
+
+def test_login_is_shed_when_verification_slots_are_taken(app, client, verify_pool):
+    db.session.add(User(username='student', email='student@example.com',
+                        password_hash=generate_password_hash('Passw0rd!x', method='pbkdf2:sha256:1000')))
+    db.session.commit()
+
+    shed = verify_pool.shed
+    verify_pool._slots.acquire()
+    try:
+        response = login(client)
+    finally:
+        verify_pool._slots.release()
+    assert response.status_code == 503
+    assert response.headers['Retry-After'] == '1'
+    assert verify_pool.shed == shed + 1
+
+    # With the slot free, the check runs on the forkserver pool
+    response = login(client)
+    assert response.status_code == 200, response.json
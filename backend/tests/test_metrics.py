@@ -0,0 +1,77 @@
+"""
+GET /api/metrics: per-endpoint request counts, latency and SQL histograms
+in the Prometheus text format, optionally behind METRICS_TOKEN.
+
+The metrics registry is shared by every app created in the process, so
+tests compare values before and after the requests they make.
+"""
+
+import pytest
+from prometheus_client.parser import text_string_to_metric_families
+from app.utils.metrics import request_metrics
+
+CATALOG = {'blueprint': 'exams', 'endpoint': 'exams.get_exams'}
+
+def scrape(client, headers=None):
+    response = client.get('/api/metrics', headers=headers)
+    assert response.status_code == 200
+    assert response.mimetype == 'text/plain'
+    return {
+        (sample.name, tuple(sorted(sample.labels.items()))): sample.value
+        for family in text_string_to_metric_families(response.get_data(as_text=True))
+        for sample in family.samples
+    }
+
+def value(samples, name, **labels):
+    return samples.get((name, tuple(sorted(labels.items()))), 0)
+
+def test_metric_families_are_exported(client, student_headers):
+    client.get('/api/exams', headers=student_headers)
+    names = {name for name, _ in scrape(client)}
+    assert {
+        'http_requests_total', 'http_request_duration_seconds_count', 'http_request_duration_seconds_bucket',
+        'http_requests_in_progress', 'http_request_sql_statements_count', 'http_request_sql_duration_seconds_sum'
+    } <= names
+
+def test_requests_are_counted_by_endpoint_method_and_status(client, student_headers):
+    before = scrape(client)
+    for _ in range(3):
+        client.get('/api/exams', headers=student_headers)
+    client.get('/api/exams/cache-stats', headers=student_headers)
+    after = scrape(client)
+
+    def delta(name, **labels):
+        return value(after, name, **labels) - value(before, name, **labels)
+
+    assert delta('http_requests_total', method='GET', status='200', **CATALOG) == 3
+    assert delta('http_request_duration_seconds_count', method='GET', **CATALOG) == 3
+    assert delta('http_requests_total', blueprint='exams', endpoint='exams.get_exam_cache_stats',
+                 method='GET', status='403') == 1
+    # The scrape itself is counted too
+    assert delta('http_requests_total', blueprint='health', endpoint='health.metrics', method='GET', status='200') == 1
+    # Nothing is left in flight once the responses are sent
+    assert value(after, 'http_requests_in_progress', **CATALOG) == 0
+
+def test_sql_statements_are_recorded_per_request(client, student_headers, statements):
+    client.get('/api/exams', headers=student_headers)  # Warms the revocation snapshot
+    before = scrape(client)
+    statements.clear()
+    client.get('/api/exams', headers=student_headers)
+    after = scrape(client)
+
+    assert value(after, 'http_request_sql_statements_count', **CATALOG) - value(before, 'http_request_sql_statements_count', **CATALOG) == 1
+    recorded = value(after, 'http_request_sql_statements_sum', **CATALOG) - value(before, 'http_request_sql_statements_sum', **CATALOG)
+    assert recorded == statements.count
+    assert value(after, 'http_request_sql_duration_seconds_sum', **CATALOG) > value(before, 'http_request_sql_duration_seconds_sum', **CATALOG)
+
+@pytest.mark.parametrize('authorization, status', [
+    (None, 401), ('Bearer wrong', 401), ('s3cret', 401), ('Bearer s3cret', 200)
+])
+def test_metrics_token(app, client, authorization, status):
+    app.config['METRICS_TOKEN'] = 's3cret'
+    headers = {'Authorization': authorization} if authorization else None
+    assert client.get('/api/metrics', headers=headers).status_code == status
+
+def test_disabled_metrics_are_not_served(client, monkeypatch):
+    monkeypatch.setattr(request_metrics, 'enabled', False)
+    assert client.get('/api/metrics').status_code == 404
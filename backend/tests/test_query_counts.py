@@ -0,0 +1,50 @@
+"""
+The catalog and attempt history must run the same number of SQL statements
+however many exams they return, including when the score index is cold.
+"""
+
+import pytest
+from app.services.score_index import score_index
+
+ANSWER_KEY = ['A', 'B', 'C', 'D'] * 12 + ['A', 'B']
+
+def add_exams(client, admin_headers, student_headers, count):
+    for i in range(count):
+        response = client.post('/api/exams', json={'title': f'Practice Test {i + 1}', 'answers': ANSWER_KEY},
+                               headers=admin_headers)
+        assert response.status_code == 201, response.json
+        exam_id = response.json['exam']['id']
+        response = client.post(f'/api/submit-graded-exam/{exam_id}',
+                               json={'answers': {str(q): 'A' for q in range(1, 51)}}, headers=student_headers)
+        assert response.status_code == 200, response.json
+
+def cold_statement_count(client, statements, url, headers):
+    score_index.clear()
+    statements.clear()
+    response = client.get(url, headers=headers)
+    assert response.status_code == 200, response.json
+    return statements.count, response.json
+
+@pytest.mark.parametrize('url, key', [
+    ('/api/exams?status=active&include_attempts=true', 'exams'),
+    ('/api/exam-attempts', 'exam_attempts'),
+])
+def test_list_statement_count_does_not_grow_with_exams(client, statements, admin_headers, student_headers, url, key):
+    add_exams(client, admin_headers, student_headers, 3)
+    small_count, small = cold_statement_count(client, statements, url, student_headers)
+
+    add_exams(client, admin_headers, student_headers, 3)
+    large_count, large = cold_statement_count(client, statements, url, student_headers)
+
+    assert (len(small[key]), len(large[key])) == (3, 6)
+    assert large_count == small_count
+
+def test_catalog_omits_score_percentile(client, admin_headers, student_headers):
+    add_exams(client, admin_headers, student_headers, 1)
+    exam = client.get('/api/exams?include_attempts=true', headers=student_headers).json['exams'][0]
+    assert exam['has_attempted']
+    assert 'score_percentile' not in exam['latest_attempt']
+
+    attempt_id = exam['latest_attempt']['id']
+    detail = client.get(f'/api/exam-attempts/{attempt_id}', headers=student_headers).json
+    assert detail['attempt']['score_percentile'] == 0.0
@@ -0,0 +1,30 @@
+from types import SimpleNamespace
+import pytest
+from sqlalchemy.exc import IntegrityError
+from app.services.auth_service import violated_constraint, EMAIL_CONSTRAINTS
+
+def register(client, username, email):
+    return client.post('/api/register', json={
+        'username': username, 'email': email,
+        'password': 'Passw0rd!x', 'confirm_password': 'Passw0rd!x'
+    })
+
+@pytest.mark.parametrize('username, email, error', [
+    ('Student_One', 'other@example.com', 'Username already exists'),
+    ('other', 'Student.One@Example.com', 'Email already exists'),
+])
+def test_duplicate_registration_names_the_taken_field(client, username, email, error):
+    assert register(client, 'student_one', 'student.one@example.com').status_code == 201
+
+    response = register(client, username, email)
+    assert response.status_code == 400
+    assert response.json['error'] == error
+
+def test_postgres_violation_is_read_from_the_constraint_name():
+    # psycopg2 puts the duplicate value in the message, so a username mentioning email must not decide it
+    orig = Exception('duplicate key value violates unique constraint "ix_user_username_lower"\n'
+                     'DETAIL:  Key (lower(username::text))=(email_fan) already exists.')
+    orig.diag = SimpleNamespace(constraint_name='ix_user_username_lower')
+    constraint = violated_constraint(IntegrityError('INSERT INTO "user" ...', {}, orig))
+    assert constraint == 'ix_user_username_lower'
+    assert not any(name in constraint for name in EMAIL_CONSTRAINTS)
@@ -0,0 +1,78 @@
+"""
+Percentile indexes add scores committed in this process without counting
+any of them twice when another request reloads the index meanwhile.
+"""
+
+import time
+import pytest
+from app import db
+from app.models.exam_stats import ExamStats
+from app.services.score_index import score_index
+
+ANSWER_KEY = ['A', 'B', 'C', 'D'] * 12 + ['A', 'B']
+SHEET = {'answers': {str(q): 'A' for q in range(1, 51)}}
+
+@pytest.fixture
+def exam_id(client, admin_headers, student_headers):
+    exam_id = client.post('/api/exams', json={'title': 'Practice Test 1', 'answers': ANSWER_KEY},
+                          headers=admin_headers).json['exam']['id']
+    for _ in range(3):
+        client.post(f'/api/submit-graded-exam/{exam_id}', json=SHEET, headers=student_headers)
+    return exam_id
+
+def indexed(exam_id):
+    return score_index._get(exam_id).total
+
+def attempt_count(exam_id):
+    return db.session.get(ExamStats, exam_id, populate_existing=True).attempt_count
+
+def submit(client, exam_id, headers):
+    assert client.post(f'/api/submit-graded-exam/{exam_id}', json=SHEET, headers=headers).status_code == 200
+
+def test_scores_are_added_to_an_index_loaded_before_the_commit(client, student_headers, exam_id):
+    assert indexed(exam_id) == 3
+    submit(client, exam_id, student_headers)
+    assert score_index._entries[exam_id][0].total == 4 == attempt_count(exam_id)
+
+def test_index_reloaded_after_the_commit_is_not_counted_twice(client, student_headers, exam_id, monkeypatch):
+    assert indexed(exam_id) == 3
+    record = score_index.record
+
+    def record_after_another_request_reloads(exam_id, scores, commit_started):
+        # Another request rebuilds the index from the committed rows first
+        score_index.invalidate(exam_id)
+        assert indexed(exam_id) == 4
+        record(exam_id, scores, commit_started)
+
+    monkeypatch.setattr(score_index, 'record', record_after_another_request_reloads)
+    submit(client, exam_id, student_headers)
+    monkeypatch.undo()
+
+    assert indexed(exam_id) == 4 == attempt_count(exam_id)
+
+def test_index_loaded_during_the_commit_is_dropped(exam_id):
+    index = score_index._get(exam_id)
+    commit_started = score_index._entries[exam_id][2]
+    score_index.record(exam_id, [40], commit_started)
+    assert exam_id not in score_index._entries
+    assert index.total == 3
+
+    score_index._get(exam_id)
+    score_index.record(exam_id, [40], time.monotonic())
+    assert indexed(exam_id) == 4
+
+def test_batch_grading_records_once(client, admin_headers, exam_id, monkeypatch):
+    assert indexed(exam_id) == 3
+    record = score_index.record
+
+    def record_after_another_request_reloads(exam_id, scores, commit_started):
+        score_index.invalidate(exam_id)
+        indexed(exam_id)
+        record(exam_id, scores, commit_started)
+
+    monkeypatch.setattr(score_index, 'record', record_after_another_request_reloads)
+    response = client.post(f'/api/submit-graded-exam/{exam_id}/batch', headers=admin_headers,
+                           json={'sheets': [{'username': 'student', **SHEET}] * 2})
+    monkeypatch.undo()
+    assert response.status_code == 200, response.json
+    assert indexed(exam_id) == 5 == attempt_count(exam_id)
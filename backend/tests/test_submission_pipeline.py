@@ -0,0 +1,164 @@
+"""
+Write-behind submissions in each SUBMISSION_DURABILITY mode, and replay of
+journals left behind by a worker that died.
+
+The writer runs on its own thread, so these tests use a SQLite file rather
+than the per-connection in-memory database of the testing config.
+"""
+
+import fcntl
+import os
+import numpy as np
+import pytest
+import config as config_module
+from app import create_app, db
+from app.models.exam import Exam
+from app.models.exam_attempt import ExamAttempt
+from app.models.exam_stats import ExamStats
+from app.models.user import User
+from app.services.auth_service import AuthService
+from app.services.submission_pipeline import submission_pipeline, PendingSubmission, _journal_line
+from app.utils.timestamps import utcnow
+
+ANSWER_KEY = ['A', 'B', 'C', 'D'] * 12 + ['A', 'B']
+SHEET = {'answers': {str(q): 'A' for q in range(1, 51)}}
+
+@pytest.fixture
+def make_app(tmp_path, monkeypatch):
+    """Create an app writing submissions through the pipeline with the given durability"""
+    journal_dir = tmp_path / 'journal'
+
+    def make_app(durability, flush_ms=5):
+        class PipelineConfig(config_module.TestingConfig):
+            SQLALCHEMY_DATABASE_URI = f"sqlite:///{tmp_path / 'app.db'}"
+            SUBMISSION_PIPELINE_ENABLED = True
+            SUBMISSION_DURABILITY = durability
+            SUBMISSION_JOURNAL_DIR = str(journal_dir)
+            SUBMISSION_FLUSH_MS = flush_ms
+
+        monkeypatch.setitem(config_module.config, 'pipeline', PipelineConfig)
+        app = create_app('pipeline')
+        with app.app_context():
+            db.create_all()
+        return app
+
+    make_app.journal_dir = journal_dir
+    yield make_app
+    submission_pipeline.shutdown()
+    submission_pipeline.enabled = False
+
+def seed(app):
+    """An exam and a student; returns (exam_id, student_id, student headers)"""
+    with app.app_context():
+        admin = User(username='admin', email='admin@example.com', password_hash='-', is_admin=True)
+        student = User(username='student', email='student@example.com', password_hash='-')
+        db.session.add_all([admin, student])
+        db.session.flush()
+        exam = Exam(title='Practice Test 1', created_by=admin.id, answers=ANSWER_KEY)
+        db.session.add(exam)
+        db.session.commit()
+        return exam.id, student.id, {'Authorization': f'Bearer {AuthService.create_token(student)}'}
+
+def attempts(app):
+    with app.app_context():
+        return db.session.query(ExamAttempt.submission_id, ExamAttempt.score).order_by(ExamAttempt.id).all()
+
+def attempt_count(app, exam_id):
+    with app.app_context():
+        stats = db.session.get(ExamStats, exam_id, populate_existing=True)
+        return stats.attempt_count if stats else 0
+
+def journals(make_app):
+    return sorted(make_app.journal_dir.glob('submissions-*')) if make_app.journal_dir.exists() else []
+
+def journal_entry(submission_id, exam_id, user_id, score=13):
+    now = utcnow()
+    row = {
+        'submission_id': submission_id, 'user_id': user_id, 'exam_id': exam_id,
+        'total_questions': 50, 'total_marks': 50, 'score': score, 'status': 'completed',
+        'answer_sheet': 'A' * 50, 'started_at': now, 'completed_at': now, 'created_at': now, 'updated_at': now
+    }
+    return _journal_line(PendingSubmission(row, np.zeros(50, dtype=bool)))
+
+def test_commit_mode_returns_the_written_attempt(make_app):
+    app = make_app('commit')
+    exam_id, _, headers = seed(app)
+
+    response = app.test_client().post(f'/api/submit-graded-exam/{exam_id}', json=SHEET, headers=headers)
+    assert response.status_code == 200, response.json
+    assert response.json['attempt_id'] is not None
+    assert attempts(app) == [(response.json['submission_id'], response.json['score'])]
+    assert attempt_count(app, exam_id) == 1
+
+def test_none_mode_writes_after_responding(make_app):
+    app = make_app('none')
+    exam_id, _, headers = seed(app)
+
+    response = app.test_client().post(f'/api/submit-graded-exam/{exam_id}', json=SHEET, headers=headers)
+    assert response.status_code == 200, response.json
+    assert response.json['attempt_id'] is None
+
+    submission_pipeline.shutdown()  # Flushes the queue
+    assert attempts(app) == [(response.json['submission_id'], response.json['score'])]
+    assert attempt_count(app, exam_id) == 1
+    assert journals(make_app) == []
+
+def test_journal_mode_journals_before_responding(make_app):
+    # A long flush interval keeps the row queued until shutdown flushes it
+    app = make_app('journal', flush_ms=60000)
+    exam_id, _, headers = seed(app)
+    client = app.test_client()
+
+    first = client.post(f'/api/submit-graded-exam/{exam_id}', json=SHEET, headers=headers).json
+    second = client.post(f'/api/submit-graded-exam/{exam_id}', json=SHEET, headers=headers).json
+    [journal] = journals(make_app)
+    assert journal.name.startswith(f'submissions-{os.getpid()}-')
+    content = journal.read_text()
+    assert first['submission_id'] in content and second['submission_id'] in content
+
+    submission_pipeline.shutdown()
+    assert [submission_id for submission_id, _ in attempts(app)] == [first['submission_id'], second['submission_id']]
+    assert attempt_count(app, exam_id) == 2
+    # A clean exit leaves nothing to replay
+    assert journals(make_app) == []
+
+def test_leftover_journal_is_replayed_whatever_pid_it_carries(make_app):
+    app = make_app('journal')
+    exam_id, student_id, headers = seed(app)
+    app.test_client().post(f'/api/submit-graded-exam/{exam_id}', json=SHEET, headers=headers)
+    submission_pipeline.shutdown()
+    [(committed_id, _)] = attempts(app)
+
+    # A dead worker whose pid this process now has: one row committed before the crash, one not
+    leftover = make_app.journal_dir / f'submissions-{os.getpid()}.jsonl'
+    leftover.write_text(journal_entry(committed_id, exam_id, student_id) + journal_entry('lost-1', exam_id, student_id))
+
+    submission_pipeline.init_app(app)  # Startup recovery
+    assert [submission_id for submission_id, _ in attempts(app)] == [committed_id, 'lost-1']
+    assert attempt_count(app, exam_id) == 2
+    assert journals(make_app) == []
+
+def test_replaying_a_journal_twice_writes_each_submission_once(make_app):
+    app = make_app('journal')
+    exam_id, student_id, _ = seed(app)
+    lines = journal_entry('replay-1', exam_id, student_id) + journal_entry('replay-2', exam_id, student_id)
+
+    for _ in range(2):
+        (make_app.journal_dir / 'submissions-999999.jsonl').write_text(lines)
+        with app.app_context():
+            submission_pipeline.recover()
+    assert [submission_id for submission_id, _ in attempts(app)] == ['replay-1', 'replay-2']
+    assert attempt_count(app, exam_id) == 2
+
+def test_journal_of_a_running_writer_is_left_alone(make_app):
+    app = make_app('journal')
+    exam_id, student_id, _ = seed(app)
+    live = make_app.journal_dir / 'submissions-1-running.jsonl'
+    live.write_text(journal_entry('in-flight', exam_id, student_id))
+
+    with open(live) as held:
+        fcntl.flock(held, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        with app.app_context():
+            assert submission_pipeline.recover() == 0
+        assert live.exists()
+    assert attempts(app) == []
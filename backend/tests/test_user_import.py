@@ -0,0 +1,105 @@
+"""
+Bulk student provisioning: rows are validated against the registration
+rules, duplicates in the file or the database are reported, and the rest
+are inserted and committed one batch at a time.
+"""
+
+import pytest
+from werkzeug.security import check_password_hash
+from app import db
+from app.models.user import User
+from app.services.password_hasher import password_hasher
+from app.services.user_import_service import UserImportService
+
+@pytest.fixture
+def fast_hasher(app):
+    password_hasher.configure('werkzeug', 'pbkdf2:sha256:1000', 12, verify_workers=1)
+    yield password_hasher
+    password_hasher.init_app(app)
+
+def student(name, email=None, password='Passw0rd!x'):
+    return {'username': name, 'email': email or f'{name}@example.com', 'password': password}
+
+def usernames():
+    return [name for name, in db.session.query(User.username).order_by(User.username)]
+
+def import_users(users, **kwargs):
+    return UserImportService.import_users(users, workers=1, **kwargs)
+
+def test_rejected_rows_are_reported_by_position(fast_hasher):
+    created, errors, timing = import_users([
+        student('alice'),
+        student('b'),
+        student('carol', email='not-an-email'),
+        student('dave', password='short'),
+        student('erin'),
+    ])
+    assert created == 2
+    assert [error['index'] for error in errors] == [1, 2, 3]
+    assert errors[1] == {'index': 2, 'error': 'Invalid email format'}
+    assert usernames() == ['alice', 'erin']
+    assert timing['workers'] == 1
+
+    alice = User.query.filter_by(username='alice').first()
+    assert check_password_hash(alice.password_hash, 'Passw0rd!x')
+    assert (alice.is_active, alice.is_admin) == (True, False)
+
+def test_duplicates_within_the_file(fast_hasher):
+    created, errors, _ = import_users([
+        student('alice'),
+        student('ALICE', email='other@example.com'),
+        student('bob', email='Alice@Example.com'),
+        student('carol'),
+    ])
+    assert created == 2
+    assert errors == [
+        {'index': 1, 'error': 'Username appears more than once in the file'},
+        {'index': 2, 'error': 'Email appears more than once in the file'},
+    ]
+    assert usernames() == ['alice', 'carol']
+
+def test_duplicates_against_the_database(fast_hasher, make_user):
+    make_user('alice')
+    make_user('bob')
+    created, errors, _ = import_users([
+        student('Alice', email='new@example.com'),
+        student('carol', email='BOB@example.com'),
+        student('dave'),
+    ], batch_size=2)
+    assert created == 1
+    assert errors == [
+        {'index': 0, 'error': 'Username already exists'},
+        {'index': 1, 'error': 'Email already exists'},
+    ]
+    assert usernames() == ['alice', 'bob', 'dave']
+
+def test_each_batch_commits_on_its_own(fast_hasher, statements):
+    reports = []
+    created, errors, _ = import_users([student(f'student{i}') for i in range(5)] + [student('x')],
+                                      batch_size=2, progress=lambda done, total: reports.append((done, total)))
+    assert (created, len(errors)) == (5, 1)
+    # The rejected row counts as processed up front, then one report per batch
+    assert reports == [(1, 6), (3, 6), (5, 6), (6, 6)]
+    assert statements.commits == 3
+    assert len(statements.writes()) == 3
+
+def test_a_conflicting_row_does_not_sink_its_batch(fast_hasher, monkeypatch):
+    hash_password = password_hasher.hash
+
+    def hash_while_another_writer_registers(password):
+        # Someone registers 'bob' after the existence check but before the batch is inserted
+        if not User.query.filter_by(username='bob').first():
+            db.session.add(User(username='bob', email='bob@elsewhere.com', password_hash='-'))
+            db.session.commit()
+        return hash_password(password)
+
+    monkeypatch.setattr(password_hasher, 'hash', hash_while_another_writer_registers)
+    created, errors, _ = import_users([student('alice'), student('bob'), student('carol'), student('dave')], batch_size=2)
+    assert created == 3
+    assert errors == [{'index': 1, 'error': 'Username or email already exists'}]
+    assert usernames() == ['alice', 'bob', 'carol', 'dave']
+    assert User.query.filter_by(username='bob').first().email == 'bob@elsewhere.com'
+
+def test_parse_csv_normalizes_headers_and_blanks():
+    users = UserImportService.parse_csv(' Username ,EMAIL,password\n alice ,alice@example.com,Passw0rd!x\nbob,,\n')
+    assert users == [student('alice'), {'username': 'bob', 'email': '', 'password': ''}]
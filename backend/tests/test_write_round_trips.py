@@ -0,0 +1,75 @@
+"""
+Register, exam create/update and submission each write in a single
+transaction and do not read the written rows back after committing.
+Register and the exam writes are one statement; a submission is the
+attempt INSERT plus three statistics upserts, in the same transaction.
+"""
+
+ANSWER_KEY = ['A', 'B', 'C', 'D'] * 12 + ['A', 'B']
+
+def statement_kind(statement):
+    return statement.lstrip().split(None, 1)[0].upper()
+
+def assert_no_read_after_write(statements):
+    kinds = [statement_kind(s) for s in statements.statements]
+    first_write = next(i for i, kind in enumerate(kinds) if kind != 'SELECT')
+    assert 'SELECT' not in kinds[first_write:], statements.statements
+
+def test_register_is_one_insert(client, statements):
+    statements.clear()
+    response = client.post('/api/register', json={
+        'username': 'newstudent', 'email': 'newstudent@example.com',
+        'password': 'Passw0rd!x', 'confirm_password': 'Passw0rd!x'
+    })
+    assert response.status_code == 201, response.json
+    assert [statement_kind(s) for s in statements.statements] == ['INSERT']
+    assert statements.commits == 1
+
+def test_exam_create_and_update_are_one_write_each(client, statements, admin_headers):
+    statements.clear()
+    response = client.post('/api/exams', json={'title': 'Practice Test 1', 'answers': ANSWER_KEY}, headers=admin_headers)
+    assert response.status_code == 201, response.json
+    assert [statement_kind(s) for s in statements.writes()] == ['INSERT']
+    assert statements.commits == 1
+    assert_no_read_after_write(statements)
+
+    statements.clear()
+    exam_id = response.json['exam']['id']
+    response = client.patch(f'/api/exams/{exam_id}', json={'title': 'Practice Test 1 (revised)'}, headers=admin_headers)
+    assert response.status_code == 200, response.json
+    assert response.json['exam']['title'] == 'Practice Test 1 (revised)'
+    assert [statement_kind(s) for s in statements.writes()] == ['UPDATE']
+    assert statements.commits == 1
+    assert_no_read_after_write(statements)
+
+def test_submission_is_one_transaction(client, statements, admin_headers, make_user):
+    exam_id = client.post('/api/exams', json={'title': 'Practice Test 1', 'answers': ANSWER_KEY},
+                          headers=admin_headers).json['exam']['id']
+    sheet = {'answers': {str(q): 'A' for q in range(1, 51)}}
+    # An earlier submission loads the exam and its score index, which later submissions reuse
+    client.post(f'/api/submit-graded-exam/{exam_id}', json=sheet, headers=make_user('first'))
+    student_headers = make_user('second')
+
+    statements.clear()
+    response = client.post(f'/api/submit-graded-exam/{exam_id}', json=sheet, headers=student_headers)
+    assert response.status_code == 200, response.json
+    assert statements.commits == 1
+    # The attempt, then one upsert each for the exam's totals, score histogram and per-question counts
+    written_tables = [s.split('INTO', 1)[1].split()[0] for s in statements.writes()]
+    assert written_tables == ['exam_attempt', 'exam_stats', 'exam_score_bucket', 'exam_question_stat']
+    assert_no_read_after_write(statements)
+
+def test_write_responses_format_datetimes_like_reads(client, admin_headers):
+    created = client.post('/api/exams', json={'title': 'Practice Test 1', 'answers': ANSWER_KEY},
+                          headers=admin_headers).json['exam']
+    read = client.get(f"/api/exams/{created['id']}", headers=admin_headers).json['exam']
+    assert created['created_at'] == read['created_at']
+    assert created['updated_at'] == read['updated_at']
+
+    registered = client.post('/api/register', json={
+        'username': 'newstudent', 'email': 'newstudent@example.com',
+        'password': 'Passw0rd!x', 'confirm_password': 'Passw0rd!x'
+    }).json
+    headers = {'Authorization': f"Bearer {registered['access_token']}"}
+    profile = client.get('/api/profile', headers=headers).json['user']
+    assert profile['created_at'] == registered['user']['created_at']
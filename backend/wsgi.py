@@ -0,0 +1,11 @@
+"""
+WSGI entry point for production servers.
+
+    gunicorn -c gunicorn.conf.py wsgi:app
+
+Use `python run.py` for the local development server.
+"""
+
+from app import create_app
+
+app = create_app()
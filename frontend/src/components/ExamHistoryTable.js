@@ -3,7 +3,7 @@ import { useNavigate } from 'react-router-dom';
 import { getPercentageClass } from '../utils/helpers';
 import './ExamHistoryTable.css';
 
-const ExamHistoryTable = ({ examAttempts, loading }) => {
+const ExamHistoryTable = ({ examAttempts, loading, hasMore, loadingMore, onLoadMore }) => {
   const navigate = useNavigate();
 
   if (loading) {
@@ -65,6 +65,15 @@ const ExamHistoryTable = ({ examAttempts, loading }) => {
           ))}
         </tbody>
       </table>
+      {hasMore && (
+        <button
+          onClick={onLoadMore}
+          className="load-more-btn"
+          disabled={loadingMore}
+        >
+          {loadingMore ? 'Loading...' : 'Load more'}
+        </button>
+      )}
     </div>
   );
 };
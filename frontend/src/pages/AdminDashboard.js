@@ -4,8 +4,12 @@ import { adminAPI } from '../services/adminAPI';
 import { logout } from '../utils/auth';
 import './AdminDashboard.css';
 
+const EXAMS_PER_PAGE = 12;
+
 const AdminDashboard = () => {
   const [exams, setExams] = useState([]);
+  const [page, setPage] = useState(1);
+  const [pagination, setPagination] = useState(null);
   const [loading, setLoading] = useState(true);
   const [showCreateForm, setShowCreateForm] = useState(false);
   const [createForm, setCreateForm] = useState({
@@ -21,8 +25,13 @@ const AdminDashboard = () => {
 
   const fetchExams = useCallback(async () => {
     try {
-      const response = await adminAPI.getExams();
+      const response = await adminAPI.getExams({
+        page,
+        per_page: EXAMS_PER_PAGE,
+        include_answers: false
+      });
       setExams(response.data.exams);
+      setPagination(response.data.pagination);
     } catch (error) {
       console.error('Failed to fetch exams:', error);
       if (error.response?.status === 403) {
@@ -32,7 +41,7 @@ const AdminDashboard = () => {
     } finally {
       setLoading(false);
     }
-  }, [navigate]);
+  }, [navigate, page]);
 
   useEffect(() => {
     fetchExams();
@@ -61,14 +70,22 @@ const AdminDashboard = () => {
     });
   };
 
-  const handleEditExam = (exam) => {
-    setEditingExam(exam);
-    setCreateForm({
-      title: exam.title,
-      description: exam.description || '',
-      answers: exam.answers || Array(50).fill('A')
-    });
-    setShowCreateForm(true);
+  const handleEditExam = async (exam) => {
+    // The catalog omits answer keys, so load the full exam before editing
+    try {
+      const response = await adminAPI.getExam(exam.id);
+      const fullExam = response.data.exam;
+      setEditingExam(fullExam);
+      setCreateForm({
+        title: fullExam.title,
+        description: fullExam.description || '',
+        answers: fullExam.answers || Array(50).fill('A')
+      });
+      setShowCreateForm(true);
+    } catch (error) {
+      console.error('Failed to load exam:', error);
+      showToast('Failed to load exam: ' + (error.response?.data?.error || 'Unknown error'), 'error');
+    }
   };
 
   const handleCreateExam = async (e) => {
@@ -316,6 +333,27 @@ const AdminDashboard = () => {
               ))}
             </div>
           )}
+          {pagination && pagination.pages > 1 && (
+            <div className="pagination">
+              <button
+                onClick={() => setPage(page - 1)}
+                className="page-btn"
+                disabled={page <= 1}
+              >
+                Previous
+              </button>
+              <span className="page-info">
+                Page {pagination.page} of {pagination.pages} ({pagination.total} exams)
+              </span>
+              <button
+                onClick={() => setPage(page + 1)}
+                className="page-btn"
+                disabled={page >= pagination.pages}
+              >
+                Next
+              </button>
+            </div>
+          )}
         </div>
       </main>
 
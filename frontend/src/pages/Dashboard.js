@@ -10,6 +10,8 @@ const Dashboard = () => {
   const [examAttempts, setExamAttempts] = useState([]);
   const [loading, setLoading] = useState(true);
   const [attemptsLoading, setAttemptsLoading] = useState(true);
+  const [nextCursor, setNextCursor] = useState(null);
+  const [loadingMore, setLoadingMore] = useState(false);
   const navigate = useNavigate();
 
   useEffect(() => {
@@ -41,6 +43,7 @@ const Dashboard = () => {
       try {
         const response = await userAPI.getExamAttempts();
         setExamAttempts(response.data.exam_attempts);
+        setNextCursor(response.data.next_cursor);
       } catch (error) {
         console.error('Failed to fetch exam attempts:', error);
         setExamAttempts([]);
@@ -56,6 +59,20 @@ const Dashboard = () => {
     fetchExamAttempts();
   }, [navigate]);
 
+  const handleLoadMore = async () => {
+    if (!nextCursor) return;
+    setLoadingMore(true);
+    try {
+      const response = await userAPI.getExamAttempts({ after: nextCursor });
+      setExamAttempts((previous) => [...previous, ...response.data.exam_attempts]);
+      setNextCursor(response.data.next_cursor);
+    } catch (error) {
+      console.error('Failed to fetch more exam attempts:', error);
+    } finally {
+      setLoadingMore(false);
+    }
+  };
+
   const handleLogout = () => {
     logout();
     navigate('/login');
@@ -128,6 +145,9 @@ const Dashboard = () => {
             <ExamHistoryTable 
               examAttempts={examAttempts}
               loading={attemptsLoading}
+              hasMore={Boolean(nextCursor)}
+              loadingMore={loadingMore}
+              onLoadMore={handleLoadMore}
             />
           </div>
         </div>
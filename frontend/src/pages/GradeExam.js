@@ -112,6 +112,9 @@ const GradeExam = () => {
               <p><strong>Questions Answered:</strong> {Object.keys(answers).length} / {questions.length}</p>
               <p><strong>Correct Answers:</strong> {result.score}</p>
               <p><strong>Total Questions:</strong> {questions.length}</p>
+              {result.score_percentile != null && (
+                <p><strong>Percentile:</strong> You scored higher than {result.score_percentile}% of candidates</p>
+              )}
             </div>
             <div className="result-actions">
               <button onClick={handleGradeNew} className="grade-new-btn">
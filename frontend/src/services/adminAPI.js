@@ -1,8 +1,8 @@
 import api from './api';
 
 export const adminAPI = {
-  // Get all exams
-  getExams: () => api.get('/exams'),
+  // Get one page of the exam catalog (params: page, per_page, active, sort, order, ...)
+  getExams: (params = {}) => api.get('/exams', { params }),
   
   // Get specific exam
   getExam: (examId) => api.get(`/exams/${examId}`),
@@ -48,7 +48,7 @@ export const authAPI = {
 
 export const userAPI = {
   getProfile: () => api.get('/profile'),
-  getExamAttempts: () => api.get('/exam-attempts'),
+  getExamAttempts: (params = {}) => api.get('/exam-attempts', { params }),
   getExamAttemptDetails: (attemptId) => api.get(`/exam-attempts/${attemptId}`),
   getAvailableExams: () => api.get('/exams?status=active&include_attempts=true'),
   getExamDetails: (examId) => api.get(`/exams/${examId}`),